@@ -1,58 +1,153 @@
-# Mapeamento dos opcodes para tipos de instrução
-opcode_types = {
-    '0110011': 'R',  # tipo R (ex: add, sub, sll, etc)
-    '0010011': 'I',  # tipo I (ex: addi, ori, xori, etc)
-    '0000011': 'I',  # tipo I (ex: lw)
-    '1100111': 'I',  # tipo I (ex: jalr)
-    '0100011': 'S',  # tipo S (ex: sw)
-    '1100011': 'B',  # tipo B (ex: beq, bne)
-    '0110111': 'U',  # tipo U (ex: lui)
-    '0010111': 'U',  # tipo U (ex: auipc)
-    '1101111': 'J',  # tipo J (ex: jal)
-    '1110011': 'I',  #Tipo I ecall
-}
-
-# Função que converte uma instrução hexadecimal para binário com 32 bits
-def hex_to_bin(hex_str):
-    return bin(int(hex_str, 16))[2:].zfill(32)  # Converte para inteiro, depois para binário, remove o '0b' e completa com zeros à esquerda
-
-# Função que extrai o opcode (7 bits finais) e retorna o tipo da instrução
-def get_instruction_type(binary_instr):
-    opcode = binary_instr[-7:]  # Pega os últimos 7 bits da instrução binária (bits de 0 a 6 no padrão RISC-V)
-    return opcode_types.get(opcode, 'Desconhecido')  # Procura na tabela, se não encontrar retorna "Desconhecido"
-
-# Função que processa o arquivo com instruções em hexadecimal
-def process_instructions(file_path):
-    with open(file_path, 'r') as f:  # Abre o arquivo para leitura
-        lines = f.readlines()  # Lê todas as linhas do arquivo (uma por instrução)
-
-    instructions = []  # Lista para armazenar as instruções e seus tipos
-    type_count = {'R': 0, 'I': 0, 'S': 0, 'B': 0, 'U': 0, 'J': 0, 'Desconhecido': 0}  # Contador de cada tipo de instrução
-
-    for line in lines:  # Percorre cada linha do arquivo
-        hex_instr = line.strip()  # Remove espaços em branco e quebras de linha
-        if not hex_instr:
-            continue  # Se a linha estiver vazia, pula para a próxima
-        bin_instr = hex_to_bin(hex_instr)  # Converte a instrução de hex para binário
-        instr_type = get_instruction_type(bin_instr)  # Identifica o tipo da instrução com base no opcode
-        type_count[instr_type] += 1  # Atualiza o contador do tipo identificado
-        instructions.append((hex_instr, instr_type))  # Adiciona a instrução e seu tipo à lista
-
-    return instructions, type_count  # Retorna a lista de instruções e o dicionário com as contagens
-
-# Função principal que executa o programa
-def main():
-    file_path = "teste3.hex"  # Caminho para o arquivo de entrada (.hex) com as instruções
-    instructions, type_count = process_instructions(file_path)  # Processa o arquivo e recebe os dados
-
-    print("\nInstruções classificadas:")  # Título da listagem
-    for hex_instr, instr_type in instructions:  # Mostra cada instrução e seu tipo
-        print(f"{hex_instr} => Tipo {instr_type}")
-
-    print("\nContagem por tipo:")  # Título da contagem
-    for t, count in type_count.items():  # Mostra quantas instruções tem de cada tipo
-        print(f"{t}: {count}")
-
-# Ponto de entrada do programa (executa a função main se o script for executado diretamente)
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import os  # Extensão e tamanho do arquivo de entrada
+import sys  # Acesso aos argumentos da linha de comando (arquivo de entrada)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'M2'))  # Módulos compartilhados com o M2
+from input_formats import detect_input_format, load_words  # Formatos de entrada (.hex, .bin, ELF e .asm), os mesmos do M2
+
+try:  # NumPy é opcional: permite contar os tipos de um binário inteiro de forma vetorizada
+    import numpy as np
+except ImportError:
+    np = None
+
+# Mapeamento dos opcodes para tipos de instrução
+opcode_types = {
+    '0110011': 'R',  # tipo R (ex: add, sub, sll, etc)
+    '0010011': 'I',  # tipo I (ex: addi, ori, xori, etc)
+    '0000011': 'I',  # tipo I (ex: lw)
+    '1100111': 'I',  # tipo I (ex: jalr)
+    '0100011': 'S',  # tipo S (ex: sw)
+    '1100011': 'B',  # tipo B (ex: beq, bne)
+    '0110111': 'U',  # tipo U (ex: lui)
+    '0010111': 'U',  # tipo U (ex: auipc)
+    '1101111': 'J',  # tipo J (ex: jal)
+    '1110011': 'I',  #Tipo I ecall
+}
+
+# Tabela de 128 posições indexada pelo opcode inteiro (7 bits): classifica sem montar strings binárias
+OPCODE_TYPE_TABLE = ['Desconhecido'] * 128
+for opcode_bits, instr_type in opcode_types.items():
+    OPCODE_TYPE_TABLE[int(opcode_bits, 2)] = instr_type
+
+CHUNK_SIZE = 1 << 20  # Tamanho do bloco lido por vez no modo streaming (1 MiB)
+
+# Função que converte uma instrução hexadecimal para binário com 32 bits
+def hex_to_bin(hex_str):
+    return bin(int(hex_str, 16))[2:].zfill(32)  # Converte para inteiro, depois para binário, remove o '0b' e completa com zeros à esquerda
+
+# Função que extrai o opcode (7 bits finais) e retorna o tipo da instrução
+def get_instruction_type(binary_instr):
+    opcode = binary_instr[-7:]  # Pega os últimos 7 bits da instrução binária (bits de 0 a 6 no padrão RISC-V)
+    return opcode_types.get(opcode, 'Desconhecido')  # Procura na tabela, se não encontrar retorna "Desconhecido"
+
+# Função que processa o arquivo com instruções em hexadecimal
+def process_instructions(file_path):
+    with open(file_path, 'r') as f:  # Abre o arquivo para leitura
+        lines = f.readlines()  # Lê todas as linhas do arquivo (uma por instrução)
+
+    instructions = []  # Lista para armazenar as instruções e seus tipos
+    type_count = {'R': 0, 'I': 0, 'S': 0, 'B': 0, 'U': 0, 'J': 0, 'Desconhecido': 0}  # Contador de cada tipo de instrução
+
+    for line in lines:  # Percorre cada linha do arquivo
+        hex_instr = line.strip()  # Remove espaços em branco e quebras de linha
+        if not hex_instr:
+            continue  # Se a linha estiver vazia, pula para a próxima
+        bin_instr = hex_to_bin(hex_instr)  # Converte a instrução de hex para binário
+        instr_type = get_instruction_type(bin_instr)  # Identifica o tipo da instrução com base no opcode
+        type_count[instr_type] += 1  # Atualiza o contador do tipo identificado
+        instructions.append((hex_instr, instr_type))  # Adiciona a instrução e seu tipo à lista
+
+    return instructions, type_count  # Retorna a lista de instruções e o dicionário com as contagens
+
+# Gerador que lê o arquivo em blocos grandes e devolve uma instrução hexadecimal por vez (memória constante)
+def iter_hex_words(file_path, chunk_size=CHUNK_SIZE):
+    with open(file_path, 'r') as f:
+        pending = ''  # Pedaço de linha que ficou incompleto no fim do bloco anterior
+        while True:
+            chunk = f.read(chunk_size)  # Lê um bloco grande em vez de linha a linha
+            if not chunk:
+                break
+            lines = (pending + chunk).split('\n')
+            pending = lines.pop()  # A última parte pode ser uma linha cortada ao meio
+            for line in lines:
+                hex_instr = line.strip()
+                if hex_instr:  # Pula linhas vazias
+                    yield hex_instr
+        if pending.strip():  # Última linha sem quebra de linha no final
+            yield pending.strip()
+
+# Gerador que classifica cada instrução pelo opcode inteiro e atualiza o histograma durante a leitura
+# Com `decode_cache` (a cache de decodificação do M2), cada palavra vira o registro completo do M2 e o tipo vem dele:
+# a cache gravada por uma execução do M1 é reaproveitada pelo M2, e vice-versa
+def stream_instructions(file_path, type_count, chunk_size=CHUNK_SIZE, decode_cache=None):
+    table = OPCODE_TYPE_TABLE  # Referência local: consulta mais rápida dentro do laço
+    if decode_cache is not None:
+        decode = decode_cache.decode
+        classify = lambda word: decode(word).type  # Tipo do registro decodificado (o mesmo do M2)
+    else:
+        classify = lambda word: table[word & 0x7F]  # Opcode = 7 bits menos significativos
+    input_format = detect_input_format(file_path)
+    if input_format != 'hex':  # Binário/ELF (direto do mapeamento) ou .asm (palavras geradas pelo montador)
+        for word in load_words(file_path, input_format):
+            instr_type = classify(int(word))
+            type_count[instr_type] += 1
+            yield format(int(word), '08x'), instr_type  # Mesmo formato das linhas de um .hex
+        return
+    for hex_instr in iter_hex_words(file_path, chunk_size):
+        instr_type = classify(int(hex_instr, 16))
+        type_count[instr_type] += 1
+        yield hex_instr, instr_type
+
+# Função que apenas conta as instruções por tipo, sem guardar nem imprimir cada uma
+def count_instruction_types(file_path, chunk_size=CHUNK_SIZE, decode_cache=None):
+    type_count = {'R': 0, 'I': 0, 'S': 0, 'B': 0, 'U': 0, 'J': 0, 'Desconhecido': 0}
+    input_format = detect_input_format(file_path)
+    if input_format != 'hex' and np is not None and decode_cache is None:  # Binário/.asm com NumPy: histograma dos opcodes sem laço em Python
+        words = load_words(file_path, input_format)
+        for opcode, count in enumerate(np.bincount(np.asarray(words, dtype=np.uint32) & 0x7F, minlength=128).tolist()):
+            type_count[OPCODE_TYPE_TABLE[opcode]] += count
+        return type_count
+    for _ in stream_instructions(file_path, type_count, chunk_size, decode_cache):
+        pass  # O histograma é atualizado pelo próprio gerador
+    return type_count
+
+# Função principal que executa o programa
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != '--contagem']
+    only_counts = '--contagem' in sys.argv[1:]  # Com --contagem, mostra apenas o histograma por tipo
+    cache_file = None  # Com --cache-decodificacao ARQ, usa (e grava em ARQ) a cache de decodificação do M2
+    if '--cache-decodificacao' in args:
+        i = args.index('--cache-decodificacao')
+        if i + 1 >= len(args):
+            print("Uso: --cache-decodificacao ARQ")
+            return 1
+        cache_file = args[i + 1]
+        del args[i:i + 2]
+    file_path = args[0] if args else "teste3.hex"  # Caminho para o arquivo de entrada (.hex), opcionalmente pela linha de comando
+
+    decode_cache = None
+    if cache_file:
+        from app2 import DECODE_CACHE  # Importado só aqui: carrega todo o M2
+        decode_cache = DECODE_CACHE
+        decode_cache.load(cache_file)  # Palavras já vistas (pelo M1 ou pelo M2) não são decodificadas de novo
+
+    if only_counts:
+        type_count = count_instruction_types(file_path, decode_cache=decode_cache)  # Conta sem listar as instruções
+    else:
+        type_count = {'R': 0, 'I': 0, 'S': 0, 'B': 0, 'U': 0, 'J': 0, 'Desconhecido': 0}
+        print("\nInstruções classificadas:")  # Título da listagem
+        for hex_instr, instr_type in stream_instructions(file_path, type_count, decode_cache=decode_cache):  # Mostra cada instrução à medida que é lida
+            print(f"{hex_instr} => Tipo {instr_type}")
+
+    print("\nContagem por tipo:")  # Título da contagem
+    for t, count in type_count.items():  # Mostra quantas instruções tem de cada tipo
+        print(f"{t}: {count}")
+
+    if cache_file:
+        decode_cache.save(cache_file)
+        stats = decode_cache.stats()
+        print(f"\nCache de decodificação: {stats['hits']} acertos, {stats['misses']} falhas, {stats['entries']} palavras em {cache_file}")
+    return 0
+
+# Ponto de entrada do programa (executa a função main se o script for executado diretamente)
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
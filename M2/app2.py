@@ -1,588 +1,1702 @@
-import os # Importa o módulo 'os' para interagir com o sistema operacional, como verificar se um arquivo existe.
-import copy # Importa o módulo 'copy' para criar cópias de objetos, especialmente útil para listas de dicionários.
-import sys # Importa o módulo 'sys' para acessar parâmetros passados pela linha de comando (como o nome do arquivo de entrada).
-
-# Tipos de instrução por opcode
-opcode_types = { # Dicionário que mapeia os 7 bits menos significativos (opcode) de uma instrução RISC-V para seu tipo (R, I, S, B, U, J).
-    '0110011': 'R',  # tipo R (ex: add, sub) - Instruções aritméticas/lógicas com três registradores.
-    '0010011': 'I',  # tipo I (ex: addi, ori) - Instruções com um imediato e dois registradores (um fonte, um destino).
-    '0000011': 'I',  # tipo I (ex: lw) - Instruções de load, que também usam o formato I.
-    '1100111': 'I',  # tipo I (ex: jalr) - Instrução de jump and link register, formato I.
-    '0100011': 'S',  # tipo S (ex: sw) - Instruções de store, com dois registradores fonte e um imediato para deslocamento.
-    '1100011': 'B',  # tipo B (ex: beq, bne) - Instruções de branch condicional, com dois registradores fonte e um imediato para deslocamento.
-    '0110111': 'U',  # tipo U (ex: lui) - Instruções com um imediato longo e um registrador destino.
-    '0010111': 'U',  # tipo U (ex: auipc) - Add Upper Immediate to PC, formato U.
-    '1101111': 'J',  # tipo J (ex: jal) - Instrução de jump and link, com um imediato longo e um registrador destino.
-    '1110011': 'I',  # tipo I (ecall) - Instrução de system call, usa o formato I mas aqui é tratada de forma genérica.
-}
-
-NOP_HEX = "00000013"  # Define a representação hexadecimal da instrução NOP (No Operation) em RISC-V, que é 'ADDI x0, x0, 0'.
-
-def hex_to_bin(hex_str): # Define uma função para converter uma string hexadecimal em uma string binária de 32 bits.
-    return bin(int(hex_str, 16))[2:].zfill(32) # Converte a string hexadecimal para inteiro (base 16), depois para binário (prefixo '0b' removido com [2:]), e preenche com zeros à esquerda até ter 32 bits.
-
-def bin_to_hex(bin_str): # Define uma função para converter uma string binária em uma string hexadecimal de 8 caracteres.
-    return hex(int(bin_str, 2))[2:].upper().zfill(8) # Converte a string binária para inteiro (base 2), depois para hexadecimal (prefixo '0x' removido com [2:]), converte para maiúsculas e preenche com zeros à esquerda até ter 8 caracteres.
-
-def get_instruction_type(binary_instr): # Define uma função para obter o tipo da instrução (R, I, S, etc.) a partir de sua representação binária.
-    return opcode_types.get(binary_instr[-7:], 'Desconhecido') # Retorna o tipo da instrução buscando os 7 últimos bits (opcode) no dicionário 'opcode_types'. Se não encontrado, retorna 'Desconhecido'.
-
-def is_load_instruction(hex_instr): # Define uma função para verificar se uma instrução hexadecimal é do tipo LOAD.
-    """Verifica se é instrução LOAD baseada no opcode"""
-    bin_instr = hex_to_bin(hex_instr) # Converte a instrução hexadecimal para binário.
-    opcode = bin_instr[-7:] # Extrai os 7 bits do opcode.
-    return opcode == '0000011' # Retorna True se o opcode corresponde ao de uma instrução LOAD ('lw'), False caso contrário.
-
-def is_store_instruction(hex_instr): # Define uma função para verificar se uma instrução hexadecimal é do tipo STORE.
-    """Verifica se é instrução STORE baseada no opcode"""
-    bin_instr = hex_to_bin(hex_instr) # Converte a instrução hexadecimal para binário.
-    opcode = bin_instr[-7:] # Extrai os 7 bits do opcode.
-    return opcode == '0100011' # Retorna True se o opcode corresponde ao de uma instrução STORE ('sw'), False caso contrário.
-
-def is_branch_instruction(hex_instr): # Define uma função para verificar se uma instrução hexadecimal é de desvio (branch ou jump).
-    """Verifica se é instrução de branch/jump"""
-    bin_instr = hex_to_bin(hex_instr) # Converte a instrução hexadecimal para binário.
-    opcode = bin_instr[-7:] # Extrai os 7 bits do opcode.
-    return opcode in ['1100011', '1101111', '1100111']  # Retorna True se o opcode é de B (branch), J (jump) ou JALR (jump and link register), False caso contrário.
-
-def decode_registers(bin_instr): # Define uma função para decodificar os registradores (rs1, rs2, rd) de uma instrução binária.
-    opcode = bin_instr[-7:] # Extrai os 7 bits do opcode.
-    instr_type = get_instruction_type(bin_instr) # Obtém o tipo da instrução (R, I, S, etc.).
-    rs1 = rs2 = rd = None # Inicializa os registradores como None.
-
-    if instr_type == 'R': # Se a instrução é do tipo R:
-        rd = int(bin_instr[20:25], 2) # O registrador destino (rd) está nos bits 20 a 24 (índices 20 a 25-1).
-        rs1 = int(bin_instr[12:17], 2) # O primeiro registrador fonte (rs1) está nos bits 12 a 16.
-        rs2 = int(bin_instr[7:12], 2) # O segundo registrador fonte (rs2) está nos bits 7 a 11.
-    elif instr_type == 'I': # Se a instrução é do tipo I:
-        rd = int(bin_instr[20:25], 2) # O registrador destino (rd) está nos bits 20 a 24.
-        rs1 = int(bin_instr[12:17], 2) # O primeiro registrador fonte (rs1) está nos bits 12 a 16.
-        # rs2 não é usado diretamente como um campo de 5 bits neste formato para todas as instruções I, mas o campo imediato ocupa essa posição.
-    elif instr_type == 'S': # Se a instrução é do tipo S:
-        rs1 = int(bin_instr[12:17], 2) # O primeiro registrador fonte (rs1 - base address) está nos bits 12 a 16.
-        rs2 = int(bin_instr[7:12], 2) # O segundo registrador fonte (rs2 - data to store) está nos bits 7 a 11.
-        # rd não é usado.
-    elif instr_type == 'B': # Se a instrução é do tipo B:
-        rs1 = int(bin_instr[12:17], 2) # O primeiro registrador fonte (rs1) está nos bits 12 a 16.
-        rs2 = int(bin_instr[7:12], 2) # O segundo registrador fonte (rs2) está nos bits 7 a 11.
-        # rd não é usado.
-    elif instr_type == 'U' or instr_type == 'J': # Se a instrução é do tipo U ou J:
-        rd = int(bin_instr[20:25], 2) # O registrador destino (rd) está nos bits 20 a 24.
-        # rs1 e rs2 não são usados.
-    
-    return instr_type, rs1, rs2, rd # Retorna o tipo da instrução e os valores inteiros dos registradores decodificados.
-
-def read_instructions(file_path): # Define uma função para ler instruções de um arquivo.
-    instructions = [] # Inicializa uma lista vazia para armazenar as instruções processadas.
-    with open(file_path, 'r') as f: # Abre o arquivo especificado em modo de leitura ('r').
-        for line in f: # Itera sobre cada linha do arquivo.
-            hex_instr = line.strip().upper() # Remove espaços em branco no início/fim da linha e converte para maiúsculas.
-            if not hex_instr: # Se a linha estiver vazia após o strip, pula para a próxima.
-                continue
-            bin_instr = hex_to_bin(hex_instr) # Converte a instrução hexadecimal para binário.
-            instr_type, rs1, rs2, rd = decode_registers(bin_instr) # Decodifica os registradores da instrução binária.
-            instructions.append({ # Adiciona um dicionário à lista 'instructions' contendo informações da instrução.
-                'hex': hex_instr, # A instrução original em hexadecimal.
-                'bin': bin_instr, # A instrução em binário.
-                'type': instr_type, # O tipo da instrução (R, I, S, etc.).
-                'rs1': rs1, # O registrador fonte rs1 (ou None).
-                'rs2': rs2, # O registrador fonte rs2 (ou None).
-                'rd': rd, # O registrador destino rd (ou None).
-                'is_load': is_load_instruction(hex_instr), # Booleano: True se for uma instrução de LOAD.
-                'is_store': is_store_instruction(hex_instr), # Booleano: True se for uma instrução de STORE.
-                'is_branch': is_branch_instruction(hex_instr) # Booleano: True se for uma instrução de branch/jump.
-            })
-    return instructions # Retorna a lista de dicionários de instruções.
-
-def detect_data_conflicts(instructions, forwarding=False): # Define uma função para detectar conflitos de dados (RAW hazards).
-    """Detecta conflitos de dados (RAW hazards)"""
-    conflicts = [] # Inicializa uma lista vazia para armazenar os conflitos detectados.
-    
-    for i in range(len(instructions)): # Itera sobre cada instrução (instrução atual).
-        current = instructions[i] # Pega a instrução atual.
-        
-        # Verifica conflitos com instruções anteriores (até 3 instruções antes, pois um pipeline de 5 estágios pode ter dependências nessa janela).
-        for j in range(max(0, i-3), i): # Itera sobre as instruções anteriores à atual ('prev'). O 'max(0, i-3)' evita índices negativos.
-            prev = instructions[j] # Pega uma instrução anterior.
-            distance = i - j # Calcula a distância entre a instrução atual e a anterior.
-            
-            # Só considera conflito se a instrução anterior escreve em um registrador válido (rd não é None e rd não é x0, o registrador zero).
-            if prev['rd'] is not None and prev['rd'] != 0:
-                # Verifica se a instrução atual lê (usa rs1 ou rs2) o registrador que a instrução anterior escreve (prev['rd']).
-                read_conflict = False
-                if current['rs1'] == prev['rd'] or \
-                   (current['rs2'] is not None and current['rs2'] == prev['rd']): # Garante que current['rs2'] não seja None antes de comparar.
-                    read_conflict = True
-                
-                if read_conflict: # Se há uma potencial dependência RAW.
-                    conflict_exists = False # Flag para indicar se o conflito realmente causa uma bolha/NOP.
-                    if not forwarding: # Se o forwarding NÃO está habilitado:
-                        # Sem forwarding: conflito se a distância entre a escrita e a leitura for menor ou igual a 2 ciclos (resultando em bolhas).
-                        # (Escrita no estágio WB, Leitura no estágio ID. WB de I_prev ocorre no ciclo k+4, ID de I_curr no ciclo k+2. Se I_curr é I_j e I_prev é I_i, j=i+1 -> conflito de 2 bolhas, j=i+2 -> conflito de 1 bolha)
-                        if distance <= 2:
-                            conflict_exists = True
-                    else: # Se o forwarding ESTÁ habilitado:
-                        # Com forwarding: conflito ocorre apenas para load-use hazard, onde a instrução anterior é um LOAD e a distância é 1.
-                        # (LOAD no estágio MEM, a instrução seguinte no estágio EX. O dado do LOAD só está disponível após MEM).
-                        if distance == 1 and prev['is_load']:
-                            conflict_exists = True
-                    
-                    if conflict_exists: # Se o conflito requer uma bolha.
-                        conflicts.append({ # Adiciona informações sobre o conflito à lista.
-                            'position': i, # Posição (índice) da instrução atual que sofre o conflito.
-                            'source': j, # Posição (índice) da instrução anterior que causa o conflito.
-                            'register': prev['rd'], # Registrador envolvido no conflito.
-                            'distance': distance, # Distância entre as instruções.
-                            'is_load_use': prev['is_load'] and distance == 1 # True se for um conflito load-use.
-                        })
-    
-    return conflicts # Retorna a lista de conflitos de dados detectados.
-
-def detect_control_conflicts(instructions): # Define uma função para detectar conflitos de controle (branch/jump hazards).
-    """Detecta conflitos de controle (branch/jump hazards)"""
-    conflicts = [] # Inicializa uma lista vazia para armazenar os conflitos de controle.
-    
-    for i, instr in enumerate(instructions): # Itera sobre cada instrução com seu índice.
-        if instr['is_branch']: # Se a instrução é um branch ou jump.
-            conflicts.append({ # Adiciona informações sobre o conflito de controle.
-                'position': i, # Posição (índice) da instrução de branch/jump.
-                'type': instr['type'] # Tipo da instrução de branch/jump.
-            })
-    
-    return conflicts # Retorna a lista de conflitos de controle.
-
-def insert_nops_data(instructions, forwarding=False): # Define uma função para inserir NOPs para resolver conflitos de dados.
-    """Insere NOPs para resolver conflitos de dados - CORRIGIDO"""
-    result = [] # Inicializa uma lista para o código com NOPs inseridos.
-    
-    # Este laço itera sobre as instruções originais para construir a lista `result`.
-    # A lógica de inserção de NOPs acontece *após* adicionar a instrução `current` e antes de processar a `instructions[i+1]`.
-    idx = 0 # Índice para percorrer a lista `instructions`.
-    while idx < len(instructions): # Enquanto houver instruções originais para processar.
-        current_original_instr = instructions[idx] # Pega a instrução original atual.
-        result.append(copy.deepcopy(current_original_instr)) # Adiciona uma cópia da instrução original à lista de resultados.
-
-        # Verifica se a instrução que acabou de ser adicionada (`current_original_instr`) escreve em um registrador
-        # e pode causar um conflito com as próximas instruções originais.
-        if current_original_instr['rd'] is not None and current_original_instr['rd'] != 0:
-            nops_to_insert_after_current = 0 # Quantos NOPs precisam ser inseridos após a `current_original_instr`.
-
-            # Olha para as próximas instruções originais para ver se elas dependem da `current_original_instr`.
-            # O loop vai até 2 instruções à frente (para `distance` 1 e 2) se não houver forwarding,
-            # ou 1 instrução à frente (para `distance` 1) se houver forwarding e `current_original_instr` for um LOAD.
-            lookahead_limit = 1 if (forwarding and current_original_instr['is_load']) else 2
-            
-            for k in range(1, lookahead_limit + 1): # k representa a distância (1 ou 2).
-                if idx + k < len(instructions): # Verifica se a próxima instrução (idx + k) existe.
-                    next_potential_dependent_instr = instructions[idx + k] # Pega a próxima instrução original.
-
-                    # Verifica se há dependência RAW (next_potential_dependent_instr lê o que current_original_instr escreveu).
-                    if (next_potential_dependent_instr['rs1'] == current_original_instr['rd'] or \
-                       (next_potential_dependent_instr['rs2'] is not None and next_potential_dependent_instr['rs2'] == current_original_instr['rd'])):
-                        
-                        nops_needed_for_this_dependency = 0 # NOPs necessários para esta dependência específica.
-                        if not forwarding: # Sem forwarding:
-                            # Se a distância é 1, são necessários 2 NOPs. (Ex: add R1,R2,R3; add R4,R1,R5 -> R1 lido 2 ciclos depois)
-                            # Se a distância é 2, é necessário 1 NOP.   (Ex: add R1,R2,R3; nop; add R4,R1,R5 -> R1 lido 2 ciclos depois)
-                            # A instrução que escreve (current_original_instr) está no ciclo C.
-                            # A instrução que lê (next_potential_dependent_instr) está no ciclo C+k.
-                            # Sem forwarding, a escrita em WB é no ciclo C+4. A leitura em ID é no ciclo C+k+1.
-                            # Para não haver stall, C+k+1 > C+4  => k+1 > 4 => k > 3.
-                            # Se k=1, precisa de 2 NOPs. (Original: I1, I2. Com NOPs: I1, NOP, NOP, I2)
-                            # Se k=2, precisa de 1 NOP.  (Original: I1, I_other, I2. Com NOPs: I1, I_other, NOP, I2)
-                            if k == 1: nops_needed_for_this_dependency = 2
-                            elif k == 2: nops_needed_for_this_dependency = 1
-                        else: # Com forwarding:
-                            # NOPs são necessários apenas para load-use hazard.
-                            # Se a instrução que escreve (current_original_instr) é um LOAD e a distância é 1 (k=1).
-                            if current_original_instr['is_load'] and k == 1:
-                                nops_needed_for_this_dependency = 1 # Precisa de 1 NOP.
-                        
-                        # Mantém o maior número de NOPs necessários encontrado até agora para a `current_original_instr`.
-                        nops_to_insert_after_current = max(nops_to_insert_after_current, nops_needed_for_this_dependency)
-            
-            # Insere os NOPs calculados após a `current_original_instr` na lista `result`.
-            for _ in range(nops_to_insert_after_current):
-                result.append({
-                    'hex': NOP_HEX, 'type': 'NOP', 'rs1': None, 'rs2': None, 'rd': None,
-                    'is_load': False, 'is_store': False, 'is_branch': False
-                })
-        
-        idx += 1 # Move para a próxima instrução original.
-
-    nops_added = len(result) - len(instructions) # Calcula o número total de NOPs adicionados.
-    return result, nops_added # Retorna a lista de instruções com NOPs e a contagem de NOPs.
-
-def has_dependency(instr1, instr2): # Define uma função para verificar se existe dependência (RAW, WAR, WAW) entre duas instruções.
-    """Verifica se existe dependência entre duas instruções"""
-    # RAW (Read After Write): instr2 lê um registrador que instr1 escreve.
-    if instr1['rd'] is not None and instr1['rd'] != 0: # Se instr1 escreve em um registrador válido.
-        if (instr2['rs1'] is not None and instr2['rs1'] == instr1['rd']) or \
-           (instr2['rs2'] is not None and instr2['rs2'] == instr1['rd']): # E instr2 lê esse registrador.
-            return True # Há uma dependência RAW.
-    
-    # WAR (Write After Read): instr2 escreve em um registrador que instr1 lê.
-    if instr2['rd'] is not None and instr2['rd'] != 0: # Se instr2 escreve em um registrador válido.
-        if (instr1['rs1'] is not None and instr1['rs1'] == instr2['rd']) or \
-           (instr1['rs2'] is not None and instr1['rs2'] == instr2['rd']): # E instr1 lê esse registrador.
-            return True # Há uma dependência WAR.
-    
-    # WAW (Write After Write): instr2 escreve no mesmo registrador que instr1 escreve.
-    if (instr1['rd'] is not None and instr2['rd'] is not None and 
-        instr1['rd'] != 0 and instr2['rd'] != 0 and instr1['rd'] == instr2['rd']): # Se ambas escrevem no mesmo registrador válido.
-        return True # Há uma dependência WAW.
-    
-    return False # Nenhuma dependência detectada.
-
-def can_reorder_safely(instructions, pos1, pos2): # Define uma função para verificar se duas instruções (em pos1 e pos2) podem ser reordenadas com segurança.
-    """Verifica se duas instruções podem ser reordenadas com segurança"""
-    # Assume-se que queremos mover a instrução em pos2 para a posição de pos1, e a de pos1 para pos1+1.
-    # Esta função na verdade verifica se instr[pos2] pode ser movida para *antes* de instr[pos1].
-    # A lógica em `reorder_to_avoid_nops` tenta mover `candidate` (instr[j]) para *imediatamente após* `current` (instr[i]).
-    # O que se quer verificar é se podemos trocar `instructions[pos1]` com `instructions[pos2]`.
-    # Ou seja, `instr1` (em `pos1`) e `instr2` (em `pos2`). Original: ..., instr1, ..., instr2, ...  -> Trocado: ..., instr2, ..., instr1, ...
-
-    if pos1 >= pos2 or pos1 < 0 or pos2 >= len(instructions): # Verifica se as posições são válidas e distintas.
-        return False
-    
-    instr1 = instructions[pos1] # Instrução originalmente na primeira posição.
-    instr2 = instructions[pos2] # Instrução originalmente na segunda posição.
-    
-    # Não pode reordenar instruções de controle, pois isso alteraria o fluxo do programa.
-    if instr1['is_branch'] or instr2['is_branch']:
-        return False
-    
-    # Não pode reordenar loads/stores em relação a outras loads/stores ou entre si de forma simplista devido a possíveis dependências de memória (aliasing).
-    # Para uma reordenação segura, precisaríamos de análise de dependência de memória, o que é complexo.
-    # Esta simplificação evita reordenar qualquer load/store.
-    if instr1['is_load'] or instr1['is_store'] or instr2['is_load'] or instr2['is_store']:
-        return False
-    
-    # Verifica se a troca (instr2 antes de instr1) introduz novas dependências ou viola existentes.
-    # Se instr2 é movida para antes de instr1:
-    #   - instr2 não pode depender de instr1 (RAW se instr1 escreve o que instr2 lê).
-    #   - instr1 não pode depender de instr2 de forma que a ordem importe (WAR/WAW).
-    if has_dependency(instr1, instr2): # Se já existe uma dependência entre instr1 e instr2 na ordem original.
-        return False # Trocá-las provavelmente violaria essa dependência.
-
-    # Verifica dependências com instruções intermediárias.
-    # Se instr2 é movida para a posição de instr1, e instr1 e as intermediárias são deslocadas.
-    # Ex: A, B, C, D. Mover D para a posição de B: A, D, B, C.
-    # Aqui, a intenção parece ser trocar `instr1` (em `pos1`) com `instr2` (em `pos2`).
-    # `instr1` é `instructions[pos1]`, `instr2` é `instructions[pos2]`.
-    # Ordem original: ... I_before_pos1, instr1, I_inter_1, ..., I_inter_k, instr2, I_after_pos2 ...
-    # Ordem nova:     ... I_before_pos1, instr2, I_inter_1, ..., I_inter_k, instr1, I_after_pos2 ...
-    # Precisamos checar se `instr2` depende de alguma `I_inter_j` ou se alguma `I_inter_j` depende de `instr2` de forma que a nova ordem seja inválida.
-    # E similarmente para `instr1` com as `I_inter_j` na nova ordem.
-
-    # A condição na `reorder_to_avoid_nops` é: `temp_list = reordered[:i] + [candidate] + [current] + reordered[i+1:j] + reordered[j+1:]`
-    # Onde `current` é `instructions[i]` e `candidate` é `instructions[j]`.
-    # Ou seja, `current` é `instr1` e `candidate` é `instr2`.
-    # A `candidate` (instr2) é movida para *imediatamente após* `current` (instr1), mas a função aqui é usada para verificar se `instr1` e `instr2` podem ser trocadas.
-    # Esta função `can_reorder_safely` parece estar verificando se `instr1` (em `pos1`) pode ser trocada com `instr2` (em `pos2`).
-    # Se `instr1` e `instr2` são trocadas:
-    #   `instr1` não pode ter dependência WAR ou WAW com `instr2` (porque `instr2` viria antes).
-    #   `instr2` não pode ter dependência RAW com `instr1` (porque `instr2` viria antes).
-    #   Para cada instrução `intermediate` entre `pos1` e `pos2`:
-    #     - `instr1` (que vai para `pos2`) não pode depender de `intermediate` de forma que a nova ordem seja ruim.
-    #     - `intermediate` não pode depender de `instr1` de forma que a nova ordem seja ruim.
-    #     - `instr2` (que vai para `pos1`) não pode depender de `intermediate` de forma que a nova ordem seja ruim.
-    #     - `intermediate` não pode depender de `instr2` de forma que a nova ordem seja ruim.
-
-    # A verificação de dependência direta `has_dependency(instr1, instr2)` já cobre alguns casos.
-    # A lógica aqui parece simplificada: se há *qualquer* dependência entre `instr1` ou `instr2` e *qualquer* instrução intermediária, não reordena.
-    for k in range(pos1 + 1, pos2): # Itera sobre as instruções entre pos1 e pos2.
-        intermediate = instructions[k] # Pega uma instrução intermediária.
-        # Se instr1 (originalmente em pos1) tem dependência com intermediate, ou
-        # se intermediate tem dependência com instr2 (originalmente em pos2), ou
-        # se instr2 tem dependência com intermediate.
-        # Esta lógica é um pouco confusa em relação à transformação exata que está sendo permitida.
-        # Se a intenção é trocar `instr1` e `instr2`, então:
-        # - `instr2` vs `intermediate`: `has_dependency(instr2, intermediate)` (instr2 virá antes de intermediate)
-        # - `intermediate` vs `instr1`: `has_dependency(intermediate, instr1)` (intermediate virá antes de instr1)
-        if (has_dependency(instr1, intermediate) or # Se instr1 (em pos1) depende ou é dependida por uma intermediária.
-            has_dependency(intermediate, instr2) or # Se uma intermediária depende ou é dependida por instr2 (em pos2).
-            has_dependency(instr2, intermediate)): # Adicionando a verificação simétrica para instr2 e intermediate.
-            # A ideia é que nem `instr1` nem `instr2` podem ter suas dependências com as instruções intermediárias alteradas de forma a quebrar o programa.
-            # Se `instr1` vai para depois de `intermediate`, e `intermediate` lia algo que `instr1` escrevia, isso pode ser um problema.
-            # Se `instr2` vai para antes de `intermediate`, e `instr2` escreve algo que `intermediate` lia, isso pode ser um problema.
-            return False # Não pode reordenar se houver dependência com intermediárias.
-    
-    return True # Se passou por todas as verificações, pode reordenar.
-
-def reorder_to_avoid_nops(instructions, forwarding=False): # Define uma função para reordenar instruções para minimizar NOPs devido a conflitos de dados.
-    """Reordena instruções para minimizar NOPs - CORRIGIDO"""
-    # Primeiro, calcula NOPs sem reordenação para ter uma linha de base.
-    _, original_nops = insert_nops_data(instructions, forwarding) # O '_' ignora o primeiro valor retornado (lista de instruções com NOPs).
-    
-    reordered = copy.deepcopy(instructions) # Cria uma cópia profunda da lista de instruções para manipular.
-    improvements_made = True # Flag para controlar o loop de otimização.
-    
-    # Aplica várias passadas de otimização enquanto melhorias puderem ser feitas.
-    while improvements_made:
-        improvements_made = False # Reseta a flag no início de cada passada.
-        
-        # Itera sobre as instruções na lista (potencialmente já reordenada).
-        # O `i` é o índice da instrução que pode estar causando um futuro stall (produtora).
-        for i in range(len(reordered)): 
-            current_producer = reordered[i] # A instrução atual que pode ser uma produtora de dados.
-            
-            # Se esta instrução (`current_producer`) escreve em um registrador (é uma produtora potencial de conflito RAW).
-            if current_producer['rd'] is not None and current_producer['rd'] != 0:
-                # Tenta encontrar uma instrução independente (`candidate_consumer_or_independent`) nas próximas posições (janela de até 3 instruções)
-                # que poderia ser adiantada para preencher um slot de NOP que seria causado pela `current_producer`.
-                # A ideia é: se `current_producer` é seguida por `instr_A` que depende dela, causando NOPs,
-                # talvez possamos encontrar `instr_B` (que não depende de `current_producer`) mais à frente
-                # e movê-la para entre `current_producer` e `instr_A`.
-                # Original: P, A (causa NOPs), B -> Com reordenação: P, B, A (idealmente B não depende de P, e A não depende de B).
-                
-                # O loop `j` procura por uma instrução `candidate_to_move_up` que pode ser movida para logo após `current_producer`.
-                # Este `j` é o índice da instrução que será considerada para ser movida para a posição `i+1`.
-                for j in range(i + 1, min(i + 4, len(reordered))): # Janela de busca.
-                    candidate_to_move_up = reordered[j] # A instrução que estamos considerando mover.
-                    
-                    # Verifica se `candidate_to_move_up` (de `reordered[j]`) pode ser movida para a posição `i+1`,
-                    # ou seja, entre `reordered[i]` (current_producer) e `reordered[i+1]` (se existir).
-                    # A função `can_reorder_safely` precisa ser interpretada corretamente aqui.
-                    # `can_reorder_safely(lista, pos_A, pos_B)` verifica se `lista[pos_A]` e `lista[pos_B]` podem ser trocadas.
-                    # Aqui, a intenção é mover `candidate_to_move_up` (de `j`) para `i+1`.
-                    # Isso significa que `current_producer` (em `i`) permanece, `candidate_to_move_up` (de `j`) vai para `i+1`,
-                    # e as instruções entre `i+1` e `j-1` são deslocadas para `i+2` até `j`.
-                    
-                    # Vamos simplificar a condição de reordenação:
-                    #   1. `candidate_to_move_up` não pode depender de `current_producer`.
-                    #   2. Nenhuma instrução entre `current_producer` e `candidate_to_move_up` pode depender de `candidate_to_move_up`.
-                    #   3. `candidate_to_move_up` não pode ser branch, load ou store (para simplificar).
-                    
-                    can_move_candidate = True
-                    if candidate_to_move_up['is_branch'] or candidate_to_move_up['is_load'] or candidate_to_move_up['is_store']:
-                        can_move_candidate = False
-                    if has_dependency(current_producer, candidate_to_move_up): # Se a candidata depende da produtora, não pode mover para logo depois sem NOPs (a menos que a produtora seja LW e haja forwarding).
-                        can_move_candidate = False # Essa condição é forte, queremos mover algo *independente* da produtora.
-                    
-                    if can_move_candidate:
-                        for k_inter in range(i + 1, j): # Verifica dependências com as instruções que seriam "puladas".
-                            intermediate_instr = reordered[k_inter]
-                            # Se a candidata escreve algo que a intermediária lê (RAW), ou lê algo que a intermediária escreve (WAR),
-                            # ou escreve no mesmo lugar (WAW).
-                            if has_dependency(candidate_to_move_up, intermediate_instr) or has_dependency(intermediate_instr, candidate_to_move_up):
-                                can_move_candidate = False
-                                break
-                    
-                    if can_move_candidate:
-                        # Simula a movimentação: `candidate_to_move_up` (de `j`) é inserida em `i+1`.
-                        temp_list = list(reordered) # Cria uma cópia para simulação.
-                        moved_instr = temp_list.pop(j) # Remove a candidata da sua posição original.
-                        temp_list.insert(i + 1, moved_instr) # Insere a candidata após `current_producer`.
-                        
-                        _, temp_nops = insert_nops_data(temp_list, forwarding) # Calcula NOPs com a lista temporária reordenada.
-                        _, current_nops = insert_nops_data(reordered, forwarding) # Calcula NOPs com a lista atual (antes da tentativa de reordenação).
-                        
-                        if temp_nops < current_nops: # Se a reordenação reduziu o número de NOPs.
-                            reordered = temp_list # Aplica a mudança à lista principal.
-                            improvements_made = True # Indica que uma melhoria foi feita nesta passada.
-                            break # Sai do loop interno `j` e tenta reavaliar desde o início da lista `reordered` (devido ao `while improvements_made`).
-            
-            if improvements_made: # Se uma melhoria foi feita no loop interno `j`.
-                break # Sai do loop externo `i` para reiniciar o processo `while` e reavaliar toda a lista.
-    
-    # Após o loop de reordenação, insere os NOPs finais na lista otimizada.
-    final_result, final_nops = insert_nops_data(reordered, forwarding)
-    nops_saved = max(0, original_nops - final_nops) # Calcula quantos NOPs foram economizados.
-    
-    return final_result, nops_saved # Retorna a lista final de instruções (com NOPs) e o número de NOPs economizados.
-
-def handle_branch_conflicts_nop(instructions): # Define uma função para tratar conflitos de controle inserindo um NOP após cada instrução de branch/jump.
-    """Adiciona NOPs após instruções de controle"""
-    result = [] # Inicializa uma lista para o resultado.
-    nops_added = 0 # Contador de NOPs adicionados.
-    
-    for instr in instructions: # Itera sobre cada instrução original.
-        result.append(copy.deepcopy(instr)) # Adiciona a instrução atual ao resultado.
-        
-        if instr['is_branch']: # Se a instrução é um branch/jump.
-            result.append({ # Adiciona um NOP após ela.
-                'hex': NOP_HEX, 'type': 'NOP', 'rs1': None, 'rs2': None, 'rd': None,
-                'is_load': False, 'is_store': False, 'is_branch': False
-            })
-            nops_added += 1 # Incrementa o contador de NOPs.
-    
-    return result, nops_added # Retorna a lista com NOPs de branch e a contagem de NOPs adicionados.
-
-def handle_delayed_branch(instructions): # Define uma função para implementar a técnica de delayed branch.
-    """Implementa delayed branch - CORRIGIDO"""
-    # A ideia é preencher o "delay slot" (a instrução imediatamente após um branch) com uma instrução útil.
-    result = [] # Lista para as instruções processadas com delayed branch.
-    nops_added_for_delay_slots = 0 # NOPs adicionados se não foi possível preencher o slot.
-    # `useful_moved` não é usado no retorno, mas poderia contar quantas vezes o slot foi preenchido utilmente.
-    
-    i = 0 # Índice para percorrer a lista de instruções original.
-    while i < len(instructions): # Itera sobre as instruções.
-        current_instr = instructions[i] # Pega a instrução atual.
-        
-        if current_instr['is_branch']: # Se a instrução atual é um branch.
-            # Adiciona a instrução de branch primeiro.
-            result.append(copy.deepcopy(current_instr))
-            
-            # Tenta encontrar uma instrução ANTERIOR para mover para o delay slot (após o branch).
-            # Esta é uma estratégia "branch-likely" ou "move from before".
-            slot_filled_with_useful_instruction = False
-            
-            # Procura nas instruções já adicionadas a `result` (ou seja, antes do branch).
-            # `len(result) - 1` é o branch. `len(result) - 2` é a instrução antes do branch.
-            # Tenta mover uma instrução de até 3 posições antes do branch (índices `idx_candidate_to_move`).
-            for lookback_idx in range(1, min(4, len(result))): # Olha 1, 2 ou 3 instruções para trás.
-                idx_candidate_to_move = len(result) - 1 - lookback_idx # Índice da candidata em `result`.
-                if idx_candidate_to_move < 0: break # Não há mais instruções para trás.
-
-                candidate_instr = result[idx_candidate_to_move] # Pega a instrução candidata.
-                
-                can_move_to_slot = True
-                # 1. A candidata não pode ser ela mesma um branch, load ou store (simplificação).
-                if candidate_instr['is_branch'] or candidate_instr['is_load'] or candidate_instr['is_store'] or candidate_instr['type'] == 'NOP':
-                    can_move_to_slot = False
-                
-                # 2. A candidata não pode modificar os registradores lidos pela instrução de branch.
-                if can_move_to_slot and candidate_instr['rd'] is not None and candidate_instr['rd'] != 0:
-                    if (current_instr['rs1'] is not None and current_instr['rs1'] == candidate_instr['rd']) or \
-                       (current_instr['rs2'] is not None and current_instr['rs2'] == candidate_instr['rd']):
-                        can_move_to_slot = False
-                
-                # 3. A candidata não pode depender de instruções entre ela e o branch (que permaneceriam antes do branch).
-                # (Se a candidata lia algo que uma instrução intermediária escrevia, mover a candidata para depois do branch quebraria isso).
-                if can_move_to_slot:
-                    for k_inter in range(idx_candidate_to_move + 1, len(result) - 1): # Instruções entre a candidata e o branch.
-                        intermediate_instr_before_branch = result[k_inter]
-                        if has_dependency(intermediate_instr_before_branch, candidate_instr): # Se a candidata (que será movida) depende da intermediária.
-                            can_move_to_slot = False
-                            break
-                
-                if can_move_to_slot:
-                    moved_instr = result.pop(idx_candidate_to_move) # Remove a candidata de sua posição original.
-                    result.append(moved_instr) # Adiciona a candidata no delay slot (após o branch).
-                    slot_filled_with_useful_instruction = True
-                    break # Slot preenchido, sai do loop de busca.
-            
-            if not slot_filled_with_useful_instruction:
-                # Se não encontrou instrução útil para mover, insere um NOP no delay slot.
-                result.append({
-                    'hex': NOP_HEX, 'type': 'NOP', 'rs1': None, 'rs2': None, 'rd': None,
-                    'is_load': False, 'is_store': False, 'is_branch': False
-                })
-                nops_added_for_delay_slots += 1
-            
-            i += 1 # Avança o índice da instrução original (branch já processado).
-        else:
-            # Se não for um branch, apenas adiciona a instrução ao resultado.
-            result.append(copy.deepcopy(current_instr))
-            i += 1 # Avança o índice.
-            
-    return result, nops_added_for_delay_slots # Retorna a lista com delayed branches e NOPs adicionados.
-
-def write_output(filename, instrs): # Define uma função para escrever a lista de instruções (em formato hexadecimal) em um arquivo.
-    with open(filename, 'w') as f: # Abre o arquivo especificado em modo de escrita ('w').
-        for instr in instrs: # Itera sobre cada instrução na lista.
-            f.write(instr['hex'] + '\n') # Escreve o campo 'hex' da instrução seguido de uma nova linha.
-
-def write_conflicts_report(filename, conflicts, title): # Define uma função para escrever um relatório de conflitos em um arquivo.
-    with open(filename, 'w') as f: # Abre o arquivo em modo de escrita.
-        f.write(f"=== {title} ===\n\n") # Escreve o título do relatório.
-        if not conflicts: # Se a lista de conflitos estiver vazia.
-            f.write("Nenhum conflito detectado.\n") # Informa que não há conflitos.
-        else: # Se houver conflitos.
-            for conflict in conflicts: # Itera sobre cada conflito.
-                if 'register' in conflict:  # Se for um conflito de dados (possui a chave 'register').
-                    conflict_type_str = "Load-Use" if conflict.get('is_load_use', False) else "RAW" # Determina se é Load-Use ou RAW genérico.
-                    f.write(f"Conflito {conflict_type_str} na posição {conflict['position']}: ") # Escreve o tipo e posição do conflito.
-                    f.write(f"Registrador x{conflict['register']} ") # Escreve o registrador envolvido.
-                    f.write(f"(fonte: pos {conflict['source']}, distância: {conflict['distance']})\n") # Escreve a origem e distância do conflito.
-                else:  # Se for um conflito de controle (não possui 'register', mas tem 'type').
-                    f.write(f"Conflito de controle na posição {conflict['position']}: ") # Escreve a posição.
-                    f.write(f"Instrução tipo {conflict['type']}\n") # Escreve o tipo da instrução de controle.
-
-def main(): # Define a função principal do programa.
-    # Permite especificar arquivo via linha de comando.
-    if len(sys.argv) > 1: # Se mais de um argumento foi passado na linha de comando (o primeiro é o nome do script).
-        input_file = sys.argv[1] # Usa o segundo argumento como nome do arquivo de entrada.
-    else:
-        input_file = "teste5.hex" # Nome padrão do arquivo de entrada se nenhum for fornecido.
-    
-    if not os.path.exists(input_file): # Verifica se o arquivo de entrada existe.
-        print(f"Arquivo {input_file} não encontrado!") # Informa se o arquivo não foi encontrado.
-        return # Encerra o programa.
-    
-    original = read_instructions(input_file) # Lê as instruções do arquivo de entrada.
-    
-    print("=== ANÁLISE DE CONFLITOS NO PIPELINE ===\n") # Imprime um cabeçalho.
-    print(f"Arquivo de entrada: {input_file}") # Imprime o nome do arquivo de entrada.
-    print(f"Total de instruções: {len(original)}\n") # Imprime o número total de instruções originais.
-    
-    # Técnica 1: Detectar conflitos de dados sem forwarding.
-    data_conflicts_sf = detect_data_conflicts(original, forwarding=False) # Detecta conflitos de dados sem forwarding.
-    write_conflicts_report("conflitos_dados_sem_forwarding.txt", # Escreve o relatório.
-                           data_conflicts_sf, "CONFLITOS DE DADOS SEM FORWARDING")
-    
-    # Técnica 2: Detectar conflitos de dados com forwarding.
-    data_conflicts_cf = detect_data_conflicts(original, forwarding=True) # Detecta conflitos de dados com forwarding.
-    write_conflicts_report("conflitos_dados_com_forwarding.txt", # Escreve o relatório.
-                           data_conflicts_cf, "CONFLITOS DE DADOS COM FORWARDING")
-    
-    # Detectar conflitos de controle.
-    control_conflicts = detect_control_conflicts(original) # Detecta conflitos de controle.
-    write_conflicts_report("conflitos_controle.txt", # Escreve o relatório.
-                           control_conflicts, "CONFLITOS DE CONTROLE")
-    
-    # Técnica 3: Inserção de NOPs para conflitos de dados, sem forwarding.
-    instrs_nop_sf, nops_sf_count = insert_nops_data(copy.deepcopy(original), forwarding=False) # Insere NOPs. (nops_sf_count é o número de NOPs adicionados)
-    write_output("saida_nop_sem_forwarding.hex", instrs_nop_sf) # Escreve o resultado em arquivo.
-    
-    # Técnica 4: Inserção de NOPs para conflitos de dados, com forwarding.
-    instrs_nop_cf, nops_cf_count = insert_nops_data(copy.deepcopy(original), forwarding=True) # Insere NOPs. (nops_cf_count é o número de NOPs adicionados)
-    write_output("saida_nop_com_forwarding.hex", instrs_nop_cf) # Escreve o resultado.
-    
-    # Técnica 5: Reordenação de instruções para evitar NOPs, sem forwarding.
-    instrs_reord_sf, saved_sf = reorder_to_avoid_nops(copy.deepcopy(original), forwarding=False) # Reordena e insere NOPs.
-    write_output("saida_reord_sem_forwarding.hex", instrs_reord_sf) # Escreve o resultado.
-    
-    # Técnica 6: Reordenação de instruções para evitar NOPs, com forwarding.
-    instrs_reord_cf, saved_cf = reorder_to_avoid_nops(copy.deepcopy(original), forwarding=True) # Reordena e insere NOPs.
-    write_output("saida_reord_com_forwarding.hex", instrs_reord_cf) # Escreve o resultado.
-    
-    # Técnica 7: Tratamento de conflito de controle com inserção de NOP.
-    instrs_branch_nop, ctrl_nops_count = handle_branch_conflicts_nop(copy.deepcopy(original)) # Insere NOPs após branches. (ctrl_nops_count é o número de NOPs adicionados)
-    write_output("saida_branch_nop.hex", instrs_branch_nop) # Escreve o resultado.
-    
-    # Técnica 8: Tratamento de conflito de controle com Delayed Branch.
-    instrs_branch_delay, delay_nops_count = handle_delayed_branch(copy.deepcopy(original)) # Aplica delayed branch. (delay_nops_count é o número de NOPs inseridos nos delay slots não preenchidos)
-    write_output("saida_branch_delay.hex", instrs_branch_delay) # Escreve o resultado.
-    
-    # Técnica 9: Combinação otimizada (Exemplo: Reordenação com forwarding + Delayed Branch).
-    # Aplica reordenação com forwarding primeiro.
-    combined_reord_cf, _ = reorder_to_avoid_nops(copy.deepcopy(original), forwarding=True) # O '_' ignora os NOPs salvos aqui.
-    # Depois trata conflitos de controle na lista já reordenada usando delayed branch.
-    combined_final, _ = handle_delayed_branch(combined_reord_cf) # O '_' ignora os NOPs de delay slot.
-    write_output("saida_comb_4e6.hex", combined_final) # Escreve o resultado combinado. (O nome do arquivo sugere combinação das técnicas 4 (NOP com forwarding) e 6 (Reordenação com forwarding), mas o código implementa Reordenação com forwarding + Delayed Branch).
-    
-    # Relatório final impresso no console.
-    print("=== RELATÓRIO DE DETECÇÃO ===")
-    print(f"Conflitos de dados sem forwarding: {len(data_conflicts_sf)}")
-    print(f"Conflitos de dados com forwarding: {len(data_conflicts_cf)}")
-    print(f"Conflitos de controle: {len(control_conflicts)}")
-    print()
-    
-    print("=== RELATÓRIO DE SOBRECUSTO (TOTAL DE INSTRUÇÕES APÓS TRATAMENTO) ===")
-    original_count = len(original)
-    print(f"Instruções originais: {original_count}")
-    print(f"Técnica 3 - NOPs (dados) s/ forwarding: {len(instrs_nop_sf)} (+{len(instrs_nop_sf) - original_count} NOPs)")
-    print(f"Técnica 4 - NOPs (dados) c/ forwarding: {len(instrs_nop_cf)} (+{len(instrs_nop_cf) - original_count} NOPs)")
-    print(f"Técnica 5 - Reord. (dados) s/ forwarding: {len(instrs_reord_sf)} (+{len(instrs_reord_sf) - original_count}, NOPs economizados pela reord.: {saved_sf})")
-    print(f"Técnica 6 - Reord. (dados) c/ forwarding: {len(instrs_reord_cf)} (+{len(instrs_reord_cf) - original_count}, NOPs economizados pela reord.: {saved_cf})")
-    print(f"Técnica 7 - NOPs (controle): {len(instrs_branch_nop)} (+{len(instrs_branch_nop) - original_count} NOPs)")
-    print(f"Técnica 8 - Delayed Branch (controle): {len(instrs_branch_delay)} (+{len(instrs_branch_delay) - original_count} NOPs/slots preenchidos)") # O número de NOPs aqui é `delay_nops_count`.
-    print(f"Técnica 9 - Combinação (Reord. c/ Fwd + Delayed Branch): {len(combined_final)} (+{len(combined_final) - original_count})")
-    print("================================\n")
-    
-    print("Arquivos de saída e relatórios gerados com sucesso!")
-
-if __name__ == "__main__": # Bloco padrão em Python: verifica se o script está sendo executado diretamente (não importado como módulo).
+import os # Importa o módulo 'os' para interagir com o sistema operacional, como verificar se um arquivo existe.
+import heapq # Importa o módulo 'heapq' para a fila de prioridade (instruções prontas) do escalonador de lista.
+from array import array # Importa 'array' para guardar palavras de 32 bits de forma compacta.
+from itertools import chain, repeat # Percorre em sequência as instruções ultrapassadas antes e depois de um branch; desvios nunca tomados na validação.
+from collections import namedtuple # Base imutável e compacta (tupla) para as instruções decodificadas.
+import sys # Importa o módulo 'sys' para acessar parâmetros passados pela linha de comando (como o nome do arquivo de entrada).
+import time # Intervalo entre as verificações do arquivo observado (--observar).
+from concurrent.futures import ProcessPoolExecutor # Pool de processos para executar as técnicas independentes em paralelo.
+from decode_cache import DecodeCache # Cache de decodificação por palavra (compartilhada com o M1, gravável em disco).
+from assembler import assemble_file # Montador: programas .asm são analisados sem passar por um arquivo .hex.
+from input_formats import detect_input_format, load_words # Formatos de entrada (.hex, .bin, ELF e .asm), os mesmos do M1.
+from branch_predictor import predictor_report, predictor_lines # Preditores de desvio, comparados às técnicas 7 e 8 no relatório.
+from pipeline_sim import simulate_pipeline # Simulador de temporização do pipeline descrito pela máquina (ciclos e CPI de cada técnica).
+from cfg import build_cfg, block_index, branch_target, relocate # Blocos básicos, sucessores e correção dos deslocamentos de desvios.
+from profiler import PassProfiler, NO_PROFILER # Medição por etapa (tempo, CPU, memória e contadores) para --perfil.
+from rename import rename_registers, compute_liveness, live_in # Renomeação de registradores (remove WAR/WAW antes do escalonamento).
+from result_cache import ResultCache, BlockScheduleCache, content_key, encode_pass, decode_pass # Cache de resultados e de escalonamentos de bloco.
+from output_writer import OutputWriter, DEFAULT_FORMATS, parse_formats # Gravação das saídas (texto, binário, relatório consolidado).
+from dual_issue import ISSUE_WIDTH, PAIR_REASONS, join_conflict, pairing_conflicts, simulate_dual_issue # Emissão dupla (superescalar em ordem).
+from machine import DEFAULT_MACHINE, INSTRUCTION_CLASSES, MULDIV_MASK, MULDIV_MATCH, load_machine # Descrição do pipeline: distâncias, janelas de conflito e delay slots.
+
+try: # NumPy é opcional: acelera a detecção de conflitos em programas/traces longos.
+    import numpy as np
+except ImportError: # Sem NumPy, todas as análises usam a implementação em Python puro.
+    np = None
+
+# Tipos de instrução por opcode
+opcode_types = { # Dicionário que mapeia os 7 bits menos significativos (opcode) de uma instrução RISC-V para seu tipo (R, I, S, B, U, J).
+    '0110011': 'R',  # tipo R (ex: add, sub) - Instruções aritméticas/lógicas com três registradores.
+    '0010011': 'I',  # tipo I (ex: addi, ori) - Instruções com um imediato e dois registradores (um fonte, um destino).
+    '0000011': 'I',  # tipo I (ex: lw) - Instruções de load, que também usam o formato I.
+    '1100111': 'I',  # tipo I (ex: jalr) - Instrução de jump and link register, formato I.
+    '0100011': 'S',  # tipo S (ex: sw) - Instruções de store, com dois registradores fonte e um imediato para deslocamento.
+    '1100011': 'B',  # tipo B (ex: beq, bne) - Instruções de branch condicional, com dois registradores fonte e um imediato para deslocamento.
+    '0110111': 'U',  # tipo U (ex: lui) - Instruções com um imediato longo e um registrador destino.
+    '0010111': 'U',  # tipo U (ex: auipc) - Add Upper Immediate to PC, formato U.
+    '1101111': 'J',  # tipo J (ex: jal) - Instrução de jump and link, com um imediato longo e um registrador destino.
+    '1110011': 'I',  # tipo I (ecall) - Instrução de system call, usa o formato I mas aqui é tratada de forma genérica.
+}
+
+# Opcodes (7 bits menos significativos) como inteiros, usados pelo decodificador baseado em deslocamentos e máscaras.
+OPCODE_LOAD = 0x03   # 0000011 - lw, lh, lb...
+OPCODE_STORE = 0x23  # 0100011 - sw, sh, sb
+OPCODE_BRANCH = 0x63 # 1100011 - beq, bne...
+OPCODE_JAL = 0x6F    # 1101111 - jal
+OPCODE_JALR = 0x67   # 1100111 - jalr
+
+# Tabela de 128 posições indexada pelo opcode inteiro: evita montar strings binárias para descobrir o tipo da instrução.
+OPCODE_TYPE_TABLE = ['Desconhecido'] * 128
+for _opcode_bits, _instr_type in opcode_types.items():
+    OPCODE_TYPE_TABLE[int(_opcode_bits, 2)] = _instr_type
+
+NOP_HEX = "00000013"  # Define a representação hexadecimal da instrução NOP (No Operation) em RISC-V, que é 'ADDI x0, x0, 0'.
+
+class Instruction(namedtuple('Instruction', 'word type rs1 rs2 rd is_load is_store is_branch',
+                               defaults=(None, None, None, False, False, False))):
+    """Instrução RISC-V decodificada a partir da palavra de 32 bits (imutável)"""
+    # Campos: word (palavra de 32 bits), type (R, I, S, B, U, J, 'NOP' para NOPs inseridos ou 'Desconhecido'),
+    # rs1/rs2/rd (registradores ou None) e os indicadores is_load/is_store/is_branch.
+    # Por ser uma tupla (sem __dict__ e imutável), a mesma instrução pode ser compartilhada por todas as técnicas sem cópias.
+    __slots__ = ()
+
+    @property
+    def opcode(self): # Opcode inteiro (7 bits menos significativos).
+        return self.word & 0x7F
+
+    @property
+    def hex(self): # Representação hexadecimal de 8 caracteres em maiúsculas, no mesmo formato dos arquivos de saída.
+        return format(self.word, '08X')
+
+    def __repr__(self):
+        return f"Instruction({self.hex}, {self.type}, rd={self.rd}, rs1={self.rs1}, rs2={self.rs2})"
+
+NOP_INSTR = Instruction(int(NOP_HEX, 16), 'NOP') # NOP inserido pelas técnicas. É compartilhado, pois nenhuma passada altera instruções.
+
+class ProgramView: # Resultado de uma técnica sem cópias: instruções compartilhadas + permutação de índices + pontos de inserção de NOPs.
+    """Visão leve de um programa transformado"""
+    __slots__ = ('base', 'order', 'nops_after')
+
+    def __init__(self, base, order=None, nops_after=None):
+        self.base = base # Sequência de instruções de origem (compartilhada, nunca alterada).
+        self.order = order # Permutação: order[p] é o índice em `base` da instrução na posição p (None = ordem original).
+        self.nops_after = nops_after if nops_after is not None else {} # Posição (na ordem permutada) -> NOPs inseridos depois dela.
+
+    def __len__(self): # Total de instruções do programa transformado, incluindo os NOPs.
+        count = len(self.base) if self.order is None else len(self.order)
+        return count + sum(self.nops_after.values())
+
+    def __iter__(self): # Percorre o programa transformado sem materializá-lo.
+        base = self.base
+        nops_after = self.nops_after
+        indices = range(len(base)) if self.order is None else self.order
+        for pos, idx in enumerate(indices):
+            yield base[idx]
+            for _ in range(nops_after.get(pos, 0)):
+                yield NOP_INSTR
+
+    def origins(self): # Índice em `base` de cada posição do programa transformado (None para os NOPs inseridos).
+        nops_after = self.nops_after
+        indices = range(len(self.base)) if self.order is None else self.order
+        for pos, idx in enumerate(indices):
+            yield idx
+            for _ in range(nops_after.get(pos, 0)):
+                yield None
+
+def hex_to_bin(hex_str): # Define uma função para converter uma string hexadecimal em uma string binária de 32 bits.
+    return bin(int(hex_str, 16))[2:].zfill(32) # Converte a string hexadecimal para inteiro (base 16), depois para binário (prefixo '0b' removido com [2:]), e preenche com zeros à esquerda até ter 32 bits.
+
+def bin_to_hex(bin_str): # Define uma função para converter uma string binária em uma string hexadecimal de 8 caracteres.
+    return hex(int(bin_str, 2))[2:].upper().zfill(8) # Converte a string binária para inteiro (base 2), depois para hexadecimal (prefixo '0x' removido com [2:]), converte para maiúsculas e preenche com zeros à esquerda até ter 8 caracteres.
+
+def get_instruction_type(binary_instr): # Define uma função para obter o tipo da instrução (R, I, S, etc.) a partir de sua representação binária.
+    return opcode_types.get(binary_instr[-7:], 'Desconhecido') # Retorna o tipo da instrução buscando os 7 últimos bits (opcode) no dicionário 'opcode_types'. Se não encontrado, retorna 'Desconhecido'.
+
+def is_load_instruction(hex_instr): # Define uma função para verificar se uma instrução hexadecimal é do tipo LOAD.
+    """Verifica se é instrução LOAD baseada no opcode"""
+    return (int(hex_instr, 16) & 0x7F) == OPCODE_LOAD # Compara apenas os 7 bits do opcode, sem passar por string binária.
+
+def is_store_instruction(hex_instr): # Define uma função para verificar se uma instrução hexadecimal é do tipo STORE.
+    """Verifica se é instrução STORE baseada no opcode"""
+    return (int(hex_instr, 16) & 0x7F) == OPCODE_STORE # Compara apenas os 7 bits do opcode.
+
+def is_branch_instruction(hex_instr): # Define uma função para verificar se uma instrução hexadecimal é de desvio (branch ou jump).
+    """Verifica se é instrução de branch/jump"""
+    return (int(hex_instr, 16) & 0x7F) in (OPCODE_BRANCH, OPCODE_JAL, OPCODE_JALR) # B (branch), J (jump) ou JALR (jump and link register).
+
+def decode_registers(word): # Define uma função para decodificar os registradores (rs1, rs2, rd) de uma palavra de instrução (inteiro de 32 bits).
+    instr_type = OPCODE_TYPE_TABLE[word & 0x7F] # Obtém o tipo da instrução (R, I, S, etc.) pela tabela indexada pelo opcode.
+    rd = (word >> 7) & 0x1F # rd ocupa os bits 7 a 11.
+    rs1 = (word >> 15) & 0x1F # rs1 ocupa os bits 15 a 19.
+    rs2 = (word >> 20) & 0x1F # rs2 ocupa os bits 20 a 24.
+
+    if instr_type == 'R': # Tipo R usa rd, rs1 e rs2.
+        return instr_type, rs1, rs2, rd
+    if instr_type == 'I': # Tipo I usa rd e rs1 (o campo de rs2 faz parte do imediato).
+        return instr_type, rs1, None, rd
+    if instr_type == 'S' or instr_type == 'B': # Tipos S e B usam rs1 e rs2 (não escrevem em registrador).
+        return instr_type, rs1, rs2, None
+    if instr_type == 'U' or instr_type == 'J': # Tipos U e J usam apenas rd.
+        return instr_type, None, None, rd
+    return instr_type, None, None, None # Opcode desconhecido: nenhum registrador.
+
+def decode_instruction(word): # Define uma função que decodifica uma palavra de 32 bits em um objeto Instruction.
+    opcode = word & 0x7F # Extrai o opcode com uma máscara.
+    instr_type, rs1, rs2, rd = decode_registers(word) # Decodifica os registradores.
+    return Instruction(word, instr_type, rs1, rs2, rd,
+                       opcode == OPCODE_LOAD, # LOAD
+                       opcode == OPCODE_STORE, # STORE
+                       opcode in (OPCODE_BRANCH, OPCODE_JAL, OPCODE_JALR)) # branch/jump
+
+# Todas as leituras decodificam pela cache: palavras repetidas compartilham o mesmo registro Instruction (imutável).
+DECODE_CACHE = DecodeCache(decode_instruction, Instruction)
+
+def read_program(file_path, input_format=None): # Define uma função que lê as instruções e o mapa de linhas do código-fonte.
+    """Retorna (instruções, linha do .asm de cada instrução); o mapa é None para entradas já montadas"""
+    input_format = input_format or detect_input_format(file_path)
+    if input_format == 'asm': # Montagem direta para instruções decodificadas, sem gerar texto hexadecimal.
+        program = assemble_file(file_path)
+        decode = DECODE_CACHE.decode
+        return [decode(word) for word in program.words], program.lines
+    return read_instructions(file_path, input_format), None
+
+def read_instructions(file_path, input_format=None): # Define uma função para ler instruções de um arquivo (.hex, .bin, ELF ou .asm).
+    input_format = input_format or detect_input_format(file_path)
+    if input_format == 'asm':
+        return read_program(file_path, input_format)[0]
+    if input_format != 'hex': # Binário/ELF: decodifica as palavras do mapeamento, sem passar por strings.
+        words = load_words(file_path, input_format)
+        decode = DECODE_CACHE.decode
+        return [decode(word) for word in (words.tolist() if hasattr(words, 'tolist') else words)]
+    instructions = [] # Inicializa uma lista vazia para armazenar as instruções decodificadas.
+    decode = DECODE_CACHE.decode # Cada palavra distinta é decodificada uma única vez.
+    with open(file_path, 'r') as f: # Abre o arquivo especificado em modo de leitura ('r').
+        for line in f: # Itera sobre cada linha do arquivo.
+            hex_instr = line.strip() # Remove espaços em branco no início/fim da linha.
+            if not hex_instr: # Se a linha estiver vazia após o strip, pula para a próxima.
+                continue
+            instructions.append(decode(int(hex_instr, 16))) # Converte uma única vez para inteiro e decodifica (com cache).
+    return instructions # Retorna a lista de instruções decodificadas.
+
+NUMPY_MIN_INSTRUCTIONS = 256 # Abaixo deste tamanho o custo de montar os arrays NumPy supera o ganho; usa-se o laço em Python.
+
+def detect_data_conflicts(instructions, forwarding=False, machine=DEFAULT_MACHINE): # Define uma função para detectar conflitos de dados (RAW hazards).
+    """Detecta conflitos de dados (RAW hazards)"""
+    if np is not None and len(instructions) >= NUMPY_MIN_INSTRUCTIONS: # Usa o backend vetorizado quando disponível e vantajoso.
+        return detect_data_conflicts_numpy(instructions, forwarding, machine)
+    return detect_data_conflicts_python(instructions, forwarding, machine) # Caso contrário, usa o laço em Python puro.
+
+def detect_data_conflicts_python(instructions, forwarding=False, machine=DEFAULT_MACHINE): # Implementação em Python puro da detecção de conflitos de dados.
+    """Detecta conflitos de dados (RAW hazards) com laço duplo em Python"""
+    conflicts = [] # Inicializa uma lista vazia para armazenar os conflitos detectados.
+    # Janela de conflito derivada da máquina: no pipeline clássico de 5 estágios, 2 instruções sem forwarding
+    # (escrita no WB, leitura no ID) e 1 com forwarding (apenas o load-use, pois o dado do LOAD só existe após o MEM).
+    window = machine.window(forwarding)
+    
+    for i in range(len(instructions)): # Itera sobre cada instrução (instrução atual).
+        current = instructions[i] # Pega a instrução atual.
+        
+        # Verifica conflitos com as instruções anteriores dentro da janela. O 'max(0, i - window)' evita índices negativos.
+        for j in range(max(0, i - window), i): # Itera sobre as instruções anteriores à atual ('prev').
+            prev = instructions[j] # Pega uma instrução anterior.
+            distance = i - j # Calcula a distância entre a instrução atual e a anterior.
+            
+            # Há conflito se a atual lê o rd (válido, não x0) da anterior antes de o valor estar disponível, isto é,
+            # se a dependência RAW exige bolhas/NOPs a esta distância (distância mínima da classe da produtora).
+            if machine.stall_nops(prev, current, distance, forwarding):
+                conflicts.append({ # Adiciona informações sobre o conflito à lista.
+                    'position': i, # Posição (índice) da instrução atual que sofre o conflito.
+                    'source': j, # Posição (índice) da instrução anterior que causa o conflito.
+                    'register': prev.rd, # Registrador envolvido no conflito.
+                    'distance': distance, # Distância entre as instruções.
+                    'is_load_use': prev.is_load and distance == 1 # True se for um conflito load-use.
+                })
+    
+    return conflicts # Retorna a lista de conflitos de dados detectados.
+
+def register_columns_from_words(words): # Decodifica palavras de 32 bits em colunas NumPy (rd, rs1, rs2, is_load, classe) de forma vetorizada.
+    """Monta as colunas rd/rs1/rs2/is_load/classe diretamente das palavras, sem criar objetos por instrução"""
+    words = np.asarray(words, dtype=np.uint32)
+    opcode = words & 0x7F
+    # Quais campos cada tipo usa (mesmas regras de decode_registers), indexados pelo opcode.
+    types = np.array(OPCODE_TYPE_TABLE)
+    has_rd = np.isin(types, ('R', 'I', 'U', 'J'))[opcode]
+    has_rs1 = np.isin(types, ('R', 'I', 'S', 'B'))[opcode]
+    has_rs2 = np.isin(types, ('R', 'S', 'B'))[opcode]
+    # Registradores ausentes viram -1, valor que nunca coincide com um registrador válido.
+    rd = np.where(has_rd, (words >> 7) & 0x1F, -1).astype(np.int8)
+    rs1 = np.where(has_rs1, (words >> 15) & 0x1F, -1).astype(np.int8)
+    rs2 = np.where(has_rs2, (words >> 20) & 0x1F, -1).astype(np.int8)
+    is_load = opcode == OPCODE_LOAD
+    # Classe de temporização (índice em INSTRUCTION_CLASSES: ULA, load, mul, div), como em machine.instruction_class.
+    muldiv = (words & MULDIV_MASK) == MULDIV_MATCH
+    kind = np.where(is_load, 1, np.where(muldiv, np.where(words & 0x4000, 3, 2), 0)).astype(np.int8)
+    return rd, rs1, rs2, is_load, kind
+
+def build_register_columns(instructions): # Decodifica o programa inteiro uma única vez em colunas NumPy (rd, rs1, rs2, is_load, classe).
+    """Monta as colunas rd/rs1/rs2/is_load/classe usadas pelo backend NumPy"""
+    return register_columns_from_words(np.fromiter((instr.word for instr in instructions), dtype=np.uint32, count=len(instructions)))
+
+def detect_data_conflicts_numpy(instructions, forwarding=False, machine=DEFAULT_MACHINE): # Backend vetorizado da detecção de conflitos de dados.
+    """Detecta conflitos de dados (RAW hazards) comparando arrays deslocados"""
+    return find_conflicts_in_columns(build_register_columns(instructions), forwarding, machine)
+
+def detect_data_conflicts_words(words, forwarding=False, machine=DEFAULT_MACHINE): # Detecção direto sobre as palavras (ex.: load_words de um .bin/ELF grande).
+    """Detecta conflitos de dados sem criar objetos Instruction (requer NumPy)"""
+    return find_conflicts_in_columns(register_columns_from_words(words), forwarding, machine)
+
+def find_conflicts_in_columns(columns, forwarding=False, machine=DEFAULT_MACHINE): # Núcleo vetorizado: encontra os conflitos a partir das colunas.
+    rd, rs1, rs2, is_load, kind = columns
+    n = len(rd)
+    # Distância mínima exigida por cada produtora (tabela da máquina indexada pela classe).
+    required = np.array([machine.distances[forwarding][cls] for cls in INSTRUCTION_CLASSES], dtype=np.int64)[kind]
+    positions, distances = [], [] # Índices das instruções em conflito e distância até a produtora, por distância analisada.
+
+    # Mesma janela do laço em Python. A ordem decrescente de distâncias faz com que, após a ordenação estável por
+    # posição, as fontes apareçam em ordem crescente, exatamente como no laço `for j in range(i - window, i)`.
+    for distance in range(machine.window(forwarding), 0, -1):
+        if distance >= n:
+            continue
+        prev_rd = rd[:n - distance] # Instrução produtora (j = i - distance).
+        hit = (prev_rd > 0) & ((rs1[distance:] == prev_rd) | (rs2[distance:] == prev_rd)) # RAW: a atual lê o rd da anterior (x0 ignorado).
+        hit &= required[:n - distance] > distance # Só há bolha antes da distância mínima da produtora.
+        found = np.nonzero(hit)[0] + distance # Converte para a posição da instrução consumidora.
+        positions.append(found)
+        distances.append(np.full(found.shape, distance, dtype=np.int64))
+
+    if not positions:
+        return []
+    positions = np.concatenate(positions)
+    distances = np.concatenate(distances)
+    order = np.argsort(positions, kind='stable') # Ordena por posição mantendo a ordem das fontes.
+    positions = positions[order].tolist()
+    distances = distances[order].tolist()
+
+    conflicts = []
+    for i, distance in zip(positions, distances): # Monta os mesmos registros de conflito da versão em Python.
+        j = i - distance
+        conflicts.append({
+            'position': i,
+            'source': j,
+            'register': int(rd[j]),
+            'distance': distance,
+            'is_load_use': bool(is_load[j]) and distance == 1
+        })
+    return conflicts
+
+def detect_control_conflicts(instructions, machine=DEFAULT_MACHINE): # Define uma função para detectar conflitos de controle (branch/jump hazards).
+    """Detecta conflitos de controle (branch/jump hazards)"""
+    conflicts = [] # Inicializa uma lista vazia para armazenar os conflitos de controle.
+    
+    for i, instr in enumerate(instructions): # Itera sobre cada instrução com seu índice.
+        if instr.is_branch: # Se a instrução é um branch ou jump.
+            conflicts.append({ # Adiciona informações sobre o conflito de controle.
+                'position': i, # Posição (índice) da instrução de branch/jump.
+                'type': instr.type, # Tipo da instrução de branch/jump.
+                'penalty': machine.branch_penalty # Ciclos buscados no caminho errado até o desvio ser resolvido.
+            })
+    
+    return conflicts # Retorna a lista de conflitos de controle.
+
+def insert_nops_data(instructions, forwarding=False, machine=DEFAULT_MACHINE): # Define uma função para inserir NOPs para resolver conflitos de dados.
+    """Insere NOPs para resolver conflitos de dados - CORRIGIDO"""
+    nops_after = {} # Posição da instrução original -> quantidade de NOPs inseridos após ela.
+    # Quantas instruções à frente uma produtora ainda pode causar NOPs (2 sem forwarding e 1 com forwarding no
+    # pipeline clássico de 5 estágios; mais em pipelines profundos ou com unidades multiciclo).
+    window = machine.window(forwarding)
+    
+    # Este laço itera sobre as instruções originais e registra onde os NOPs devem entrar (sem copiar instruções).
+    # A lógica de inserção de NOPs acontece *após* adicionar a instrução `current` e antes de processar a `instructions[i+1]`.
+    idx = 0 # Índice para percorrer a lista `instructions`.
+    while idx < len(instructions): # Enquanto houver instruções originais para processar.
+        current_original_instr = instructions[idx] # Pega a instrução original atual.
+
+        # Verifica se a instrução que acabou de ser adicionada (`current_original_instr`) escreve em um registrador
+        # e pode causar um conflito com as próximas instruções originais.
+        if current_original_instr.rd is not None and current_original_instr.rd != 0:
+            nops_to_insert_after_current = 0 # Quantos NOPs precisam ser inseridos após a `current_original_instr`.
+
+            # Olha para as próximas instruções originais (distância k = 1 .. window) para ver se elas dependem da `current_original_instr`.
+            for k in range(1, window + 1):
+                if idx + k < len(instructions): # Verifica se a próxima instrução (idx + k) existe.
+                    next_potential_dependent_instr = instructions[idx + k] # Pega a próxima instrução original.
+
+                    # Se há dependência RAW (a próxima lê o que a atual escreveu), a produtora precisa estar a pelo menos
+                    # `result_distance` posições da consumidora: faltando d posições, são necessários d NOPs.
+                    # Ex. sem forwarding no pipeline clássico (escrita no WB no ciclo C+4, leitura no ID no ciclo C+k+1):
+                    # k=1 exige 2 NOPs (I1, NOP, NOP, I2) e k=2 exige 1 NOP (I1, I_other, NOP, I2).
+                    # Com forwarding, só o load-use (k=1) exige 1 NOP.
+                    nops_needed_for_this_dependency = machine.stall_nops(current_original_instr, next_potential_dependent_instr, k, forwarding)
+                    
+                    # Mantém o maior número de NOPs necessários encontrado até agora para a `current_original_instr`.
+                    nops_to_insert_after_current = max(nops_to_insert_after_current, nops_needed_for_this_dependency)
+            
+            # Registra os NOPs calculados após a `current_original_instr`.
+            if nops_to_insert_after_current:
+                nops_after[idx] = nops_to_insert_after_current
+        
+        idx += 1 # Move para a próxima instrução original.
+
+    nops_added = sum(nops_after.values()) # Calcula o número total de NOPs adicionados.
+    return ProgramView(instructions, None, nops_after), nops_added # Retorna a visão com NOPs e a contagem de NOPs.
+
+def has_dependency(instr1, instr2): # Define uma função para verificar se existe dependência (RAW, WAR, WAW) entre duas instruções.
+    """Verifica se existe dependência entre duas instruções"""
+    # RAW (Read After Write): instr2 lê um registrador que instr1 escreve.
+    if instr1.rd is not None and instr1.rd != 0: # Se instr1 escreve em um registrador válido.
+        if (instr2.rs1 is not None and instr2.rs1 == instr1.rd) or \
+           (instr2.rs2 is not None and instr2.rs2 == instr1.rd): # E instr2 lê esse registrador.
+            return True # Há uma dependência RAW.
+    
+    # WAR (Write After Read): instr2 escreve em um registrador que instr1 lê.
+    if instr2.rd is not None and instr2.rd != 0: # Se instr2 escreve em um registrador válido.
+        if (instr1.rs1 is not None and instr1.rs1 == instr2.rd) or \
+           (instr1.rs2 is not None and instr1.rs2 == instr2.rd): # E instr1 lê esse registrador.
+            return True # Há uma dependência WAR.
+    
+    # WAW (Write After Write): instr2 escreve no mesmo registrador que instr1 escreve.
+    if (instr1.rd is not None and instr2.rd is not None and 
+        instr1.rd != 0 and instr2.rd != 0 and instr1.rd == instr2.rd): # Se ambas escrevem no mesmo registrador válido.
+        return True # Há uma dependência WAW.
+    
+    return False # Nenhuma dependência detectada.
+
+OPCODE_SYSTEM = 0x73 # 1110011 - ecall/ebreak. Lê a7/a0 implicitamente, por isso nada pode ser movido através dela.
+
+def is_block_terminator(instr): # Define uma função que indica se a instrução encerra um bloco básico de escalonamento.
+    return instr.is_branch or instr.opcode == OPCODE_SYSTEM # Branches/jumps e ecall ficam fixos no fim do bloco.
+
+def find_block_ranges(instructions): # Define uma função que divide o programa em blocos básicos (intervalos [início, fim)).
+    """Divide o programa nos blocos básicos do CFG: terminam em branch/jump ou ecall e começam em alvos de desvios"""
+    return [(block.start, block.end) for block in build_cfg(instructions)]
+
+def ranges_from_block_ids(block_ids): # Define uma função que agrupa posições consecutivas do mesmo bloco.
+    """Intervalos [início, fim) de uma sequência já transformada; posições None (NOPs) ficam no bloco corrente"""
+    ranges = []
+    start, current = 0, None
+    for i, b in enumerate(block_ids):
+        if b is not None and b != current:
+            if current is not None:
+                ranges.append((start, i))
+                start = i
+            current = b
+    if block_ids:
+        ranges.append((start, len(block_ids)))
+    return ranges
+
+def is_memory_instruction(instr): # Define uma função que indica se a instrução acessa a memória.
+    return instr.is_load or instr.is_store
+
+OPCODE_OP_IMM = 0x13 # 0010011 - addi, ... (addi propaga endereços: la = auipc + addi, li = lui + addi).
+OPCODE_LUI = 0x37    # 0110111 - lui
+OPCODE_AUIPC = 0x17  # 0010111 - auipc
+ADDRESS_SPACE = 1 << 32 # Endereços são comparados módulo 2^32.
+
+# Acesso à memória resolvido simbolicamente: endereço = valor de `anchor` + `offset`, com `width` bytes.
+# A âncora é ('abs',) para endereços constantes (lui), ('pc',) para endereços relativos ao início do programa (auipc)
+# ou um valor desconhecido de registrador, identificado pela escrita que o produziu (mesma base não modificada).
+MemoryRef = namedtuple('MemoryRef', 'anchor offset width is_store')
+
+def memory_offset(instr): # Imediato (com sinal) de um load (tipo I) ou store (tipo S).
+    word = instr.word
+    imm = ((word >> 25) << 5) | ((word >> 7) & 0x1F) if instr.is_store else word >> 20
+    return imm - 4096 if imm & 0x800 else imm
+
+def memory_references(instructions, positions=None, block_ids=None): # Define a análise de endereços (desambiguação de memória) por bloco.
+    """Para cada instrução, o MemoryRef do seu acesso à memória (None se não acessa)"""
+    # Os valores simbólicos dos registradores são acompanhados só dentro de cada bloco: na entrada de um bloco
+    # (alvo de desvios) cada registrador tem um valor desconhecido. Quando a sequência já foi transformada,
+    # `positions` dá o índice original de cada instrução (para o PC de auipc) e `block_ids`, o seu bloco no CFG.
+    refs = [None] * len(instructions)
+    fresh = 0 # Contador de valores desconhecidos (cada escrita não analisável cria uma âncora nova).
+    ranges = find_block_ranges(instructions) if block_ids is None else ranges_from_block_ids(block_ids)
+    for start, end in ranges:
+        values = {0: (('abs',), 0)} # Registrador -> (âncora, deslocamento). x0 vale sempre 0.
+        for i in range(start, end):
+            instr = instructions[i]
+            if is_memory_instruction(instr) or (instr.opcode == OPCODE_OP_IMM and instr.rs1 is not None):
+                # Base ainda não escrita no bloco: a âncora é o valor de entrada do registrador.
+                base = values.setdefault(instr.rs1, (('reg', instr.rs1, start), 0))
+            if is_memory_instruction(instr):
+                refs[i] = MemoryRef(base[0], (base[1] + memory_offset(instr)) % ADDRESS_SPACE,
+                                    1 << ((instr.word >> 12) & 0x3), instr.is_store)
+            if instr.rd is None or instr.rd == 0:
+                continue
+            opcode = instr.opcode
+            funct3 = (instr.word >> 12) & 0x7
+            if opcode == OPCODE_LUI:
+                values[instr.rd] = (('abs',), instr.word & 0xFFFFF000)
+            elif opcode == OPCODE_AUIPC:
+                pc = 4 * (i if positions is None else positions[i])
+                values[instr.rd] = (('pc',), (pc + (instr.word & 0xFFFFF000)) % ADDRESS_SPACE)
+            elif opcode == OPCODE_OP_IMM and funct3 == 0: # addi: mesma âncora, deslocamento somado.
+                anchor, offset = base
+                imm = instr.word >> 20
+                values[instr.rd] = (anchor, (offset + (imm - 4096 if imm & 0x800 else imm)) % ADDRESS_SPACE)
+            else: # Qualquer outra escrita torna o registrador desconhecido (nova âncora).
+                fresh += 1
+                values[instr.rd] = (('write', fresh), 0)
+    return refs
+
+def memory_conflict(ref1, ref2): # Define uma função que indica se dois acessos precisam manter sua ordem.
+    """Dois acessos só podem ser reordenados se ambos são loads ou se os endereços comprovadamente não se sobrepõem"""
+    if ref1 is None or ref2 is None: # Sem informação de endereço: assume conflito.
+        return True
+    if not ref1.is_store and not ref2.is_store: # Load x load nunca conflita.
+        return False
+    if ref1.anchor != ref2.anchor: # Bases diferentes (ou modificadas entre os acessos): podem ser o mesmo endereço.
+        return True
+    distance = (ref2.offset - ref1.offset) % ADDRESS_SPACE # Intervalos [offset, offset + width) disjuntos?
+    return distance < ref1.width or ADDRESS_SPACE - distance < ref2.width
+
+def stall_nops(producer, consumer, distance, forwarding=False, machine=DEFAULT_MACHINE): # Define uma função com o custo em NOPs de uma dependência RAW a uma dada distância.
+    """NOPs exigidos por `consumer` a `distance` posições de `producer` (mesmo modelo de insert_nops_data)"""
+    # No pipeline clássico: sem forwarding, distância 1 exige 2 NOPs e distância 2 exige 1 NOP; com forwarding,
+    # apenas o load-use na distância 1 exige 1 NOP. Outras máquinas derivam o custo das suas latências.
+    return machine.stall_nops(producer, consumer, distance, forwarding)
+
+class NopCostModel: # Modelo incremental do custo em NOPs de dados de uma sequência de instruções.
+    """Mantém os NOPs exigidos por posição e avalia movimentos recalculando só a janela afetada"""
+
+    def __init__(self, instructions=(), forwarding=False, tags=None, machine=DEFAULT_MACHINE):
+        self.forwarding = forwarding
+        self.machine = machine
+        self.window = machine.window(forwarding) # Distância máxima em que uma dependência RAW ainda custa NOPs.
+        self.stall = machine.stall_nops # Custo de cada dependência (método da máquina, chamado no laço interno).
+        self.instructions = list(instructions) # Sequência atual (sem NOPs).
+        # Rótulos opcionais paralelos às instruções (ex.: índice de origem), movidos junto com elas para montar permutações.
+        self.tags = list(tags) if tags is not None else None
+        self.need = [self.producer_nops(self.instructions, i) for i in range(len(self.instructions))] # NOPs exigidos após cada posição.
+        self.total = sum(self.need) # Total de NOPs que insert_nops_data inseriria nesta sequência.
+
+    def producer_nops(self, seq, i): # NOPs exigidos após `seq[i]`: o maior custo entre suas consumidoras dentro da janela.
+        producer = seq[i]
+        need = 0
+        for k in range(1, min(self.window, len(seq) - 1 - i) + 1):
+            need = max(need, self.stall(producer, seq[i + k], k, self.forwarding))
+        return need
+
+    def append_delta(self, instr): # Variação do total se `instr` fosse adicionada ao fim, em O(janela).
+        n = len(self.instructions)
+        delta = 0
+        for k in range(1, min(self.window, n) + 1):
+            p = n - k
+            delta += max(self.need[p], self.stall(self.instructions[p], instr, k, self.forwarding)) - self.need[p]
+        return delta
+
+    def append(self, instr, tag=None): # Adiciona `instr` (com seu rótulo) ao fim e atualiza as produtoras da janela.
+        self.total += self.append_delta(instr)
+        n = len(self.instructions)
+        for k in range(1, min(self.window, n) + 1):
+            p = n - k
+            self.need[p] = max(self.need[p], self.stall(self.instructions[p], instr, k, self.forwarding))
+        self.instructions.append(instr)
+        self.need.append(0)
+        if self.tags is not None:
+            self.tags.append(tag)
+
+    def move_window(self, src, dst): # Trecho afetado por mover a instrução de `src` para `dst` (como pop(src) seguido de insert(dst)).
+        lo = max(0, min(src, dst) - self.window) # Primeira produtora cuja janela de consumidoras pode mudar.
+        hi = max(src, dst) # Última produtora afetada; depois dela a sequência não muda.
+        segment = self.instructions[lo:hi + self.window + 1]
+        segment.insert(dst - lo, segment.pop(src - lo))
+        return lo, hi, segment
+
+    def move_delta(self, src, dst): # Variação do total se a instrução em `src` fosse movida para `dst`, sem aplicar o movimento.
+        lo, hi, segment = self.move_window(src, dst)
+        new = sum(self.producer_nops(segment, p - lo) for p in range(lo, hi + 1))
+        return new - sum(self.need[lo:hi + 1])
+
+    def apply_move(self, src, dst): # Aplica o movimento e recalcula apenas as posições da janela afetada.
+        lo, hi, segment = self.move_window(src, dst)
+        self.instructions[lo:lo + len(segment)] = segment
+        if self.tags is not None:
+            self.tags.insert(dst, self.tags.pop(src))
+        for p in range(lo, hi + 1):
+            new = self.producer_nops(self.instructions, p)
+            self.total += new - self.need[p]
+            self.need[p] = new
+
+def build_dependency_dag(block, refs=None): # Define uma função que monta o grafo de dependências (DAG) de um bloco básico.
+    """Monta o DAG de dependências de um bloco (mesmas regras de has_dependency)"""
+    # Com `refs` (MemoryRef de cada instrução do bloco), acessos à memória só são ordenados quando memory_conflict
+    # não consegue provar que são independentes; sem `refs`, loads e stores mantêm sua ordem relativa.
+    # Em vez de comparar todos os pares com has_dependency (O(n²)), mantém o último escritor e os leitores de cada registrador.
+    # As arestas resultantes implicam (por transitividade) as mesmas restrições de ordem RAW, WAR e WAW.
+    preds = [set() for _ in block] # Predecessoras de cada instrução (índices no bloco).
+    last_writer = {} # Registrador -> índice da última instrução que o escreveu.
+    readers = {} # Registrador -> índices das instruções que o leram desde a última escrita.
+    last_memory = None # Último acesso à memória: loads/stores mantêm sua ordem relativa (sem análise de endereços).
+    memory = [] # Acessos anteriores do bloco (com análise de endereços).
+
+    for i, instr in enumerate(block):
+        for reg in (instr.rs1, instr.rs2):
+            if reg is not None and reg != 0:
+                if reg in last_writer: # RAW: lê o que uma anterior escreveu.
+                    preds[i].add(last_writer[reg])
+                readers.setdefault(reg, []).append(i)
+        if instr.rd is not None and instr.rd != 0:
+            if instr.rd in last_writer: # WAW: escreve o mesmo registrador que uma anterior.
+                preds[i].add(last_writer[instr.rd])
+            for reader in readers.get(instr.rd, ()): # WAR: escreve o que uma anterior leu.
+                if reader != i:
+                    preds[i].add(reader)
+            last_writer[instr.rd] = i
+            readers[instr.rd] = []
+        if is_memory_instruction(instr):
+            if refs is not None:
+                preds[i].update(j for j in memory if memory_conflict(refs[j], refs[i]))
+                memory.append(i)
+            else:
+                if last_memory is not None:
+                    preds[i].add(last_memory)
+                last_memory = i
+        if is_block_terminator(instr): # O terminador depende de todas as outras instruções do bloco.
+            preds[i].update(range(i))
+
+    succs = [[] for _ in block] # Sucessoras de cada instrução.
+    for i, instr_preds in enumerate(preds):
+        for p in instr_preds:
+            succs[p].append(i)
+    return preds, succs
+
+SCHEDULER_LOOKAHEAD = 8 # Quantas instruções prontas (em ordem de prioridade) o escalonador examina por posição.
+
+def schedule_block(block, forwarding=False, recent=(), critical_path=True, refs=None, machine=DEFAULT_MACHINE): # Define o escalonador de lista (list scheduling) de um bloco básico.
+    """Escalona um bloco com fila de prontas, priorizando o caminho crítico (ou a ordem original)"""
+    preds, succs = build_dependency_dag(block, refs)
+    n = len(block)
+
+    # Prioridade: altura no DAG ponderada pela distância mínima exigida em cada aresta (caminho crítico até o fim do bloco).
+    height = [0] * n
+    if critical_path: # Sem caminho crítico, prioriza a ordem original e só adianta instruções para evitar NOPs.
+        for i in range(n - 1, -1, -1): # A ordem original é uma ordem topológica.
+            for s in succs[i]:
+                latency = 1 + machine.stall_nops(block[i], block[s], 1, forwarding)
+                height[i] = max(height[i], height[s] + latency)
+
+    remaining = [len(p) for p in preds] # Quantas predecessoras ainda não foram escalonadas.
+    ready = [(-height[i], i) for i in range(n) if remaining[i] == 0] # Fila de prontas (heap por prioridade e ordem original).
+    heapq.heapify(ready)
+
+    # O modelo começa com a cauda do bloco anterior para contabilizar dependências que cruzam a fronteira.
+    model = NopCostModel(recent, forwarding, machine=machine)
+    order = []
+    while ready:
+        examined = [] # Prontas examinadas nesta posição.
+        best = None # (custo, entrada da heap)
+        while ready and len(examined) < SCHEDULER_LOOKAHEAD:
+            entry = heapq.heappop(ready)
+            examined.append(entry)
+            cost = model.append_delta(block[entry[1]]) # NOPs adicionais que a candidata causaria se fosse emitida agora.
+            if best is None or cost < best[0]:
+                best = (cost, entry)
+            if cost == 0: # A de maior prioridade sem custo é escolhida imediatamente.
+                break
+        for entry in examined: # Devolve à fila as candidatas não escolhidas.
+            if entry is not best[1]:
+                heapq.heappush(ready, entry)
+
+        chosen = best[1][1]
+        model.append(block[chosen])
+        order.append(chosen)
+        for s in succs[chosen]: # Libera as sucessoras cujas dependências foram todas escalonadas.
+            remaining[s] -= 1
+            if remaining[s] == 0:
+                heapq.heappush(ready, (-height[s], s))
+
+    return order # Índices (no bloco) na ordem escalonada.
+
+# Contadores da reordenação, lidos pelo perfilador (--perfil): movimentos da busca local avaliados e aceitos,
+# ordens candidatas de bloco avaliadas (heurísticas e exatas) e blocos que saíram da ordem original.
+REORDER_STATS = {'moves_evaluated': 0, 'moves_accepted': 0, 'block_orders_evaluated': 0,
+                 'exact_orders_accepted': 0, 'blocks_reordered': 0, 'blocks_cached': 0}
+
+# Escalonamentos já calculados por bloco (conteúdo do bloco + cauda anterior + opções), compartilhados pelas técnicas
+# 5 e 6 e pela comparação com o ótimo; com --cache-resultados, são gravados em disco entre execuções.
+SCHEDULE_CACHE = BlockScheduleCache()
+
+def improve_block_with_moves(model, start, end, refs=None): # Define uma busca local que adianta instruções independentes para dentro de slots de NOP.
+    """Aplica movimentos curtos (proporcionais à janela) que reduzem NOPs, avaliados em O(janela) pelo modelo incremental"""
+    # Com `refs` (MemoryRef indexado pelos rótulos do modelo), loads e stores também podem ser movidos
+    # quando não conflitam com os acessos à memória que ultrapassam.
+    instrs = model.instructions # Lista compartilhada com o modelo (atualizada por apply_move).
+    tags = model.tags
+    evaluated = accepted = 0
+    i = start
+    while i < end:
+        producer = instrs[i]
+        moved = False
+        if producer.rd is not None and producer.rd != 0: # Só produtoras de registrador podem causar NOPs.
+            # Candidata a ser movida para logo após a produtora (i + 1): até `window` posições adiante (no mínimo 2),
+            # pois só as consumidoras dentro da janela da máquina custam NOPs.
+            for j in range(i + 2, min(i + 2 + max(2, model.window), end)):
+                candidate = instrs[j]
+                # Mesmas restrições da reordenação original: não move controle nem ecall; loads e stores só com `refs`.
+                if is_block_terminator(candidate):
+                    continue
+                if is_memory_instruction(candidate) and refs is None:
+                    continue
+                if has_dependency(producer, candidate):
+                    continue
+                if any(has_dependency(candidate, instrs[k]) or has_dependency(instrs[k], candidate) for k in range(i + 1, j)):
+                    continue
+                if is_memory_instruction(candidate) and any(
+                        is_memory_instruction(instrs[k]) and memory_conflict(refs[tags[k]], refs[tags[j]]) for k in range(i + 1, j)):
+                    continue
+                evaluated += 1
+                if model.move_delta(j, i + 1) < 0: # Aceita apenas movimentos que reduzem o total de NOPs.
+                    model.apply_move(j, i + 1)
+                    accepted += 1
+                    moved = True
+                    break
+        # Após um movimento, reavalia a vizinhança (a janela de produtoras afetadas); caso contrário, avança.
+        i = max(start, i - model.window) if moved else i + 1
+    REORDER_STATS['moves_evaluated'] += evaluated
+    REORDER_STATS['moves_accepted'] += accepted
+
+EXACT_BLOCK_LIMIT = 10 # Blocos até este tamanho também são escalonados de forma exata (ótima); os maiores usam só a heurística.
+EXACT_WINDOW_LIMIT = 3 # Janelas maiores (pipelines profundos, mul/div multiciclo) multiplicam os estados do escalonador exato.
+
+def block_window(instructions, forwarding=False, machine=DEFAULT_MACHINE): # Define a janela efetiva de um trecho.
+    """Maior distância em que uma produtora do trecho ainda custa NOPs (0 se nenhuma pode causar NOPs)"""
+    return max((machine.result_distance(instr, forwarding) - 1 for instr in instructions if instr.rd), default=0)
+
+def schedule_block_exact(block, forwarding=False, recent=(), refs=None, machine=DEFAULT_MACHINE): # Define o escalonador exato de um bloco básico pequeno.
+    """Retorna (NOPs, ordem) de custo mínimo entre todas as ordens que respeitam o DAG do bloco"""
+    # Programação dinâmica com memoização sobre (conjunto já escalonado, últimas instruções emitidas): o custo de
+    # emitir uma instrução depende apenas das `window` anteriores, exatamente como em NopCostModel.append_delta.
+    # A janela é a das produtoras do bloco e da cauda (não a da máquina inteira): menos estados, mesmo custo.
+    preds, _ = build_dependency_dag(block, refs)
+    n = len(block)
+    window = block_window(list(block) + list(recent), forwarding, machine)
+    pred_masks = [sum(1 << p for p in instr_preds) for instr_preds in preds]
+    full = (1 << n) - 1
+    recent = list(recent)[-window:] if window else []
+    everything = block + recent # Índices negativos (cauda do bloco anterior) também indexam esta lista.
+    # stall[d][p][c]: NOPs exigidos pela produtora p quando a consumidora c está a d posições (tabela pré-calculada).
+    stall = [None] + [{p: [machine.stall_nops(everything[p], instr, d, forwarding) for instr in block]
+                       for p in list(range(n)) + list(range(-len(recent), 0))} for d in range(1, window + 1)]
+    memo = {}
+
+    def append_cost(tail, i): # NOPs adicionais ao emitir block[i] após a cauda `tail` (mais antiga primeiro).
+        delta = 0
+        for k in range(1, len(tail) + 1):
+            producer = tail[-k]
+            need = 0 # NOPs já exigidos pela produtora por causa das instruções entre ela e o fim da cauda.
+            for d in range(1, k):
+                consumer = tail[-k + d]
+                if consumer >= 0: # Dentro da cauda anterior os NOPs já foram contados na linha de base.
+                    need = max(need, stall[d][producer][consumer])
+                elif producer < 0:
+                    need = max(need, machine.stall_nops(everything[producer], everything[consumer], d, forwarding))
+            delta += max(need, stall[k][producer][i]) - need
+        return delta
+
+    def solve(mask, tail): # Menor custo para escalonar o restante do bloco a partir deste estado.
+        if mask == full:
+            return 0
+        key = (mask, tail)
+        if key in memo:
+            return memo[key][0]
+        best = None
+        for i in range(n):
+            if not mask & (1 << i) and pred_masks[i] & mask == pred_masks[i]: # Ainda não escalonada e pronta.
+                cost = append_cost(tail, i) + solve(mask | (1 << i), (tail + (i,))[-window:] if window else ())
+                if best is None or cost < best[0]:
+                    best = (cost, i)
+        memo[key] = best
+        return best[0]
+
+    start_tail = tuple(range(-len(recent), 0))
+    total = solve(0, start_tail)
+    order, mask, tail = [], 0, start_tail # Reconstrói a ordem ótima a partir das escolhas memorizadas.
+    while mask != full:
+        chosen = memo[(mask, tail)][1]
+        order.append(chosen)
+        mask |= 1 << chosen
+        tail = (tail + (chosen,))[-window:] if window else ()
+    return total, order
+
+def heuristic_block_order(block, start, recent, forwarding=False, refs=None, machine=DEFAULT_MACHINE): # Define a reordenação heurística de um bloco.
+    """Melhor entre a ordem original e as duas prioridades do escalonador de lista, refinadas pela busca local"""
+    # `refs` é o resultado de memory_references para o programa inteiro (indexado pelo índice global).
+    block_refs = refs[start:start + len(block)] if refs is not None else None
+    base_nops = NopCostModel(recent, forwarding, machine=machine).total
+    best_nops, best_order = None, None
+    for local_order in (range(len(block)), schedule_block(block, forwarding, recent, True, block_refs, machine),
+                        schedule_block(block, forwarding, recent, False, block_refs, machine)):
+        model = NopCostModel(recent + [block[i] for i in local_order], forwarding,
+                             [None] * len(recent) + [start + i for i in local_order], machine)
+        improve_block_with_moves(model, len(recent), len(model.instructions), refs)
+        REORDER_STATS['block_orders_evaluated'] += 1
+        if best_nops is None or model.total - base_nops < best_nops:
+            best_nops, best_order = model.total - base_nops, model.tags[len(recent):]
+    return best_nops, best_order # NOPs do bloco (incluindo os da fronteira com a cauda) e índices globais.
+
+def block_schedule(block, start, recent, forwarding=False, refs=None, machine=DEFAULT_MACHINE, exact_limit=EXACT_BLOCK_LIMIT): # Define o escalonamento (memorizado) de um bloco.
+    """(NOPs, ordem) da heurística e (NOPs, ordem) exatos, ou None quando o bloco não é escalonado de forma exata"""
+    # O resultado só depende das palavras do bloco e da cauda (a análise de endereços é local ao bloco e relativa),
+    # então blocos repetidos ou inalterados entre execuções reaproveitam o escalonamento da SCHEDULE_CACHE.
+    key = SCHEDULE_CACHE.key([instr.word for instr in chain(recent, block)], len(recent), forwarding, exact_limit,
+                             repr(machine.to_dict()))
+    cached = SCHEDULE_CACHE.get(key)
+    if cached is not None:
+        REORDER_STATS['blocks_cached'] += 1
+        nops, local_order, exact = cached
+        exact = None if exact is None else (exact[0], [start + i for i in exact[1]])
+        return (nops, [start + i for i in local_order]), exact
+    nops, block_order = heuristic_block_order(block, start, recent, forwarding, refs, machine)
+    exact = None
+    # Bloco pequeno com NOPs (e janela curta): também é escalonado de forma ótima.
+    if nops > 0 and len(block) <= exact_limit and block_window(block + recent, forwarding, machine) <= EXACT_WINDOW_LIMIT:
+        exact = schedule_block_exact(block, forwarding, recent, refs[start:start + len(block)], machine)
+        REORDER_STATS['block_orders_evaluated'] += 1
+    SCHEDULE_CACHE.put(key, (nops, [i - start for i in block_order], exact))
+    return (nops, block_order), None if exact is None else (exact[0], [start + i for i in exact[1]])
+
+def scheduling_gap(instructions, forwarding=False, exact_limit=EXACT_BLOCK_LIMIT, machine=DEFAULT_MACHINE): # Compara heurística e ótimo por bloco.
+    """NOPs da heurística e do escalonamento ótimo nos blocos de até `exact_limit` instruções"""
+    window = machine.window(forwarding)
+    refs = memory_references(instructions)
+    heuristic = optimal = blocks = 0
+    order = [] # Ordem heurística já emitida (a cauda é a mesma usada por reorder_to_avoid_nops).
+    for start, end in find_block_ranges(instructions):
+        block = instructions[start:end]
+        recent = [instructions[i] for i in order[-window:]]
+        (nops, block_order), exact = block_schedule(block, start, recent, forwarding, refs, machine, exact_limit)
+        if len(block) <= exact_limit and block_window(block + recent, forwarding, machine) <= EXACT_WINDOW_LIMIT:
+            blocks += 1
+            heuristic += nops
+            if exact is not None: # Zero NOPs já é ótimo.
+                optimal += exact[0]
+        order.extend(block_order)
+    return {'exact_blocks': blocks, 'heuristic_nops': heuristic, 'optimal_nops': optimal, 'gap': heuristic - optimal}
+
+def reorder_to_avoid_nops(instructions, forwarding=False, exact_limit=EXACT_BLOCK_LIMIT, machine=DEFAULT_MACHINE, rename=False): # Define uma função para reordenar instruções para minimizar NOPs devido a conflitos de dados.
+    """Reordena instruções para minimizar NOPs: escalonamento exato em blocos pequenos, de lista nos demais"""
+    # Com `rename`, os registradores são renomeados antes (rename.py): sobram menos dependências WAR/WAW e a visão
+    # devolvida é sobre o programa renomeado (mesmo tamanho e mesmos desvios, palavras recodificadas).
+    if rename:
+        instructions = rename_registers(instructions, DECODE_CACHE.decode)[0]
+    # Linha de base calculada pelo modelo de custo, sem montar o programa com NOPs.
+    original_nops = NopCostModel(instructions, forwarding, machine=machine).total
+
+    order = [] # Permutação resultante: índices em `instructions`, sem copiar instruções.
+    window = machine.window(forwarding)
+    refs = memory_references(instructions) # Desambiguação de memória: loads/stores independentes também são reordenados.
+    for start, end in find_block_ranges(instructions): # Cada bloco é escalonado de forma independente; nada cruza branches.
+        block = instructions[start:end]
+        recent = [instructions[i] for i in order[-window:]] # Cauda já emitida, para dependências entre blocos.
+        # Candidatos: a ordem original (nunca se aceita algo pior) e as duas prioridades do escalonador de lista,
+        # cada um refinado pela busca local. Fica o de menor custo.
+        (best_nops, best_order), exact = block_schedule(block, start, recent, forwarding, refs, machine, exact_limit)
+        # Bloco pequeno com NOPs (e janela curta): a ordem ótima só substitui a heurística se for melhor.
+        if exact is not None and exact[0] < best_nops:
+            best_order = exact[1]
+            REORDER_STATS['exact_orders_accepted'] += 1
+        if best_order != list(range(start, end)):
+            REORDER_STATS['blocks_reordered'] += 1
+        order.extend(best_order)
+
+    # Os NOPs finais são exatamente os exigidos por posição no programa reordenado (mesmo resultado de insert_nops_data).
+    final = NopCostModel((instructions[i] for i in order), forwarding, machine=machine)
+    nops_after = {pos: need for pos, need in enumerate(final.need) if need}
+    nops_saved = max(0, original_nops - final.total) # Calcula quantos NOPs foram economizados.
+
+    return ProgramView(instructions, order, nops_after), nops_saved # Retorna a visão reordenada (com NOPs) e o número de NOPs economizados.
+
+def handle_branch_conflicts_nop(instructions, machine=DEFAULT_MACHINE): # Define uma função para tratar conflitos de controle inserindo NOPs após cada instrução de branch/jump.
+    """Adiciona NOPs após instruções de controle"""
+    nops_after = {} # Posição -> NOPs inseridos depois dela.
+    slots = machine.delay_slots # Um NOP por ciclo até o desvio ser resolvido (1 no pipeline clássico, resolvido no ID).
+    
+    for pos, instr in enumerate(instructions): # Itera sobre cada instrução original.
+        if instr.is_branch and slots: # Se a instrução é um branch/jump.
+            nops_after[pos] = slots # Adiciona os NOPs após ela.
+    
+    return ProgramView(instructions, None, nops_after), sum(nops_after.values()) # Retorna a visão com NOPs de branch e a contagem de NOPs adicionados.
+
+def handle_delayed_branch(instructions, forwarding=False, machine=DEFAULT_MACHINE, rename=False): # Define uma função para implementar a técnica de delayed branch.
+    """Implementa delayed branch - CORRIGIDO"""
+    # A ideia é preencher os "delay slots" (as `machine.delay_slots` instruções imediatamente após um branch; uma no
+    # pipeline clássico) com instruções úteis.
+    # O modelo de custo acompanha o resultado e diz, em O(janela), quantos NOPs de dados cada preenchimento criaria.
+    # A entrada pode ser uma lista ou a visão (ProgramView) produzida por outra técnica; neste caso é materializada
+    # uma única vez como lista de referências às mesmas instruções, e o resultado é uma visão sobre o programa original.
+    if isinstance(instructions, ProgramView):
+        original = instructions.base
+        base = list(instructions)
+        origins = list(instructions.origins()) # Índice original de cada posição de `base` (None para NOPs).
+    else:
+        original = base = instructions if isinstance(instructions, list) else list(instructions)
+        if rename: # Registradores renomeados: menos WAR/WAW impedindo candidatas de ocupar os slots (visões já chegam renomeadas).
+            original = base = rename_registers(base, DECODE_CACHE.decode)[0]
+        origins = range(len(base))
+    cfg = build_cfg(original)
+    cfg_index = block_index(cfg, len(original))
+    block_ids = [cfg_index[o] if o is not None else None for o in origins] # Bloco básico de cada posição.
+    block_first = {} # Bloco -> primeira posição de `base` ocupada por uma de suas instruções (onde os desvios chegam).
+    for pos, b in enumerate(block_ids):
+        if b is not None:
+            block_first.setdefault(b, pos)
+    window = machine.window(forwarding)
+
+    refs = memory_references(base, origins, block_ids) # Loads/stores podem ocupar o slot se não conflitarem com os acessos que ultrapassam.
+    model = NopCostModel((), forwarding, tags=(), machine=machine) # Os rótulos guardam o índice de origem de cada posição (None para NOPs).
+    result = model.instructions # Lista para as instruções processadas com delayed branch (mantida pelo modelo).
+    emitted_first = {} # Bloco -> posição em `result` da sua primeira instrução emitida.
+
+    def stalls_successors(candidate, branch_index, distance, old_distance, blocks=None): # A candidata no slot pioraria um conflito após o desvio?
+        # `distance` e `old_distance`: distância entre a candidata e a primeira instrução executada depois dos slots,
+        # no slot e na posição atual. Confere as primeiras instruções de cada sucessor do bloco (destino e sequência) e
+        # as que seguem o desvio no programa (mesmo após um salto incondicional, a sequência emitida é validada em
+        # ordem); sem sucessores conhecidos (jalr), qualquer leitura poderia estar lá, então a candidata só serve se o
+        # resultado já estiver pronto. Com `blocks`, confere só o início desses blocos.
+        if candidate.rd is None or candidate.rd == 0:
+            return False
+        successors = cfg[block_ids[branch_index]].successors if blocks is None else blocks
+        if not successors:
+            return distance < machine.result_distance(candidate, forwarding)
+        heads = [(base, branch_index + 1)] if blocks is None else []
+        for b in successors: # Blocos já emitidos são lidos do resultado (o início pode ter ido para um delay slot).
+            if b in emitted_first:
+                heads.append((result, emitted_first[b]))
+            elif b in block_first:
+                heads.append((base, block_first[b]))
+        for seq, first in heads:
+            # Bloco ainda não emitido: até `delay_slots` instruções do início podem ir para os slots do seu próprio
+            # desvio, aproximando as seguintes; elas são conferidas como se estivessem no início.
+            shift = 0 if seq is result else machine.delay_slots
+            for k in range(window + shift):
+                gap = max(0, k - shift)
+                if first + k >= len(seq) or distance + gap > window:
+                    break
+                follower = seq[first + k]
+                if (machine.stall_nops(candidate, follower, distance + gap, forwarding)
+                        > machine.stall_nops(candidate, follower, old_distance + gap, forwarding)):
+                    return True
+        return False
+
+    live_out = [] # Registradores vivos na saída de cada bloco (calculados só se algum slot precisar).
+    target_live = {} # Bloco -> registradores vivos na sua entrada.
+
+    def fills_from_fall_through(branch_index, j, slot): # base[j], a próxima da sequência, pode ocupar o slot?
+        # Só após branches condicionais: a instrução seguinte (já executada no caminho não tomado) passa a ser
+        # executada também no tomado, então não pode acessar a memória, encerrar um bloco nem escrever um registrador
+        # vivo na entrada do destino. Desvios para o bloco dela chegam ao slot (primeira posição do bloco).
+        if base[branch_index].opcode != OPCODE_BRANCH or j >= len(base) or block_ids[j] is None:
+            return False
+        successors = cfg[block_ids[branch_index]].successors
+        if len(successors) != 2 or block_ids[j] != successors[1]: # successors = (destino, sequência)
+            return False
+        follower = base[j]
+        if (follower.is_branch or follower.is_load or follower.is_store or follower.opcode == OPCODE_SYSTEM
+                or follower.type in ('NOP', 'Desconhecido')):
+            return False
+        target = successors[0]
+        if target not in target_live:
+            if not live_out:
+                live_out.extend(compute_liveness(original, cfg))
+            target_live[target] = live_in(original, cfg[target], live_out[target])
+        if follower.rd and target_live[target] >> follower.rd & 1:
+            return False
+        # Sem NOPs de dados novos na sequência e sem conflito com o início do destino (antes ela nunca o precedia).
+        return (model.append_delta(follower) <= 0
+                and not stalls_successors(follower, branch_index, machine.delay_slots - slot, window + 1, (target,)))
+
+    nops_added_for_delay_slots = 0 # NOPs adicionados se não foi possível preencher o slot.
+    hoisted = set() # Posições de `base` levadas para o delay slot do branch anterior.
+    
+    for i, current_instr in enumerate(base): # Itera sobre as instruções.
+        if i in hoisted: # Já emitida no delay slot.
+            continue
+        if block_ids[i] is not None:
+            emitted_first.setdefault(block_ids[i], len(result))
+        if current_instr.is_branch: # Se a instrução atual é um branch.
+            # Adiciona a instrução de branch primeiro.
+            model.append(current_instr, i)
+            branch_pos = len(result) - 1 # Posição do branch em `result` (recua a cada slot preenchido com uma instrução anterior).
+            next_index = i + 1 # Próxima instrução da sequência (candidata quando nenhuma anterior serve).
+            
+            for slot in range(machine.delay_slots): # Cada slot recebe, em ordem, uma instrução movida de antes do branch.
+                # Tenta encontrar uma instrução ANTERIOR para mover para o delay slot (após o branch e os slots já preenchidos).
+                # Esta é uma estratégia "branch-likely" ou "move from before".
+                best_candidate = None # (NOPs de dados criados pelo movimento, índice da candidata em `result`)
+                
+                # Procura nas instruções já adicionadas a `result` antes do branch (`branch_pos - 1` é a anterior a ele).
+                # Tenta mover uma instrução de até 3 posições antes do branch (índices `idx_candidate_to_move`).
+                for lookback_idx in range(1, min(4, branch_pos + 1)): # Olha 1, 2 ou 3 instruções para trás.
+                    idx_candidate_to_move = branch_pos - lookback_idx # Índice da candidata em `result`.
+                    if idx_candidate_to_move < 0: break # Não há mais instruções para trás.
+
+                    candidate_instr = result[idx_candidate_to_move] # Pega a instrução candidata.
+                    
+                    can_move_to_slot = True
+                    # 1. A candidata não pode ser ela mesma um branch nem um NOP, e precisa estar no bloco do branch
+                    #    (uma instrução de antes de um alvo de desvio não pode passar a ser executada por quem salta para lá).
+                    if candidate_instr.is_branch or candidate_instr.type == 'NOP':
+                        can_move_to_slot = False
+                    elif block_ids[model.tags[idx_candidate_to_move]] != block_ids[i]:
+                        break # As candidatas mais distantes também estão fora do bloco.
+                    
+                    # 2. A candidata não pode modificar os registradores lidos pela instrução de branch.
+                    if can_move_to_slot and candidate_instr.rd is not None and candidate_instr.rd != 0:
+                        if (current_instr.rs1 is not None and current_instr.rs1 == candidate_instr.rd) or \
+                           (current_instr.rs2 is not None and current_instr.rs2 == candidate_instr.rd):
+                            can_move_to_slot = False
+                    
+                    # 3. A candidata não pode depender das instruções que ultrapassa: as que ficam entre ela e o branch e as
+                    #    que já ocupam slots anteriores deste branch (passarão a ser executadas antes dela).
+                    # (Se a candidata lia algo que uma instrução intermediária escrevia, mover a candidata para depois do branch quebraria isso).
+                    if can_move_to_slot:
+                        for k_inter in chain(range(idx_candidate_to_move + 1, branch_pos), range(branch_pos + 1, len(result))):
+                            intermediate_instr_before_branch = result[k_inter]
+                            if has_dependency(intermediate_instr_before_branch, candidate_instr): # Se a candidata (que será movida) depende da intermediária.
+                                can_move_to_slot = False
+                                break
+                            if (is_memory_instruction(candidate_instr) and is_memory_instruction(intermediate_instr_before_branch)
+                                    and memory_conflict(refs[model.tags[idx_candidate_to_move]], refs[model.tags[k_inter]])):
+                                can_move_to_slot = False # Acessos à memória que podem ser o mesmo endereço mantêm a ordem.
+                                break
+                    
+                    # 4. O movimento não pode criar NOPs de dados: os slots são emitidos sem NOPs extras, e um
+                    #    movimento que os exigisse deixaria leituras de valor desatualizado no programa. Isso vale para
+                    #    as instruções antes do slot (modelo de custo) e para as primeiras de cada sucessor do desvio.
+                    #    Loads e stores liberados pela desambiguação de endereços seguem a mesma regra: um load no slot
+                    #    só é aceito se a sua consumidora ficar longe o bastante.
+                    if can_move_to_slot and stalls_successors(candidate_instr, i, machine.delay_slots - slot,
+                                                              branch_pos + machine.delay_slots + 1 - idx_candidate_to_move):
+                        can_move_to_slot = False
+                    if can_move_to_slot:
+                        delta = model.move_delta(idx_candidate_to_move, len(result) - 1)
+                        if delta <= 0: # A mais próxima que não cria NOPs ocupa o slot.
+                            best_candidate = (delta, idx_candidate_to_move)
+                            break # Sai do loop de busca.
+
+                if best_candidate is not None:
+                    model.apply_move(best_candidate[1], len(result) - 1) # Move a candidata para o delay slot (após o branch).
+                    branch_pos -= 1 # O branch recua uma posição.
+                elif fills_from_fall_through(i, next_index, slot):
+                    emitted_first.setdefault(block_ids[next_index], len(result)) # O bloco seguinte passa a começar no slot.
+                    model.append(base[next_index], next_index)
+                    hoisted.add(next_index)
+                    next_index += 1
+                else:
+                    # Se não encontrou instrução útil para mover, insere um NOP no delay slot.
+                    model.append(NOP_INSTR)
+                    nops_added_for_delay_slots += 1
+        else:
+            # Se não for um branch, apenas adiciona a instrução ao resultado.
+            model.append(current_instr, i)
+
+    # Converte o resultado em permutação + pontos de inserção: cada NOP é associado à posição anterior.
+    order = []
+    nops_after = {}
+    for tag in model.tags:
+        if tag is None or origins[tag] is None: # NOP de delay slot ou NOP já presente na entrada.
+            nops_after[len(order) - 1] = nops_after.get(len(order) - 1, 0) + 1
+        else:
+            order.append(origins[tag])
+    return ProgramView(original, order, nops_after), nops_added_for_delay_slots # Retorna a visão com delayed branches e NOPs adicionados.
+
+def unfilled_delay_slots(stream, machine=DEFAULT_MACHINE): # Define uma função que conta os delay slots que ficaram com NOP.
+    """Retorna os slots com NOP após desvios condicionais ('branch') e após saltos jal/jalr ('jump')"""
+    counts = {'branch': 0, 'jump': 0}
+    kind, slots_left = None, 0 # Tipo do último desvio e slots dele ainda não vistos.
+    for instr in stream:
+        if slots_left:
+            slots_left -= 1
+            counts[kind] += instr.type == 'NOP'
+        elif instr.is_branch:
+            kind, slots_left = ('branch' if instr.opcode == OPCODE_BRANCH else 'jump'), machine.delay_slots
+    return counts
+
+def pair_block_order(block, forwarding=True, refs=None, machine=DEFAULT_MACHINE, width=ISSUE_WIDTH): # Define o escalonador de um bloco para emissão dupla.
+    """Escalona um bloco ciclo a ciclo, formando grupos de até `width` instruções que podem ser emitidas juntas"""
+    preds, succs = build_dependency_dag(block, refs)
+    n = len(block)
+
+    # Prioridade: caminho crítico em ciclos (só as arestas RAW exigem distância; WAR/WAW podem ir no mesmo grupo).
+    height = [0] * n
+    for i in range(n - 1, -1, -1):
+        for s in succs[i]:
+            height[i] = max(height[i], height[s] + machine.stall_nops(block[i], block[s], 0, forwarding))
+
+    remaining = [len(p) for p in preds] # Quantas predecessoras ainda não foram escalonadas.
+    earliest = [0] * n # Ciclo mais cedo em que cada instrução pode ser emitida sem esperar por uma produtora.
+    ready = [(-height[i], i) for i in range(n) if remaining[i] == 0]
+    heapq.heapify(ready)
+    order = []
+    cycle = 0
+    while ready:
+        group = [] # Instruções emitidas neste ciclo.
+        examined = [] # Prontas que não couberam no grupo (voltam para a fila).
+        while ready and len(group) < width and len(examined) < SCHEDULER_LOOKAHEAD:
+            entry = heapq.heappop(ready)
+            i = entry[1]
+            if earliest[i] > cycle or join_conflict([block[g] for g in group], block[i], width) is not None:
+                examined.append(entry)
+                continue
+            group.append(i)
+            order.append(i)
+            for s in succs[i]: # Sucessoras sem dependência RAW podem entrar ainda neste grupo.
+                earliest[s] = max(earliest[s], cycle + machine.stall_nops(block[i], block[s], 0, forwarding))
+                remaining[s] -= 1
+                if remaining[s] == 0:
+                    heapq.heappush(ready, (-height[s], s))
+        for entry in examined:
+            heapq.heappush(ready, entry)
+        cycle += 1 # Sem nenhuma pronta a tempo, o ciclo fica vazio (o interlock do núcleo faz a espera).
+    return order # Índices (no bloco) na ordem escalonada.
+
+def schedule_dual_issue(instructions, forwarding=True, machine=DEFAULT_MACHINE, width=ISSUE_WIDTH): # Define a passada de escalonamento para emissão dupla.
+    """Reordena cada bloco básico para maximizar os ciclos com `width` instruções emitidas juntas"""
+    # O núcleo superescalar tem interlock, então nenhum NOP é inserido. Cada bloco só troca de ordem quando a
+    # simulação isolada do bloco mostra menos ciclos, e o programa inteiro só é trocado se a simulação completa não piorar.
+    refs = memory_references(instructions)
+    order = []
+    for start, end in find_block_ranges(instructions):
+        block = instructions[start:end]
+        block_order = pair_block_order(block, forwarding, refs[start:end], machine, width)
+        REORDER_STATS['block_orders_evaluated'] += 1
+        before = simulate_dual_issue(block, forwarding, machine=machine, width=width)['cycles']
+        after = simulate_dual_issue([block[i] for i in block_order], forwarding, machine=machine, width=width)['cycles']
+        if after < before:
+            REORDER_STATS['blocks_reordered'] += 1
+            order.extend(start + i for i in block_order)
+        else:
+            order.extend(range(start, end))
+    baseline = simulate_dual_issue(instructions, forwarding, machine=machine, width=width)
+    scheduled = simulate_dual_issue((instructions[i] for i in order), forwarding, machine=machine, width=width)
+    if scheduled['cycles'] > baseline['cycles']: # Nunca devolve algo pior que a ordem original.
+        return ProgramView(instructions), baseline['full_groups']
+    return ProgramView(instructions, order), scheduled['full_groups'] # Visão reordenada e ciclos com grupo completo.
+
+def detect_pairing_conflicts(instructions, forwarding=True, machine=DEFAULT_MACHINE): # Define a detecção dos pares adjacentes que não podem ser emitidos juntos.
+    return pairing_conflicts(instructions, forwarding, machine) # As regras são fixas; o atraso das dependências RAW vem da máquina.
+
+def program_words(instrs, cfg=None): # Define uma função que devolve as palavras finais de uma saída.
+    """Retorna (palavras de 32 bits, desvios não realocados) de uma lista de instruções ou de uma visão transformada"""
+    # Com o CFG do programa original, uma visão transformada tem os deslocamentos dos desvios corrigidos (os NOPs
+    # inseridos e as instruções movidas mudam a distância até os alvos).
+    if cfg is not None and isinstance(instrs, ProgramView):
+        fixed, unresolved = relocate([instr.word for instr in instrs.base], list(instrs.origins()), cfg)
+        return array('I', fixed), len(unresolved)
+    return array('I', (instr.word for instr in instrs)), 0
+
+def relocated_program(view, cfg): # Define uma função que corrige os deslocamentos de desvios de uma visão transformada.
+    """Retorna (instruções com branches, jal e pares auipc realocados, quantidade que não pôde ser realocada)"""
+    words, unresolved = program_words(view, cfg)
+    return [DECODE_CACHE.decode(word) for word in words], unresolved
+
+def save_program(writer, name, instrs, cfg=None): # Define uma função que grava uma saída nos formatos do `writer`.
+    words, unresolved = program_words(instrs, cfg) # A realocação é feita mesmo sem saídas: o resumo conta os desvios não realocados.
+    writer.program(name, words, unrelocated=unresolved)
+    return unresolved
+
+def conflict_report_lines(conflicts, title, source_lines=None): # Define uma função que monta as linhas de um relatório de conflitos.
+    # `source_lines` (programas .asm): linha do código-fonte de cada instrução, citada ao lado de cada conflito.
+    lines = [f"=== {title} ===\n\n"] # Título do relatório.
+    if not conflicts: # Se a lista de conflitos estiver vazia.
+        lines.append("Nenhum conflito detectado.\n") # Informa que não há conflitos.
+    for conflict in conflicts: # Itera sobre cada conflito.
+        if 'register' in conflict:  # Se for um conflito de dados (possui a chave 'register').
+            conflict_type_str = "Load-Use" if conflict.get('is_load_use', False) else "RAW" # Determina se é Load-Use ou RAW genérico.
+            line = (f"Conflito {conflict_type_str} na posição {conflict['position']}: " # Tipo e posição do conflito.
+                    f"Registrador x{conflict['register']} " # Registrador envolvido.
+                    f"(fonte: pos {conflict['source']}, distância: {conflict['distance']})") # Origem e distância do conflito.
+            if source_lines is not None: # Linhas do .asm da instrução afetada e da que produz o valor.
+                line += f" [linha {source_lines[conflict['position']]} do fonte; produtora na linha {source_lines[conflict['source']]}]"
+        elif 'reason' in conflict: # Par adjacente que não pode ser emitido junto (análise de emissão dupla).
+            line = (f"Par não emitido junto na posição {conflict['position']}: {PAIR_REASONS[conflict['reason']]} "
+                    f"(com pos {conflict['source']}, emitida {conflict['cycles']} ciclo(s) depois)")
+            if source_lines is not None:
+                line += f" [linha {source_lines[conflict['position']]} do fonte]"
+        else:  # Se for um conflito de controle (não possui 'register', mas tem 'type').
+            line = f"Conflito de controle na posição {conflict['position']}: Instrução tipo {conflict['type']}"
+            if source_lines is not None:
+                line += f" [linha {source_lines[conflict['position']]} do fonte]"
+        lines.append(line + "\n")
+    return lines
+
+# Passadas independentes executadas pelo driver: nome -> (função, argumentos nomeados).
+PIPELINE_PASSES = {
+    'data_sf': (detect_data_conflicts, {'forwarding': False}), # Técnica 1
+    'data_cf': (detect_data_conflicts, {'forwarding': True}), # Técnica 2
+    'control': (detect_control_conflicts, {}),
+    'nop_sf': (insert_nops_data, {'forwarding': False}), # Técnica 3
+    'nop_cf': (insert_nops_data, {'forwarding': True}), # Técnica 4
+    'reord_sf': (reorder_to_avoid_nops, {'forwarding': False}), # Técnica 5
+    'reord_cf': (reorder_to_avoid_nops, {'forwarding': True}), # Técnica 6 (também é a primeira etapa da técnica 9)
+    'branch_nop': (handle_branch_conflicts_nop, {}), # Técnica 7
+    'branch_delay': (handle_delayed_branch, {}), # Técnica 8
+    'gap_sf': (scheduling_gap, {'forwarding': False}), # Heurística x ótimo da técnica 5
+    'gap_cf': (scheduling_gap, {'forwarding': True}), # Heurística x ótimo da técnica 6
+    # Com renomeação de registradores (--renomear): substituem as técnicas 5, 6 e 8 nas saídas; as versões sem
+    # renomeação continuam rodando para medir os NOPs que a renomeação permitiu eliminar.
+    'reord_sf_ren': (reorder_to_avoid_nops, {'forwarding': False, 'rename': True}),
+    'reord_cf_ren': (reorder_to_avoid_nops, {'forwarding': True, 'rename': True}),
+    'branch_delay_ren': (handle_delayed_branch, {'rename': True}),
+    # Emissão dupla (--superescalar): análise dos pares adjacentes e escalonamento para um núcleo de 2 vias em ordem.
+    'pairs': (detect_pairing_conflicts, {'forwarding': True}),
+    'dual_issue': (schedule_dual_issue, {'forwarding': True}),
+}
+RENAME_PASSES = {'reord_sf': 'reord_sf_ren', 'reord_cf': 'reord_cf_ren', 'branch_delay': 'branch_delay_ren'}
+DUAL_ISSUE_PASSES = ('pairs', 'dual_issue') # Só executadas no modo de emissão dupla.
+
+PARALLEL_MIN_INSTRUCTIONS = 5000 # Abaixo deste tamanho o custo de criar processos supera o ganho; executa em série.
+
+worker_instructions = None # Programa decodificado, recebido uma única vez por processo do pool (ver init_worker).
+worker_machine = DEFAULT_MACHINE # Máquina assumida pelas passadas do processo.
+
+def init_worker(instructions, machine=DEFAULT_MACHINE, schedules=None): # Inicializador de cada processo do pool: guarda o programa já decodificado.
+    global worker_instructions, worker_machine
+    worker_instructions = instructions
+    worker_machine = machine
+    if schedules: # Escalonamentos de bloco já conhecidos pelo processo principal.
+        SCHEDULE_CACHE.update(schedules)
+
+def run_pass(name): # Executa uma passada sobre o programa do processo e devolve um resultado compacto.
+    """Executa a passada `name` e devolve (conflitos), (estatísticas) ou (ordem, NOPs por posição, contagem, palavras)"""
+    func, kwargs = PIPELINE_PASSES[name]
+    result = func(worker_instructions, machine=worker_machine, **kwargs)
+    if isinstance(result, (list, dict)): # Detecções devolvem a lista de conflitos; comparações, um dicionário.
+        return result
+    view, count = result # Técnicas devolvem uma visão; só a permutação e os NOPs voltam ao processo principal.
+    return view.order, view.nops_after, count, base_words(view)
+
+def run_pass_in_pool(name): # run_pass num processo do pool: também devolve os escalonamentos de bloco novos.
+    return run_pass(name), SCHEDULE_CACHE.take_new_entries()
+
+def base_words(view): # Palavras da base de uma visão renomeada (None quando a base é o próprio programa).
+    return None if view.base is worker_instructions else array('I', (instr.word for instr in view.base))
+
+def decoded_base(words, original): # Base de uma visão recebida de run_pass: o programa original ou as palavras renomeadas.
+    return original if words is None else [DECODE_CACHE.decode(word) for word in words]
+
+def run_combined(order, nops_after, words=None): # Técnica 9: delayed branch (com forwarding) sobre o resultado da técnica 6.
+    base = decoded_base(words, worker_instructions)
+    view, count = handle_delayed_branch(ProgramView(base, order, nops_after), forwarding=True, machine=worker_machine)
+    return view.order, view.nops_after, count, words
+
+def profiled_pass(profiler, name, func, *args): # Executa uma passada como uma etapa do perfilador.
+    with profiler.stage(name, len(worker_instructions)) as record:
+        before = dict(REORDER_STATS)
+        result = func(*args)
+        if isinstance(result, list): # Detecção: conta conflitos, não instruções.
+            record['conflicts'] = len(result)
+        elif isinstance(result, tuple): # Técnica: (ordem, NOPs por posição, contagem).
+            order, nops_after = result[0], result[1]
+            record['instructions_out'] = (len(worker_instructions) if order is None else len(order)) + sum(nops_after.values())
+        counters = {key: REORDER_STATS[key] - value for key, value in before.items() if REORDER_STATS[key] != value}
+        if counters:
+            record['reorder'] = counters
+    return result
+
+def run_all_passes(original, max_workers=None, parallel=None, profiler=NO_PROFILER, machine=DEFAULT_MACHINE, rename=False,
+                   dual_issue=False): # Executa todas as passadas, em paralelo quando vale a pena.
+    """Executa as detecções e as técnicas 3 a 9, reaproveitando a reordenação c/ forwarding na técnica 9"""
+    # Com `rename`, também roda as passadas com renomeação de registradores, e a técnica 9 parte da técnica 6 renomeada.
+    # Com `dual_issue`, também roda a análise de pares e o escalonamento para emissão dupla.
+    raw = collect_passes(original, max_workers, parallel, profiler, machine, rename, dual_issue)
+    return views_from_passes(raw, original)
+
+def collect_passes(original, max_workers=None, parallel=None, profiler=NO_PROFILER, machine=DEFAULT_MACHINE, rename=False,
+                   dual_issue=False): # Executa as passadas e devolve os resultados compactos de run_pass (o que vai para a cache).
+    passes = [name for name in PIPELINE_PASSES
+              if (rename or name not in RENAME_PASSES.values()) and (dual_issue or name not in DUAL_ISSUE_PASSES)]
+    source = RENAME_PASSES['reord_cf'] if rename else 'reord_cf' # Entrada da técnica 9.
+    if parallel is None:
+        parallel = len(original) >= PARALLEL_MIN_INSTRUCTIONS
+    if profiler.enabled: # Medir cada passada exige executá-las uma de cada vez, no próprio processo.
+        parallel = False
+    raw = {}
+    if parallel:
+        schedules = dict(SCHEDULE_CACHE.entries) # Os processos do pool também reaproveitam os blocos já escalonados.
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(original, machine, schedules)) as pool:
+            futures = {name: pool.submit(run_pass_in_pool, name) for name in passes}
+            # A técnica 9 depende apenas da técnica 6: é enviada assim que ela termina, enquanto as demais seguem rodando.
+            order_cf, nops_cf, _, words_cf = futures[source].result()[0]
+            combined = pool.submit(run_combined, order_cf, nops_cf, words_cf)
+            for name, future in futures.items():
+                raw[name], new_schedules = future.result()
+                SCHEDULE_CACHE.update(new_schedules) # Blocos escalonados pelos processos voltam para a cache.
+            raw['combined'] = combined.result()
+    else:
+        init_worker(original, machine) # Execução em série no próprio processo, com as mesmas funções.
+        for name in passes:
+            raw[name] = profiled_pass(profiler, name, run_pass, name)
+        order_cf, nops_cf, _, words_cf = raw[source]
+        raw['combined'] = profiled_pass(profiler, 'combined', run_combined, order_cf, nops_cf, words_cf)
+    return raw
+
+def views_from_passes(raw, original): # Define a reconstrução das visões a partir dos resultados compactos.
+    # Reconstrói as visões sobre as instruções do processo principal (só as palavras renomeadas vêm entre processos
+    # ou da cache de resultados).
+    results = {}
+    renamed = {} # Bases renomeadas já decodificadas (a técnica 9 compartilha a da técnica 6).
+    for name, value in raw.items(): # As visões apontam para o programa original ou para a sua versão renomeada.
+        if isinstance(value, (list, dict)):
+            results[name] = value
+        else:
+            order, nops_after, count, words = value
+            base = original if words is None else renamed.setdefault(words.tobytes(), decoded_base(words, original))
+            results[name] = (ProgramView(base, order, nops_after), count)
+    return results
+
+# Técnica -> (forwarding assumido pela técnica, se os desvios têm delay slots). A validação simula a saída da técnica
+# nesse hardware sem interlock: qualquer leitura de valor desatualizado é um conflito que a técnica não resolveu.
+TECHNIQUE_PIPELINES = {
+    3: (False, False), # NOPs s/ forwarding.
+    4: (True, False), # NOPs c/ forwarding.
+    5: (False, False), # Reordenação s/ forwarding.
+    6: (True, False), # Reordenação c/ forwarding.
+    7: (True, True), # NOPs após cada desvio (delay slots vazios); não trata conflitos de dados.
+    8: (True, True), # Delayed branch; não trata conflitos de dados.
+    9: (True, True), # Reordenação c/ forwarding + delayed branch.
+}
+
+def validate_stream(stream, forwarding, delay_slots, machine=DEFAULT_MACHINE, cfg=None): # Leituras desatualizadas da saída de uma técnica.
+    """Leituras de valor desatualizado (sem interlock) com os desvios tomados, não tomados e em cada aresta tomada"""
+    # A sequência é simulada com todos os desvios tomados e com nenhum tomado (os descartes mudam os ciclos). Com o
+    # `cfg` do original, cada desvio de alvo conhecido também é seguido até o alvo realocado: as instruções antes do
+    # desvio e dos seus slots são executadas logo antes das primeiras do bloco de destino.
+    instrs = list(stream)
+    found = {} # (posição, produtora, registrador) -> leitura, sem repetir as vistas por mais de um caminho.
+    for outcomes in (None, repeat(False)):
+        for read in simulate_pipeline(instrs, forwarding, interlock=False, delay_slots=delay_slots, branch_outcomes=outcomes,
+                                      machine=machine)['stale_reads']:
+            found.setdefault((read['position'], read['source'], read['register']), read)
+    if cfg is not None:
+        words = program_words(stream, cfg)[0]
+        window = machine.window(forwarding)
+        for p, instr in enumerate(instrs):
+            target = branch_target(words, p) if instr.is_branch else None
+            if target is None:
+                continue
+            before = list(range(max(0, p - window), min(len(instrs), p + 1 + delay_slots))) # Até o desvio e seus slots.
+            path = before + list(range(target, min(len(instrs), target + window)))
+            outcomes = [k == p for k in before if instrs[k].is_branch] # Só este desvio é tomado.
+            for read in simulate_pipeline([instrs[k] for k in path], forwarding, interlock=False, delay_slots=delay_slots,
+                                          branch_outcomes=outcomes, machine=machine)['stale_reads']:
+                if read['position'] >= len(before): # Leituras no bloco de destino (as anteriores já foram vistas em sequência).
+                    key = (path[read['position']], path[read['source']], read['register'])
+                    found.setdefault(key, {'position': key[0], 'source': key[1], 'register': key[2]})
+    return sorted(found.values(), key=lambda read: (read['position'], read['source'], read['register']))
+
+def simulate_techniques(streams, machine=DEFAULT_MACHINE, dual_issue=False, cfg=None): # Mede ciclos e CPI reais de cada técnica no pipeline da máquina.
+    """Simula cada técnica com e sem forwarding (com interlock) e valida a saída no hardware que ela assume"""
+    # Com `dual_issue`, cada saída também é simulada em um núcleo de 2 vias em ordem (chaves 'dual_sf' e 'dual_cf').
+    # Com o `cfg` do original, a validação também segue cada desvio até o seu alvo (validate_stream).
+    report = {}
+    for number, stream in streams.items():
+        forwarding, delayed = TECHNIQUE_PIPELINES[number]
+        delay_slots = machine.delay_slots if delayed else 0 # Slots após cada desvio: tantos quanto a penalidade da máquina.
+        report[number] = {
+            'sf': simulate_pipeline(stream, forwarding=False, delay_slots=delay_slots, machine=machine),
+            'cf': simulate_pipeline(stream, forwarding=True, delay_slots=delay_slots, machine=machine),
+            'stale_reads': validate_stream(stream, forwarding, delay_slots, machine, cfg),
+        }
+        if dual_issue:
+            report[number]['dual_sf'] = simulate_dual_issue(stream, False, delay_slots, machine)
+            report[number]['dual_cf'] = simulate_dual_issue(stream, True, delay_slots, machine)
+    return report
+
+PREDICTION_MAX_STEPS = 1_000_000 # Instruções executadas, no máximo, para alimentar os preditores do relatório.
+
+def control_costs(input_file, views, machine=DEFAULT_MACHINE, inputs=(), max_steps=PREDICTION_MAX_STEPS): # Técnicas 7 e 8 x preditores na mesma execução.
+    """Executa o programa e retorna (instruções executadas, NOPs de controle executados por técnica, relatório dos
+    preditores, aviso de execução interrompida ou None)"""
+    import interpreter # Importado aqui: o interpretador importa este módulo.
+    words, data, text_base, data_base = interpreter.load_program(input_file)
+    state, trace = interpreter.run_program(words, data, text_base, data_base, inputs, max_steps) # `inputs`: leituras (ecall 5).
+    counts = interpreter.execution_counts(trace, len(words))
+    executed_nops = {n: interpreter.dynamic_nops(view, counts) for n, view in views.items()}
+    warning = interpreter.stop_warning(state, trace, max_steps)
+    return len(trace), executed_nops, predictor_report(trace, words, text_base, machine=machine), warning
+
+def analyze_file(input_file, output_dir='.', parallel=None, verbose=True, profiler=NO_PROFILER, machine=DEFAULT_MACHINE, rename=False,
+                 dual_issue=False, cache=None, formats=DEFAULT_FORMATS, inputs=()): # Analisa um arquivo e grava as saídas em `output_dir`.
+    """Executa detecções e técnicas 3 a 9 sobre um arquivo e devolve o resumo numérico"""
+    # Com um PassProfiler ativo, cada etapa (leitura, passadas, gravação de cada arquivo, simulação) é medida.
+    # `machine` descreve o pipeline (estágios, forwarding, latências, resolução dos desvios) assumido por todas as passadas.
+    # `rename`: as técnicas 5, 6, 8 e 9 trabalham sobre o programa com registradores renomeados.
+    # `dual_issue`: analisa os pares adjacentes, escalona para emissão dupla e informa o IPC de cada técnica em 2 vias.
+    # `cache` (ResultCache): o mesmo programa com as mesmas opções reaproveita passadas e simulações gravadas.
+    # `formats` (output_writer): formatos das saídas gravadas; vazio, só o resumo numérico é devolvido.
+    # `inputs`: valores das leituras de inteiro (ecall 5) na execução que compara as técnicas 7 e 8 com os preditores.
+    if formats:
+        os.makedirs(output_dir, exist_ok=True) # Cada entrada pode ter seu próprio diretório de saída.
+    writer = OutputWriter(output_dir, formats, conflict_report_lines) # Cada saída é montada inteira e gravada de uma vez.
+    with profiler.stage('read_program') as record:
+        original, source_lines = read_program(input_file) # Lê as instruções (e, para .asm, o mapa de linhas do fonte).
+        record['instructions_out'] = len(original)
+    
+    if verbose:
+        print("=== ANÁLISE DE CONFLITOS NO PIPELINE ===\n") # Imprime um cabeçalho.
+        print(f"Arquivo de entrada: {input_file}") # Imprime o nome do arquivo de entrada.
+        if machine is not DEFAULT_MACHINE:
+            print(f"Máquina: {machine.describe()}")
+        print(f"Total de instruções: {len(original)}\n") # Imprime o número total de instruções originais.
+    
+    entry = None # Entrada da cache de resultados (None: calcula tudo).
+    if cache is not None:
+        with profiler.stage('result_cache:load', len(original)):
+            key = content_key([instr.word for instr in original], machine=machine.to_dict(), rename=rename, dual_issue=dual_issue)
+            entry = cache.load(key)
+        if entry is not None and verbose:
+            print(f"Resultados reaproveitados da cache ({key[:12]}).\n")
+    # Todas as passadas (detecções e técnicas 3 a 9) rodam de uma vez; em programas grandes, em paralelo.
+    if entry is None:
+        raw = collect_passes(original, parallel=parallel, profiler=profiler, machine=machine, rename=rename, dual_issue=dual_issue)
+    else:
+        raw = {name: decode_pass(value) for name, value in entry['passes'].items()}
+    results = views_from_passes(raw, original)
+    without_rename = {name: results[name] for name in RENAME_PASSES} # Resultados sem renomeação (para comparação).
+    if rename: # As saídas das técnicas 5, 6 e 8 passam a ser as versões com renomeação.
+        for name, renamed_name in RENAME_PASSES.items():
+            results[name] = results[renamed_name]
+    with profiler.stage('build_cfg', len(original)):
+        cfg = build_cfg(original) # Blocos básicos do original: as saídas são gravadas com os desvios realocados.
+    unrelocated = 0 # Desvios cujo novo deslocamento não coube no imediato (ou auipc sem consumidoras no bloco).
+    
+    # Técnica 1: Detectar conflitos de dados sem forwarding.
+    data_conflicts_sf = results['data_sf']
+    with profiler.stage("write_report:conflitos_dados_sem_forwarding"):
+        writer.report("conflitos_dados_sem_forwarding", # Escreve o relatório.
+                               data_conflicts_sf, "CONFLITOS DE DADOS SEM FORWARDING", source_lines)
+    
+    # Técnica 2: Detectar conflitos de dados com forwarding.
+    data_conflicts_cf = results['data_cf']
+    with profiler.stage("write_report:conflitos_dados_com_forwarding"):
+        writer.report("conflitos_dados_com_forwarding", # Escreve o relatório.
+                               data_conflicts_cf, "CONFLITOS DE DADOS COM FORWARDING", source_lines)
+    
+    # Detectar conflitos de controle.
+    control_conflicts = results['control']
+    with profiler.stage("write_report:conflitos_controle"):
+        writer.report("conflitos_controle", # Escreve o relatório.
+                               control_conflicts, "CONFLITOS DE CONTROLE", source_lines)
+    
+    # Técnica 3: Inserção de NOPs para conflitos de dados, sem forwarding.
+    instrs_nop_sf, nops_sf_count = results['nop_sf'] # (nops_sf_count é o número de NOPs adicionados)
+    with profiler.stage("write_output:saida_nop_sem_forwarding", len(instrs_nop_sf)):
+        unrelocated += save_program(writer, "saida_nop_sem_forwarding", instrs_nop_sf, cfg) # Escreve o resultado em arquivo.
+    
+    # Técnica 4: Inserção de NOPs para conflitos de dados, com forwarding.
+    instrs_nop_cf, nops_cf_count = results['nop_cf'] # (nops_cf_count é o número de NOPs adicionados)
+    with profiler.stage("write_output:saida_nop_com_forwarding", len(instrs_nop_cf)):
+        unrelocated += save_program(writer, "saida_nop_com_forwarding", instrs_nop_cf, cfg) # Escreve o resultado.
+    
+    # Técnica 5: Reordenação de instruções para evitar NOPs, sem forwarding.
+    instrs_reord_sf, saved_sf = results['reord_sf']
+    with profiler.stage("write_output:saida_reord_sem_forwarding", len(instrs_reord_sf)):
+        unrelocated += save_program(writer, "saida_reord_sem_forwarding", instrs_reord_sf, cfg) # Escreve o resultado.
+    
+    # Técnica 6: Reordenação de instruções para evitar NOPs, com forwarding.
+    instrs_reord_cf, saved_cf = results['reord_cf']
+    with profiler.stage("write_output:saida_reord_com_forwarding", len(instrs_reord_cf)):
+        unrelocated += save_program(writer, "saida_reord_com_forwarding", instrs_reord_cf, cfg) # Escreve o resultado.
+    
+    # Técnica 7: Tratamento de conflito de controle com inserção de NOP.
+    instrs_branch_nop, ctrl_nops_count = results['branch_nop'] # (ctrl_nops_count é o número de NOPs adicionados)
+    with profiler.stage("write_output:saida_branch_nop", len(instrs_branch_nop)):
+        unrelocated += save_program(writer, "saida_branch_nop", instrs_branch_nop, cfg) # Escreve o resultado.
+    
+    # Técnica 8: Tratamento de conflito de controle com Delayed Branch.
+    instrs_branch_delay, delay_nops_count = results['branch_delay'] # (delay_nops_count é o número de NOPs inseridos nos delay slots não preenchidos)
+    with profiler.stage("write_output:saida_branch_delay", len(instrs_branch_delay)):
+        unrelocated += save_program(writer, "saida_branch_delay", instrs_branch_delay, cfg) # Escreve o resultado.
+    
+    # Técnica 9: Combinação otimizada (Reordenação com forwarding + Delayed Branch).
+    # Reaproveita a reordenação da técnica 6 (não é recalculada) e aplica delayed branch sobre ela.
+    combined_final, _ = results['combined'] # O '_' ignora os NOPs de delay slot.
+    with profiler.stage("write_output:saida_comb_4e6", len(combined_final)):
+        unrelocated += save_program(writer, "saida_comb_4e6", combined_final, cfg) # Escreve o resultado combinado. (O nome do arquivo sugere combinação das técnicas 4 (NOP com forwarding) e 6 (Reordenação com forwarding), mas o código implementa Reordenação com forwarding + Delayed Branch).
+    
+    if dual_issue: # Emissão dupla: pares adjacentes do original e o programa escalonado para 2 vias.
+        pair_conflicts = results['pairs']
+        with profiler.stage("write_report:pares_dual_issue"):
+            writer.report("pares_dual_issue",
+                                   pair_conflicts, "PARES ADJACENTES QUE NÃO PODEM SER EMITIDOS JUNTOS", source_lines)
+        instrs_dual, _ = results['dual_issue']
+        with profiler.stage("write_output:saida_dual_issue", len(instrs_dual)):
+            unrelocated += save_program(writer, "saida_dual_issue", instrs_dual, cfg)
+    
+    # Simulação ciclo a ciclo das saídas das técnicas (e do programa original, como referência).
+    if entry is None:
+        with profiler.stage('simulate_pipeline', len(original)):
+            simulations = {
+                'timing': simulate_techniques({3: instrs_nop_sf, 4: instrs_nop_cf, 5: instrs_reord_sf, 6: instrs_reord_cf,
+                                               7: instrs_branch_nop, 8: instrs_branch_delay, 9: combined_final}, machine, dual_issue, cfg),
+                'original': {'sf': simulate_pipeline(original, forwarding=False, machine=machine),
+                             'cf': simulate_pipeline(original, forwarding=True, machine=machine)},
+            }
+            if dual_issue:
+                simulations['dual_original'] = {fwd: simulate_dual_issue(original, fwd == 'cf', machine=machine) for fwd in ('sf', 'cf')}
+                simulations['dual_scheduled'] = {fwd: simulate_dual_issue(instrs_dual, fwd == 'cf', machine=machine) for fwd in ('sf', 'cf')}
+        if cache is not None: # Grava passadas e simulações para as próximas execuções com o mesmo conteúdo.
+            with profiler.stage('result_cache:store', len(original)):
+                cache.store(key, {'passes': {name: encode_pass(value) for name, value in raw.items()}, 'simulations': simulations})
+    else:
+        simulations = entry['simulations']
+        simulations['timing'] = {int(n): sim for n, sim in simulations['timing'].items()} # Chaves JSON voltam a ser inteiros.
+    timing, timing_original = simulations['timing'], simulations['original']
+    dual_original, dual_scheduled = simulations.get('dual_original'), simulations.get('dual_scheduled')
+
+    # Relatório final impresso no console.
+    original_count = len(original)
+    if rename: # Ganho da renomeação: diferença de NOPs entre as versões com e sem renomeação de cada técnica.
+        renamed_count = sum(a is not b for a, b in zip(instrs_reord_cf.base, original)) # Instruções com registradores trocados.
+        rename_gain_sf = len(without_rename['reord_sf'][0]) - len(instrs_reord_sf)
+        rename_gain_cf = len(without_rename['reord_cf'][0]) - len(instrs_reord_cf)
+        rename_gain_delay = without_rename['branch_delay'][1] - delay_nops_count
+    if verbose:
+        print("=== RELATÓRIO DE DETECÇÃO ===")
+        print(f"Conflitos de dados sem forwarding: {len(data_conflicts_sf)}")
+        print(f"Conflitos de dados com forwarding: {len(data_conflicts_cf)}")
+        print(f"Conflitos de controle: {len(control_conflicts)}")
+        print()
+
+        print("=== RELATÓRIO DE SOBRECUSTO (TOTAL DE INSTRUÇÕES APÓS TRATAMENTO) ===")
+        print(f"Instruções originais: {original_count}")
+        print(f"Técnica 3 - NOPs (dados) s/ forwarding: {len(instrs_nop_sf)} (+{len(instrs_nop_sf) - original_count} NOPs)")
+        print(f"Técnica 4 - NOPs (dados) c/ forwarding: {len(instrs_nop_cf)} (+{len(instrs_nop_cf) - original_count} NOPs)")
+        print(f"Técnica 5 - Reord. (dados) s/ forwarding: {len(instrs_reord_sf)} (+{len(instrs_reord_sf) - original_count}, NOPs economizados pela reord.: {saved_sf})")
+        print(f"Técnica 6 - Reord. (dados) c/ forwarding: {len(instrs_reord_cf)} (+{len(instrs_reord_cf) - original_count}, NOPs economizados pela reord.: {saved_cf})")
+        print(f"Técnica 7 - NOPs (controle): {len(instrs_branch_nop)} (+{len(instrs_branch_nop) - original_count} NOPs)")
+        print(f"Técnica 8 - Delayed Branch (controle): {len(instrs_branch_delay)} (+{len(instrs_branch_delay) - original_count} NOPs/slots preenchidos)") # O número de NOPs aqui é `delay_nops_count`.
+        print(f"Técnica 9 - Combinação (Reord. c/ Fwd + Delayed Branch): {len(combined_final)} (+{len(combined_final) - original_count})")
+        unfilled = unfilled_delay_slots(instrs_branch_delay, machine)
+        print(f"Delay slots da técnica 8 com NOP: {unfilled['branch']} após desvios condicionais, {unfilled['jump']} após saltos (jal/jalr)")
+        # Diferença aceita em relação ao preenchimento antigo, que movia instruções entre blocos sem olhar o destino.
+        print("Restrição: os slots recebem instruções do próprio bloco ou, após desvios condicionais, da sequência quando o")
+        print("destino não lê o registrador escrito; saltos precisariam duplicar o destino (não feito), por isso a técnica 8")
+        print("pode ficar com mais NOPs que o preenchimento anterior.")
+        print("================================\n")
+
+        print(f"=== REORDENAÇÃO: HEURÍSTICA x ÓTIMO (BLOCOS DE ATÉ {EXACT_BLOCK_LIMIT} INSTRUÇÕES) ===")
+        for label, gap in (("Técnica 5 - s/ forwarding", results['gap_sf']), ("Técnica 6 - c/ forwarding", results['gap_cf'])):
+            print(f"{label}: {gap['exact_blocks']} blocos, heurística {gap['heuristic_nops']} NOPs, "
+                  f"ótimo {gap['optimal_nops']} NOPs (diferença: {gap['gap']})")
+        # Diferença aceita em relação à reordenação antiga (ex.: teste2.hex, que ela movia através de ecall, que lê a0/a7).
+        print("Restrição: nenhuma instrução atravessa desvios, saltos ou ecall, por isso as técnicas 5 e 6 podem ficar com")
+        print("mais NOPs que a reordenação anterior, que atravessava esses limites e mudava o resultado do programa.")
+        print(f"NOPs restantes em blocos de ordem ótima comprovada: técnica 5 {results['gap_sf']['optimal_nops']} de "
+              f"{len(instrs_reord_sf) - original_count}, técnica 6 {results['gap_cf']['optimal_nops']} de {len(instrs_reord_cf) - original_count}")
+        print("================================\n")
+
+        print(f"=== RELATÓRIO DE DESEMPENHO (SIMULAÇÃO DO PIPELINE DE {len(machine.stages)} ESTÁGIOS) ===")
+        for label, sim in [('Original', timing_original)] + [(f'Técnica {n}', timing[n]) for n in timing]:
+            sf, cf = sim['sf'], sim['cf']
+            line = (f"{label}: s/ forwarding {sf['cycles']} ciclos, CPI {sf['cpi']:.2f} (stalls {sf['stall_cycles']}, flushes {sf['flushes']})"
+                    f" | c/ forwarding {cf['cycles']} ciclos, CPI {cf['cpi']:.2f} (stalls {cf['stall_cycles']}, flushes {cf['flushes']})")
+            if 'stale_reads' in sim: # Validação no hardware assumido pela técnica (sem interlock).
+                stale = len(sim['stale_reads'])
+                line += " | validação: OK" if not stale else f" | validação: {stale} leitura(s) de valor desatualizado"
+            print(line)
+        print("================================\n")
+
+        # Os preditores precisam do resultado real de cada desvio: o programa é executado pelo interpretador.
+        print("=== CONFLITOS DE CONTROLE: TÉCNICAS 7 E 8 x PREDIÇÃO DE DESVIOS ===")
+        try:
+            executed, executed_nops, predictors, warning = control_costs(input_file, {7: instrs_branch_nop, 8: instrs_branch_delay},
+                                                                         machine, inputs)
+        except ValueError as exc: # Programa que não executa sozinho (ex.: acessa memória fora dos segmentos).
+            print(f"Predição não avaliada: a execução parou com erro ({exc}).")
+        else:
+            print(f"Instruções executadas: {executed}")
+            if warning: # Execução incompleta: os totais não representam o programa inteiro.
+                print(f"Aviso: {warning}; os totais abaixo cobrem só o trecho executado.")
+            print(f"Técnica 7 - NOP após desvio: {executed_nops[7]} ciclos perdidos")
+            print(f"Técnica 8 - Delayed Branch: {executed_nops[8]} ciclos perdidos (delay slots com NOP)")
+            for line in predictor_lines(predictors):
+                print(line)
+        print("================================\n")
+
+        if dual_issue:
+            print(f"=== EMISSÃO DUPLA ({ISSUE_WIDTH} INSTRUÇÕES POR CICLO, EM ORDEM, COM INTERLOCK) ===")
+            adjacent = max(0, original_count - 1)
+            reasons = {reason: 0 for reason in PAIR_REASONS}
+            for conflict in pair_conflicts:
+                reasons[conflict['reason']] += 1
+            print(f"Pares adjacentes que podem ser emitidos juntos: {adjacent - len(pair_conflicts)} de {adjacent}"
+                  f" (impedidos: {', '.join(f'{PAIR_REASONS[r]} {n}' for r, n in reasons.items())})")
+            print(f"Ciclos de emissão dos pares impedidos (c/ forwarding, {machine.name}): "
+                  f"{sum(conflict['cycles'] for conflict in pair_conflicts)} para {len(pair_conflicts)} pares")
+            overheads = {n: len(stream) - original_count for n, stream in ((3, instrs_nop_sf), (4, instrs_nop_cf), (5, instrs_reord_sf),
+                         (6, instrs_reord_cf), (7, instrs_branch_nop), (8, instrs_branch_delay), (9, combined_final))}
+            rows = [('Original', None, dual_original)] + [(f'Técnica {n}', overheads[n], timing[n]) for n in timing]
+            rows.append(('Escalonamento p/ emissão dupla', 0, dual_scheduled))
+            for label, overhead, sim in rows:
+                sf, cf = sim.get('dual_sf', sim.get('sf')), sim.get('dual_cf', sim.get('cf'))
+                line = f"{label}: " if overhead is None else f"{label}: +{overhead} NOPs (1 via) | "
+                print(line + f"IPC em 2 vias s/ forwarding {sf['ipc']:.2f} ({sf['cycles']} ciclos),"
+                             f" c/ forwarding {cf['ipc']:.2f} ({cf['cycles']} ciclos, {cf['full_groups']} com par)")
+            print("================================\n")
+
+        if rename:
+            print("=== RENOMEAÇÃO DE REGISTRADORES ===")
+            print(f"Instruções recodificadas: {renamed_count}")
+            print(f"NOPs eliminados a mais pela reordenação graças à renomeação: s/ forwarding {rename_gain_sf}, c/ forwarding {rename_gain_cf}")
+            print(f"Delay slots preenchidos a mais graças à renomeação: {rename_gain_delay}")
+            print("================================\n")
+
+        if unrelocated:
+            print(f"Aviso: {unrelocated} desvio(s) não puderam ser realocados nas saídas (mantidos como no original).")
+        if formats:
+            print("Arquivos de saída e relatórios gerados com sucesso!")
+        else:
+            print("Nenhum arquivo de saída gravado (--formatos nenhum).")
+
+    # Resumo numérico da análise (usado pelo modo em lote).
+    type_count = {t: 0 for t in ('R', 'I', 'S', 'B', 'U', 'J', 'Desconhecido')} # Contagem por tipo, como no M1.
+    for instr in original:
+        type_count[instr.type] += 1
+    summary = {
+        'file': input_file,
+        'instructions': original_count,
+        'data_conflicts_sf': len(data_conflicts_sf),
+        'data_conflicts_cf': len(data_conflicts_cf),
+        'control_conflicts': len(control_conflicts),
+        'basic_blocks': len(cfg),
+        'unrelocated_branches': unrelocated,
+        'technique_3_nops': len(instrs_nop_sf) - original_count,
+        'technique_4_nops': len(instrs_nop_cf) - original_count,
+        'technique_5_nops': len(instrs_reord_sf) - original_count,
+        'technique_6_nops': len(instrs_reord_cf) - original_count,
+        'technique_5_optimal_gap': results['gap_sf']['gap'], # NOPs que a heurística deixaria a mais nos blocos pequenos.
+        'technique_6_optimal_gap': results['gap_cf']['gap'],
+        'technique_7_nops': len(instrs_branch_nop) - original_count,
+        'technique_8_nops': len(instrs_branch_delay) - original_count,
+        'technique_9_nops': len(combined_final) - original_count,
+        **{f'technique_{n}_cycles_sf': sim['sf']['cycles'] for n, sim in timing.items()},
+        **{f'technique_{n}_cycles_cf': sim['cf']['cycles'] for n, sim in timing.items()},
+        **{f'technique_{n}_stale_reads': len(sim['stale_reads']) for n, sim in timing.items()},
+        **{f'type_{t}': count for t, count in type_count.items()},
+        **({'renamed_instructions': renamed_count, 'technique_5_rename_gain': rename_gain_sf,
+            'technique_6_rename_gain': rename_gain_cf, 'technique_8_rename_gain': rename_gain_delay} if rename else {}),
+        **({'dual_issue_blocked_pairs': len(pair_conflicts), 'dual_issue_ipc_cf': dual_original['cf']['ipc'],
+            'dual_issue_schedule_ipc_cf': dual_scheduled['cf']['ipc'],
+            **{f'technique_{n}_ipc_dual_sf': sim['dual_sf']['ipc'] for n, sim in timing.items()},
+            **{f'technique_{n}_ipc_dual_cf': sim['dual_cf']['ipc'] for n, sim in timing.items()}} if dual_issue else {}),
+    }
+    writer.close(summary) # Relatório consolidado (JSON lines), quando pedido.
+    return summary
+
+WATCH_INTERVAL = 0.5 # Segundos entre as verificações do arquivo observado.
+
+def watch_file(input_file, interval=WATCH_INTERVAL, **options): # Define o modo de observação (--observar).
+    """Reanalisa `input_file` a cada alteração até Ctrl+C; blocos básicos inalterados reaproveitam seus escalonamentos"""
+    # As passadas rodam em série: assim a reordenação e a comparação com o ótimo compartilham a SCHEDULE_CACHE do
+    # processo, e depois da primeira análise só os blocos editados (e os seguintes, se a cauda mudou) são reescalonados.
+    last = None # (instante de modificação, tamanho) da última versão analisada.
+    try:
+        while True:
+            try:
+                info = os.stat(input_file)
+                stamp = (info.st_mtime_ns, info.st_size)
+            except OSError: # Arquivo removido ou sendo regravado: espera a próxima versão.
+                stamp = None
+            if stamp is not None and stamp != last:
+                last = stamp
+                hits, misses = SCHEDULE_CACHE.hits, SCHEDULE_CACHE.misses
+                try:
+                    analyze_file(input_file, parallel=False, **options)
+                except (OSError, ValueError) as exc: # Arquivo incompleto ou inválido no meio de uma edição.
+                    print(f"Erro ao analisar {input_file}: {exc}")
+                else:
+                    print(f"[observando {input_file}] escalonamentos de bloco reaproveitados: {SCHEDULE_CACHE.hits - hits},"
+                          f" recalculados: {SCHEDULE_CACHE.misses - misses} (Ctrl+C encerra)\n")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nObservação encerrada.")
+
+def pop_option(args, flag): # Remove `flag ARQ` de `args` e devolve ARQ (None se a opção não foi passada).
+    if flag not in args:
+        return None
+    i = args.index(flag)
+    value = args[i + 1] if i + 1 < len(args) else None
+    del args[i:i + 2]
+    return value
+
+def main(): # Define a função principal do programa.
+    args = sys.argv[1:]
+    cache_file = pop_option(args, '--cache-decodificacao') # A cache de decodificação é lida e gravada em ARQ.
+    profile_file = pop_option(args, '--perfil') # Perfil por etapa (tempo, CPU, memória, contadores) em JSON.
+    cprofile_file = pop_option(args, '--cprofile') # Estatísticas do cProfile (abrir com pstats ou snakeviz).
+    machine_spec = pop_option(args, '--maquina') # Máquina pré-definida (classico, rv32m, profundo) ou descrição em JSON.
+    rename = '--renomear' in args # Renomeação de registradores antes da reordenação e do delayed branch.
+    if rename:
+        args.remove('--renomear')
+    dual_issue = '--superescalar' in args # Análise e escalonamento para emissão dupla (2 instruções por ciclo).
+    if dual_issue:
+        args.remove('--superescalar')
+    results_dir = pop_option(args, '--cache-resultados') # Resultados e escalonamentos de bloco reaproveitados entre execuções.
+    watch = '--observar' in args # Reanalisa o arquivo a cada alteração, até Ctrl+C.
+    if watch:
+        args.remove('--observar')
+    formats_spec = pop_option(args, '--formatos') # Formatos das saídas: texto, binario, jsonl, jsonl.gz (ou nenhum).
+    inputs_spec = pop_option(args, '--entradas') # Valores das leituras de inteiro (ecall 5), separados por vírgula.
+    # Permite especificar arquivo via linha de comando.
+    if args: # Se o arquivo de entrada foi passado na linha de comando.
+        input_file = args[0] # Usa o primeiro argumento como nome do arquivo de entrada.
+    else:
+        input_file = "teste5.hex" # Nome padrão do arquivo de entrada se nenhum for fornecido.
+    
+    if not os.path.exists(input_file): # Verifica se o arquivo de entrada existe.
+        print(f"Arquivo {input_file} não encontrado!") # Informa se o arquivo não foi encontrado.
+        return # Encerra o programa.
+    
+    try:
+        formats = parse_formats(formats_spec)
+    except ValueError as exc:
+        print(f"Formatos inválidos: {exc}")
+        return
+    try:
+        inputs = [int(value, 0) for value in inputs_spec.split(',') if value.strip()] if inputs_spec else []
+    except ValueError:
+        print(f"Entradas inválidas: {inputs_spec} (use valores inteiros separados por vírgula)")
+        return
+    machine = DEFAULT_MACHINE
+    if machine_spec:
+        try:
+            machine = load_machine(machine_spec)
+        except (OSError, ValueError, TypeError) as exc: # Nome desconhecido, arquivo ausente ou descrição inválida.
+            print(f"Máquina inválida: {exc}")
+            return
+    if cache_file:
+        DECODE_CACHE.load(cache_file) # Palavras já vistas em execuções anteriores não são decodificadas de novo.
+    cache = None
+    if results_dir:
+        cache = ResultCache(results_dir)
+        SCHEDULE_CACHE.load(cache.schedules_path)
+    profiler = PassProfiler() if profile_file else NO_PROFILER # Com perfil, as passadas rodam em série.
+    options = {'profiler': profiler, 'machine': machine, 'rename': rename, 'dual_issue': dual_issue, 'cache': cache, 'formats': formats,
+               'inputs': inputs}
+    if watch:
+        watch_file(input_file, **options)
+    elif cprofile_file:
+        import cProfile # Importado só quando pedido.
+        cprofiler = cProfile.Profile()
+        cprofiler.runcall(analyze_file, input_file, **options)
+        cprofiler.dump_stats(cprofile_file)
+        print(f"Estatísticas do cProfile gravadas em {cprofile_file}")
+    else:
+        analyze_file(input_file, **options) # Analisa o arquivo, gravando saídas e relatórios no diretório atual.
+    if cache is not None:
+        SCHEDULE_CACHE.save(cache.schedules_path)
+    if profile_file:
+        profiler.stop()
+        profiler.save(profile_file)
+        print(f"\n=== PERFIL POR ETAPA (gravado em {profile_file}) ===")
+        for line in profiler.summary_lines():
+            print(line)
+    if cache_file:
+        DECODE_CACHE.save(cache_file)
+        stats = DECODE_CACHE.stats()
+        print(f"Cache de decodificação: {stats['hits']} acertos, {stats['misses']} falhas, {stats['entries']} palavras em {cache_file}")
+
+if __name__ == "__main__": # Bloco padrão em Python: verifica se o script está sendo executado diretamente (não importado como módulo).
     main() # Chama a função principal.
\ No newline at end of file
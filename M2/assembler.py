@@ -0,0 +1,351 @@
+# Montador RV32I (com a extensão M) em duas passagens para os programas .asm do M2 e do M3.
+# 1ª passagem: separa rótulos, diretivas e instruções e calcula o endereço de cada item (tabela de símbolos).
+# 2ª passagem: resolve os rótulos e codifica as instruções em palavras de 32 bits.
+# O layout de memória segue o padrão do RARS: .text em 0x00400000 e .data em 0x10010000.
+from collections import namedtuple # Resultado imutável da montagem.
+
+TEXT_BASE = 0x00400000 # Endereço inicial do segmento de código.
+DATA_BASE = 0x10010000 # Endereço inicial do segmento de dados.
+
+# Programa montado: palavras do .text, bytes do .data, tabela de símbolos e, para cada palavra, a linha de origem no .asm.
+AssembledProgram = namedtuple('AssembledProgram', 'words data symbols lines text_base data_base')
+
+# Nomes ABI dos registradores (x0..x31 também são aceitos).
+REGISTER_NAMES = {
+    'zero': 0, 'ra': 1, 'sp': 2, 'gp': 3, 'tp': 4, 't0': 5, 't1': 6, 't2': 7, 's0': 8, 'fp': 8, 's1': 9,
+    'a0': 10, 'a1': 11, 'a2': 12, 'a3': 13, 'a4': 14, 'a5': 15, 'a6': 16, 'a7': 17,
+    's2': 18, 's3': 19, 's4': 20, 's5': 21, 's6': 22, 's7': 23, 's8': 24, 's9': 25, 's10': 26, 's11': 27,
+    't3': 28, 't4': 29, 't5': 30, 't6': 31,
+}
+
+# Mnemônico -> (funct7, funct3) das instruções tipo R (opcode 0110011), incluindo a extensão M.
+R_OPS = {
+    'add': (0x00, 0), 'sub': (0x20, 0), 'sll': (0x00, 1), 'slt': (0x00, 2), 'sltu': (0x00, 3),
+    'xor': (0x00, 4), 'srl': (0x00, 5), 'sra': (0x20, 5), 'or': (0x00, 6), 'and': (0x00, 7),
+    'mul': (0x01, 0), 'mulh': (0x01, 1), 'mulhsu': (0x01, 2), 'mulhu': (0x01, 3),
+    'div': (0x01, 4), 'divu': (0x01, 5), 'rem': (0x01, 6), 'remu': (0x01, 7),
+}
+I_ALU_OPS = {'addi': 0, 'slti': 2, 'sltiu': 3, 'xori': 4, 'ori': 6, 'andi': 7} # funct3 (opcode 0010011).
+SHIFT_OPS = {'slli': (0x00, 1), 'srli': (0x00, 5), 'srai': (0x20, 5)} # (funct7, funct3) dos deslocamentos com imediato.
+LOAD_OPS = {'lb': 0, 'lh': 1, 'lw': 2, 'lbu': 4, 'lhu': 5} # funct3 (opcode 0000011).
+STORE_OPS = {'sb': 0, 'sh': 1, 'sw': 2} # funct3 (opcode 0100011).
+BRANCH_OPS = {'beq': 0, 'bne': 1, 'blt': 4, 'bge': 5, 'bltu': 6, 'bgeu': 7} # funct3 (opcode 1100011).
+SWAPPED_BRANCHES = {'bgt': 'blt', 'ble': 'bge', 'bgtu': 'bltu', 'bleu': 'bgeu'} # Pseudo: troca rs1 e rs2.
+ZERO_BRANCHES = {'beqz': ('beq', False), 'bnez': ('bne', False), 'bltz': ('blt', False), 'bgez': ('bge', False),
+                 'bgtz': ('blt', True), 'blez': ('bge', True)} # Pseudo: compara com x0 (True = x0 como rs1).
+
+DATA_SIZES = {'.word': 4, '.half': 2, '.byte': 1} # Diretivas de dados numéricos e seus tamanhos.
+STRING_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', '\\': '\\', '"': '"', "'": "'"}
+
+def strip_comment(line): # Remove o comentário (#), ignorando '#' dentro de strings.
+    in_string = False
+    for i, ch in enumerate(line):
+        if ch == '"' and (i == 0 or line[i - 1] != '\\'):
+            in_string = not in_string
+        elif ch == '#' and not in_string:
+            return line[:i]
+    return line
+
+def split_operands(text): # Separa os operandos por vírgula, preservando strings.
+    operands, current, in_string = [], '', False
+    for i, ch in enumerate(text):
+        if ch == '"' and (i == 0 or text[i - 1] != '\\'):
+            in_string = not in_string
+        if ch == ',' and not in_string:
+            operands.append(current.strip())
+            current = ''
+        else:
+            current += ch
+    if current.strip():
+        operands.append(current.strip())
+    return operands
+
+def parse_string(literal, lineno): # Converte um literal "..." (com escapes) em bytes.
+    literal = literal.strip()
+    if len(literal) < 2 or literal[0] != '"' or literal[-1] != '"':
+        raise ValueError(f"linha {lineno}: string inválida {literal!r}")
+    chars, i, body = [], 0, literal[1:-1]
+    while i < len(body):
+        if body[i] == '\\' and i + 1 < len(body):
+            chars.append(STRING_ESCAPES.get(body[i + 1], body[i + 1]))
+            i += 2
+        else:
+            chars.append(body[i])
+            i += 1
+    return ''.join(chars).encode('utf-8') # Como o RARS, strings são gravadas em UTF-8 (acentos ocupam 2 bytes).
+
+def parse_register(token, lineno): # Converte 'a0', 'x10' etc. no número do registrador.
+    token = token.strip()
+    if token in REGISTER_NAMES:
+        return REGISTER_NAMES[token]
+    if token[:1] == 'x' and token[1:].isdigit() and int(token[1:]) < 32:
+        return int(token[1:])
+    raise ValueError(f"linha {lineno}: registrador inválido {token!r}")
+
+def parse_number(token): # Converte um imediato numérico (decimal, 0x.., 0b.., 'c'); None se não for número.
+    token = token.strip()
+    if len(token) == 3 and token[0] == token[2] == "'":
+        return ord(token[1])
+    try:
+        return int(token, 0)
+    except ValueError:
+        return None
+
+def resolve_value(token, symbols, lineno): # Imediato numérico ou endereço de um rótulo.
+    value = parse_number(token)
+    if value is not None:
+        return value
+    if token.strip() in symbols:
+        return symbols[token.strip()]
+    raise ValueError(f"linha {lineno}: símbolo indefinido {token.strip()!r}")
+
+def parse_memory_operand(token, lineno): # Converte 'imm(reg)' ou '(reg)' em (imediato, registrador).
+    token = token.strip()
+    if not token.endswith(')') or '(' not in token:
+        raise ValueError(f"linha {lineno}: operando de memória inválido {token!r}")
+    offset, reg = token[:-1].split('(', 1)
+    value = parse_number(offset) if offset.strip() else 0
+    if value is None:
+        raise ValueError(f"linha {lineno}: deslocamento inválido {offset!r}")
+    return value, parse_register(reg, lineno)
+
+def check_range(value, bits, lineno, signed=True): # Garante que o imediato cabe no campo da instrução.
+    low, high = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if signed else (0, (1 << bits) - 1)
+    if not low <= value <= high:
+        raise ValueError(f"linha {lineno}: imediato {value} fora do intervalo de {bits} bits")
+    return value
+
+# Codificação dos formatos (campos já validados).
+def encode_r(funct7, rs2, rs1, funct3, rd, opcode):
+    return (funct7 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+def encode_i(imm, rs1, funct3, rd, opcode):
+    return ((imm & 0xFFF) << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+def encode_s(imm, rs2, rs1, funct3, opcode):
+    return (((imm >> 5) & 0x7F) << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | ((imm & 0x1F) << 7) | opcode
+
+def encode_b(imm, rs2, rs1, funct3, opcode):
+    return (((imm >> 12) & 1) << 31) | (((imm >> 5) & 0x3F) << 25) | (rs2 << 20) | (rs1 << 15) | \
+           (funct3 << 12) | (((imm >> 1) & 0xF) << 8) | (((imm >> 11) & 1) << 7) | opcode
+
+def encode_u(imm, rd, opcode):
+    return ((imm & 0xFFFFF) << 12) | (rd << 7) | opcode
+
+def encode_j(imm, rd, opcode):
+    return (((imm >> 20) & 1) << 31) | (((imm >> 1) & 0x3FF) << 21) | (((imm >> 11) & 1) << 20) | \
+           (((imm >> 12) & 0xFF) << 12) | (rd << 7) | opcode
+
+def split_hi_lo(value): # Divide um valor de 32 bits em (parte alta p/ lui/auipc, parte baixa p/ addi).
+    lo = ((value & 0xFFF) ^ 0x800) - 0x800 # 12 bits com sinal.
+    hi = ((value - lo) >> 12) & 0xFFFFF
+    return hi, lo
+
+def instruction_size(mnemonic, operands, lineno): # Quantas palavras a instrução (ou pseudo) ocupa.
+    if mnemonic in ('la', 'call', 'tail'):
+        return 2 # auipc + addi/jalr
+    if mnemonic == 'li':
+        value = parse_number(operands[1]) if len(operands) == 2 else None
+        if value is None:
+            raise ValueError(f"linha {lineno}: li exige um imediato numérico")
+        return 1 if -2048 <= value <= 2047 else 2 # addi ou lui + addi
+    return 1
+
+def encode_instruction(mnemonic, ops, pc, symbols, lineno): # Codifica uma instrução (ou pseudo) em palavras.
+    """Retorna a lista de palavras de 32 bits da instrução no endereço `pc`"""
+    reg = lambda token: parse_register(token, lineno)
+    target = lambda token: resolve_value(token, symbols, lineno) - pc # Deslocamento relativo ao PC.
+
+    def expect(count):
+        if len(ops) != count:
+            raise ValueError(f"linha {lineno}: {mnemonic} espera {count} operandos")
+
+    if mnemonic in R_OPS:
+        expect(3)
+        funct7, funct3 = R_OPS[mnemonic]
+        return [encode_r(funct7, reg(ops[2]), reg(ops[1]), funct3, reg(ops[0]), 0x33)]
+    if mnemonic in I_ALU_OPS:
+        expect(3)
+        imm = check_range(resolve_value(ops[2], symbols, lineno), 12, lineno)
+        return [encode_i(imm, reg(ops[1]), I_ALU_OPS[mnemonic], reg(ops[0]), 0x13)]
+    if mnemonic in SHIFT_OPS:
+        expect(3)
+        funct7, funct3 = SHIFT_OPS[mnemonic]
+        shamt = check_range(resolve_value(ops[2], symbols, lineno), 5, lineno, signed=False)
+        return [encode_r(funct7, shamt, reg(ops[1]), funct3, reg(ops[0]), 0x13)]
+    if mnemonic in LOAD_OPS:
+        expect(2)
+        imm, base = parse_memory_operand(ops[1], lineno)
+        return [encode_i(check_range(imm, 12, lineno), base, LOAD_OPS[mnemonic], reg(ops[0]), 0x03)]
+    if mnemonic in STORE_OPS:
+        expect(2)
+        imm, base = parse_memory_operand(ops[1], lineno)
+        return [encode_s(check_range(imm, 12, lineno), reg(ops[0]), base, STORE_OPS[mnemonic], 0x23)]
+    if mnemonic in BRANCH_OPS or mnemonic in SWAPPED_BRANCHES:
+        expect(3)
+        rs1, rs2 = reg(ops[0]), reg(ops[1])
+        if mnemonic in SWAPPED_BRANCHES:
+            mnemonic, rs1, rs2 = SWAPPED_BRANCHES[mnemonic], rs2, rs1
+        offset = check_range(target(ops[2]), 13, lineno)
+        return [encode_b(offset, rs2, rs1, BRANCH_OPS[mnemonic], 0x63)]
+    if mnemonic in ZERO_BRANCHES:
+        expect(2)
+        base_op, zero_first = ZERO_BRANCHES[mnemonic]
+        rs1, rs2 = (0, reg(ops[0])) if zero_first else (reg(ops[0]), 0)
+        offset = check_range(target(ops[1]), 13, lineno)
+        return [encode_b(offset, rs2, rs1, BRANCH_OPS[base_op], 0x63)]
+    if mnemonic in ('lui', 'auipc'):
+        expect(2)
+        imm = check_range(resolve_value(ops[1], symbols, lineno), 20, lineno, signed=False)
+        return [encode_u(imm, reg(ops[0]), 0x37 if mnemonic == 'lui' else 0x17)]
+    if mnemonic == 'jal':
+        rd, label = (1, ops[0]) if len(ops) == 1 else (reg(ops[0]), ops[1]) # 'jal rotulo' usa ra.
+        return [encode_j(check_range(target(label), 21, lineno), rd, 0x6F)]
+    if mnemonic == 'jalr':
+        if len(ops) == 1: # jalr rs
+            return [encode_i(0, reg(ops[0]), 0, 1, 0x67)]
+        if len(ops) == 2: # jalr rd, imm(rs)
+            imm, base = parse_memory_operand(ops[1], lineno)
+            return [encode_i(check_range(imm, 12, lineno), base, 0, reg(ops[0]), 0x67)]
+        expect(3) # jalr rd, rs, imm
+        return [encode_i(check_range(resolve_value(ops[2], symbols, lineno), 12, lineno), reg(ops[1]), 0, reg(ops[0]), 0x67)]
+    if mnemonic == 'ecall':
+        return [0x00000073]
+    if mnemonic == 'ebreak':
+        return [0x00100073]
+
+    # Pseudo-instruções.
+    if mnemonic == 'nop':
+        return [encode_i(0, 0, 0, 0, 0x13)]
+    if mnemonic == 'mv':
+        expect(2)
+        return [encode_i(0, reg(ops[1]), 0, reg(ops[0]), 0x13)]
+    if mnemonic == 'not':
+        expect(2)
+        return [encode_i(-1, reg(ops[1]), 4, reg(ops[0]), 0x13)]
+    if mnemonic == 'neg':
+        expect(2)
+        return [encode_r(0x20, reg(ops[1]), 0, 0, reg(ops[0]), 0x33)]
+    if mnemonic == 'seqz':
+        expect(2)
+        return [encode_i(1, reg(ops[1]), 3, reg(ops[0]), 0x13)]
+    if mnemonic == 'snez':
+        expect(2)
+        return [encode_r(0x00, reg(ops[1]), 0, 3, reg(ops[0]), 0x33)]
+    if mnemonic == 'li':
+        expect(2)
+        rd, value = reg(ops[0]), parse_number(ops[1])
+        if -2048 <= value <= 2047:
+            return [encode_i(value, 0, 0, rd, 0x13)]
+        hi, lo = split_hi_lo(value & 0xFFFFFFFF)
+        return [encode_u(hi, rd, 0x37), encode_i(lo, rd, 0, rd, 0x13)]
+    if mnemonic == 'la':
+        expect(2)
+        rd = reg(ops[0])
+        hi, lo = split_hi_lo(target(ops[1]) & 0xFFFFFFFF)
+        return [encode_u(hi, rd, 0x17), encode_i(lo, rd, 0, rd, 0x13)] # auipc + addi, como no RARS.
+    if mnemonic in ('call', 'tail'):
+        expect(1)
+        rd = 1 if mnemonic == 'call' else 0
+        hi, lo = split_hi_lo(target(ops[0]) & 0xFFFFFFFF)
+        scratch = 1 if mnemonic == 'call' else 6 # ra ou t1 guardam o endereço intermediário.
+        return [encode_u(hi, scratch, 0x17), encode_i(lo, scratch, 0, rd, 0x67)]
+    if mnemonic == 'j':
+        expect(1)
+        return [encode_j(check_range(target(ops[0]), 21, lineno), 0, 0x6F)]
+    if mnemonic == 'jr':
+        expect(1)
+        return [encode_i(0, reg(ops[0]), 0, 0, 0x67)]
+    if mnemonic == 'ret':
+        return [encode_i(0, 1, 0, 0, 0x67)]
+    raise ValueError(f"linha {lineno}: instrução desconhecida {mnemonic!r}")
+
+def assemble(source, text_base=TEXT_BASE, data_base=DATA_BASE): # Monta o código-fonte (texto) de um programa.
+    """Monta um programa RV32I em duas passagens e retorna um AssembledProgram"""
+    symbols = {} # Rótulo -> endereço.
+    text_items = [] # (mnemônico, operandos, endereço, linha) das instruções.
+    data_items = [] # (diretiva, operandos, deslocamento no .data, linha).
+    pending_labels = [] # Rótulos do .data que recebem o endereço do próximo dado (já alinhado).
+    segment = 'text'
+    text_pc, data_size = text_base, 0
+
+    def bind_pending(): # Associa os rótulos pendentes do .data ao endereço atual.
+        for label in pending_labels:
+            symbols[label] = data_base + data_size
+        pending_labels.clear()
+
+    # 1ª passagem: endereços de rótulos, instruções e dados.
+    for lineno, raw_line in enumerate(source.splitlines(), 1):
+        line = strip_comment(raw_line).strip()
+        while line and ':' in line.split(None, 1)[0] and not line.startswith('"'): # Rótulos (possivelmente seguidos de código).
+            label, line = line.split(':', 1)
+            label, line = label.strip(), line.strip()
+            if label in symbols or label in pending_labels:
+                raise ValueError(f"linha {lineno}: rótulo duplicado {label!r}")
+            if segment == 'text':
+                symbols[label] = text_pc
+            else:
+                pending_labels.append(label)
+        if not line:
+            continue
+        parts = line.split(None, 1)
+        mnemonic = parts[0].lower()
+        operands = split_operands(parts[1]) if len(parts) > 1 else []
+
+        if mnemonic in ('.text', '.data'):
+            bind_pending()
+            segment = mnemonic[1:]
+        elif mnemonic in ('.globl', '.global', '.section'):
+            continue # Diretivas sem efeito no layout.
+        elif mnemonic.startswith('.'):
+            if segment != 'data':
+                raise ValueError(f"linha {lineno}: diretiva {mnemonic} fora do segmento .data")
+            if mnemonic in DATA_SIZES or mnemonic == '.align':
+                align = DATA_SIZES.get(mnemonic) or (1 << int(operands[0], 0))
+                padding = -data_size % align # Alinhamento natural (como no RARS).
+                if padding:
+                    data_items.append(('.space', [str(padding)], data_size, lineno))
+                    data_size += padding
+                if mnemonic == '.align':
+                    continue
+            bind_pending()
+            data_items.append((mnemonic, operands, data_size, lineno))
+            if mnemonic in DATA_SIZES:
+                data_size += DATA_SIZES[mnemonic] * len(operands)
+            elif mnemonic in ('.asciz', '.string', '.ascii'):
+                for literal in operands:
+                    data_size += len(parse_string(literal, lineno)) + (mnemonic != '.ascii')
+            elif mnemonic == '.space':
+                data_size += int(operands[0], 0)
+            else:
+                raise ValueError(f"linha {lineno}: diretiva desconhecida {mnemonic}")
+        else:
+            if segment != 'text':
+                raise ValueError(f"linha {lineno}: instrução {mnemonic} fora do segmento .text")
+            text_items.append((mnemonic, operands, text_pc, lineno))
+            text_pc += 4 * instruction_size(mnemonic, operands, lineno)
+    bind_pending()
+
+    # 2ª passagem: codificação com todos os rótulos conhecidos.
+    words, lines = [], []
+    for mnemonic, operands, pc, lineno in text_items:
+        encoded = encode_instruction(mnemonic, operands, pc, symbols, lineno)
+        words.extend(encoded)
+        lines.extend([lineno] * len(encoded))
+    data = bytearray(data_size)
+    for directive, operands, offset, lineno in data_items:
+        if directive in DATA_SIZES:
+            size = DATA_SIZES[directive]
+            for k, token in enumerate(operands):
+                value = resolve_value(token, symbols, lineno) & ((1 << (8 * size)) - 1)
+                data[offset + k * size:offset + (k + 1) * size] = value.to_bytes(size, 'little')
+        elif directive in ('.asciz', '.string', '.ascii'):
+            for literal in operands:
+                encoded = parse_string(literal, lineno) + (b'\0' if directive != '.ascii' else b'')
+                data[offset:offset + len(encoded)] = encoded
+                offset += len(encoded)
+    return AssembledProgram(words, bytes(data), symbols, lines, text_base, data_base)
+
+def assemble_file(path, text_base=TEXT_BASE, data_base=DATA_BASE): # Monta um arquivo .asm.
+    with open(path, encoding='latin-1') as f: # Os fontes do repositório usam latin-1 nos comentários.
+        return assemble(f.read(), text_base, data_base)
@@ -0,0 +1,121 @@
+import os # Importa o módulo 'os' para montar caminhos e criar os diretórios de saída.
+import sys # Importa o módulo 'sys' para o código de saída do programa.
+import csv # Importa o módulo 'csv' para gravar o resumo agregado em planilha.
+import json # Importa o módulo 'json' para gravar o resumo agregado em formato estruturado.
+import glob # Importa o módulo 'glob' para expandir padrões como 'testes/*.hex'.
+import argparse # Importa o módulo 'argparse' para ler as opções da linha de comando.
+from concurrent.futures import ProcessPoolExecutor # Pool de processos: cada arquivo é analisado em um processo.
+
+from app2 import analyze_file, DECODE_CACHE, SCHEDULE_CACHE # Reaproveita a análise completa (detecções e técnicas 3 a 9) de um arquivo.
+from result_cache import ResultCache # Resultados gravados por execuções anteriores (--cache-resultados).
+from output_writer import DEFAULT_FORMATS, parse_formats # Formatos das saídas de cada arquivo (--formatos).
+
+INPUT_EXTENSIONS = ('.hex', '.bin', '.elf', '.asm') # Formatos aceitos por read_instructions (o formato é detectado automaticamente).
+
+def find_inputs(target): # Define uma função que lista os programas de um diretório ou de um padrão glob.
+    """Expande um diretório (todos os .hex/.bin/.elf/.asm, recursivamente) ou um padrão glob em uma lista ordenada de arquivos"""
+    if os.path.isdir(target):
+        paths = []
+        for extension in INPUT_EXTENSIONS:
+            paths.extend(glob.glob(os.path.join(target, '**', '*' + extension), recursive=True))
+    else:
+        paths = glob.glob(target, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+def output_dirs_for(inputs, output_root): # Define uma função que escolhe um diretório de saída exclusivo para cada entrada.
+    """Usa o nome do arquivo sem extensão; nomes repetidos recebem um sufixo numérico"""
+    used = {}
+    dirs = []
+    for path in inputs:
+        name = os.path.splitext(os.path.basename(path))[0]
+        used[name] = used.get(name, 0) + 1
+        if used[name] > 1: # Mesmo nome em diretórios diferentes: evita que uma análise sobrescreva a outra.
+            name = f"{name}_{used[name]}"
+        dirs.append(os.path.join(output_root, name))
+    return dirs
+
+worker_cache = None # Cache de resultados do processo (ResultCache), quando pedida.
+
+def init_worker(cache_file, results_dir=None): # Inicializador de cada processo do pool: carrega as caches gravadas.
+    global worker_cache
+    if cache_file:
+        DECODE_CACHE.load(cache_file)
+    if results_dir:
+        worker_cache = ResultCache(results_dir)
+        SCHEDULE_CACHE.load(worker_cache.schedules_path)
+
+def analyze_one(job): # Executada em um processo do pool: analisa um arquivo sem imprimir o relatório.
+    """Retorna o resumo do arquivo, as palavras decodificadas e os blocos escalonados pela primeira vez neste processo"""
+    input_file, output_dir, formats = job
+    try:
+        summary = analyze_file(input_file, output_dir, parallel=False, verbose=False, cache=worker_cache, formats=formats) # Sem pool aninhado dentro do worker.
+        summary['output_dir'] = output_dir
+        summary['error'] = ''
+    except (OSError, ValueError) as exc: # Arquivo ilegível ou com linha que não é hexadecimal: registra e segue o lote.
+        summary = {'file': input_file, 'output_dir': output_dir, 'error': str(exc)}
+    schedules = SCHEDULE_CACHE.take_new_entries() # Só interessam ao principal quando a cache é gravada.
+    return summary, DECODE_CACHE.take_new_entries(), schedules if worker_cache is not None else {}
+
+def write_summary(output_root, summaries): # Define uma função que grava o resumo agregado em CSV e JSON.
+    fields = []
+    for summary in summaries: # Colunas na ordem em que aparecem (arquivos com erro têm menos colunas).
+        for key in summary:
+            if key not in fields:
+                fields.append(key)
+    with open(os.path.join(output_root, 'resumo.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(summaries)
+    with open(os.path.join(output_root, 'resumo.json'), 'w') as f:
+        json.dump(summaries, f, indent=2, ensure_ascii=False)
+
+def main(): # Define a função principal do modo em lote.
+    parser = argparse.ArgumentParser(description="Analisa em paralelo todos os programas de um diretório ou padrão glob.")
+    parser.add_argument('entrada', help="diretório (busca recursiva por .hex/.bin/.elf/.asm) ou padrão glob, ex.: 'testes/*.hex'")
+    parser.add_argument('--saida', default='resultados', help="diretório raiz das saídas (padrão: resultados)")
+    parser.add_argument('--processos', type=int, default=None, help="número de processos (padrão: número de CPUs)")
+    parser.add_argument('--cache-decodificacao', help="arquivo da cache de decodificação, lido no início e gravado no fim")
+    parser.add_argument('--formatos', default=','.join(DEFAULT_FORMATS),
+                        help="formatos das saídas de cada arquivo: texto, binario, jsonl, jsonl.gz, separados por vírgula, ou nenhum (só o resumo)")
+    parser.add_argument('--cache-resultados', help="diretório da cache de resultados: programas já analisados com as mesmas opções não são recalculados")
+    args = parser.parse_args()
+    try:
+        formats = parse_formats(args.formatos)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    inputs = find_inputs(args.entrada)
+    if not inputs:
+        print(f"Nenhum programa encontrado em {args.entrada}!")
+        return 1
+    os.makedirs(args.saida, exist_ok=True)
+    jobs = [(path, output_dir, formats) for path, output_dir in zip(inputs, output_dirs_for(inputs, args.saida))]
+
+    print(f"Analisando {len(jobs)} arquivo(s)...")
+    cache_file = args.cache_decodificacao
+    if cache_file:
+        DECODE_CACHE.load(cache_file)
+    summaries = []
+    results_dir = args.cache_resultados
+    if results_dir:
+        SCHEDULE_CACHE.load(ResultCache(results_dir).schedules_path)
+    with ProcessPoolExecutor(max_workers=args.processos, initializer=init_worker, initargs=(cache_file, results_dir)) as pool:
+        # chunksize agrupa arquivos por envio, reduzindo a comunicação entre processos em lotes com milhares de programas.
+        for summary, new_entries, new_schedules in pool.map(analyze_one, jobs, chunksize=max(1, len(jobs) // 64)):
+            summaries.append(summary)
+            DECODE_CACHE.update(new_entries) # Palavras novas de cada processo voltam para a cache gravada.
+            SCHEDULE_CACHE.update(new_schedules) # Assim como os blocos escalonados.
+    if cache_file:
+        DECODE_CACHE.save(cache_file)
+    if results_dir:
+        SCHEDULE_CACHE.save(ResultCache(results_dir).schedules_path)
+
+    write_summary(args.saida, summaries)
+    failures = [s for s in summaries if s['error']]
+    for summary in failures:
+        print(f"Erro em {summary['file']}: {summary['error']}")
+    print(f"Resumo gravado em {os.path.join(args.saida, 'resumo.csv')} e {os.path.join(args.saida, 'resumo.json')}")
+    return 1 if failures else 0
+
+if __name__ == "__main__": # Executa o modo em lote quando o script é chamado diretamente.
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# Benchmark das detecções e técnicas do M2 sobre programas sintéticos de 1e3 a 1e6 instruções.
+# Para cada tamanho mede o tempo (de parede e de CPU) e o pico de memória de cada passada e grava tudo em JSON;
+# com --comparar, confronta o resultado com um JSON anterior e acusa as passadas que ficaram mais lentas.
+import sys # Código de saída do programa.
+import json # Formato dos resultados.
+import time # Cronômetros.
+import platform # Identificação da máquina nos metadados.
+import argparse # Interface de linha de comando.
+import tracemalloc # Pico de memória alocada por passada.
+
+from app2 import PIPELINE_PASSES, DECODE_CACHE, SCHEDULE_CACHE, handle_delayed_branch, validate_stream
+from cfg import build_cfg
+from machine import DEFAULT_MACHINE, load_machine
+from workload import generate_program
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+MIN_COMPARABLE_SECONDS = 0.05 # Abaixo disto a medição é dominada por ruído e não entra na comparação.
+
+def output_size(result): # Instruções (ou conflitos) produzidas por uma passada; None para relatórios em dicionário.
+    if isinstance(result, tuple):
+        return len(result[0])
+    if isinstance(result, list):
+        return len(result)
+    return None
+
+def measure(func, repeat=1, trace_memory=True, setup=None): # Executa `func` e mede o tempo (melhor de `repeat`) e o pico de memória.
+    """Retorna (resultado, segundos de parede, segundos de CPU, pico de memória em bytes ou None)"""
+    # `setup` roda (fora da medição) antes de cada execução, ex.: para esvaziar caches que a repetição reaproveitaria.
+    best_wall = best_cpu = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = func()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        if best_wall is None or wall < best_wall:
+            best_wall, best_cpu = wall, cpu
+    peak = None
+    if trace_memory: # Execução separada: o tracemalloc deixa o código bem mais lento e distorceria o tempo.
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, best_wall, best_cpu, peak
+
+def run_benchmark(sizes=DEFAULT_SIZES, seed=0, passes=None, repeat=1, trace_memory=True, verbose=True, machine=DEFAULT_MACHINE, **workload):
+    """Mede cada passada (e a técnica 9) em programas sintéticos dos tamanhos pedidos, na máquina `machine`"""
+    # A saída da técnica 9 também é validada (fora da medição): a linha 'combined' guarda as leituras de valor
+    # desatualizado em 'stale_reads', que devem ser zero.
+    passes = list(PIPELINE_PASSES) if passes is None else passes
+    results = []
+    for size in sizes:
+        words = generate_program(size, seed, **workload)
+        instructions, wall, cpu, peak = measure(lambda: [DECODE_CACHE.decode(word) for word in words], repeat, trace_memory)
+        rows = [('decode', size, wall, cpu, peak)]
+        outputs = {}
+        for name in passes:
+            func, kwargs = PIPELINE_PASSES[name]
+            # Sem os escalonamentos de bloco de outras passadas ou repetições: mede o escalonamento de fato.
+            outputs[name], wall, cpu, peak = measure(lambda: func(instructions, machine=machine, **kwargs), repeat, trace_memory,
+                                                     SCHEDULE_CACHE.clear)
+            rows.append((name, output_size(outputs[name]), wall, cpu, peak))
+        if 'reord_cf' in outputs: # Técnica 9: delayed branch sobre a reordenação com forwarding.
+            reordered = outputs['reord_cf'][0]
+            combined, wall, cpu, peak = measure(lambda: handle_delayed_branch(reordered, forwarding=True, machine=machine), repeat, trace_memory)
+            rows.append(('combined', output_size(combined), wall, cpu, peak))
+            stale = len(validate_stream(combined[0], True, machine.delay_slots, machine, build_cfg(instructions)))
+        for name, produced, wall, cpu, peak in rows:
+            results.append({'instructions': size, 'pass': name, 'output': produced,
+                            'wall_seconds': wall, 'cpu_seconds': cpu, 'peak_bytes': peak})
+            if name == 'combined':
+                results[-1]['stale_reads'] = stale
+            if verbose:
+                memory = f", pico {peak / 1e6:.1f} MB" if peak is not None else ""
+                check = "" if name != 'combined' else " | validação: OK" if not stale else f" | validação: {stale} leitura(s) de valor desatualizado"
+                print(f"{size:>8} instruções | {name:<12} {wall:9.4f} s (CPU {cpu:9.4f} s){memory}{check}")
+    return results
+
+def compare(current, previous, tolerance=0.25): # Passadas que ficaram mais lentas que o resultado anterior.
+    """Lista de (tamanho, passada, segundos antes, segundos agora) com piora acima de `tolerance`"""
+    before = {(row['instructions'], row['pass']): row['wall_seconds'] for row in previous}
+    slower = []
+    for row in current:
+        old = before.get((row['instructions'], row['pass']))
+        if old is None or old < MIN_COMPARABLE_SECONDS:
+            continue
+        if row['wall_seconds'] > old * (1 + tolerance):
+            slower.append((row['instructions'], row['pass'], old, row['wall_seconds']))
+    return slower
+
+def main(argv=None): # Executa o benchmark e grava o JSON.
+    parser = argparse.ArgumentParser(description="Mede o tempo e a memória das passadas do M2 em programas sintéticos.")
+    parser.add_argument('--tamanhos', default=','.join(map(str, DEFAULT_SIZES)), help="quantidades de instruções, separadas por vírgula")
+    parser.add_argument('--passadas', help=f"passadas a medir, separadas por vírgula (padrão: todas: {', '.join(PIPELINE_PASSES)})")
+    parser.add_argument('--semente', type=int, default=0, help="semente do gerador de programas")
+    parser.add_argument('--dependencias', type=float, default=0.5, help="probabilidade de ler um destino recente")
+    parser.add_argument('--loads', type=float, default=0.2, help="fração de loads")
+    parser.add_argument('--stores', type=float, default=0.1, help="fração de stores")
+    parser.add_argument('--desvios', type=float, default=0.1, help="fração de branches/jumps")
+    parser.add_argument('--maquina', default='classico', help="máquina (classico, rv32m, profundo) ou descrição em .json")
+    parser.add_argument('--repeticoes', type=int, default=1, help="execuções por passada (fica o melhor tempo)")
+    parser.add_argument('--sem-memoria', action='store_true', help="não mede o pico de memória (evita a execução extra com tracemalloc)")
+    parser.add_argument('--saida', default='benchmark.json', help="arquivo JSON com os resultados")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para detectar regressões de desempenho")
+    parser.add_argument('--tolerancia', type=float, default=0.25, help="piora relativa aceita na comparação (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    passes = args.passadas.split(',') if args.passadas else None
+    unknown = [name for name in passes or () if name not in PIPELINE_PASSES]
+    if unknown:
+        parser.error(f"passada(s) desconhecida(s): {', '.join(unknown)}")
+    try:
+        machine = load_machine(args.maquina)
+    except (OSError, ValueError, TypeError) as exc:
+        parser.error(f"máquina inválida: {exc}")
+    sizes = [int(size) for size in args.tamanhos.split(',')]
+    workload = {'dependency_density': args.dependencias, 'load_ratio': args.loads,
+                'store_ratio': args.stores, 'branch_frequency': args.desvios}
+    results = run_benchmark(sizes, args.semente, passes, args.repeticoes, not args.sem_memoria, machine=machine, **workload)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'seed': args.semente,
+        'workload': workload,
+        'pipeline': machine.to_dict(), # Máquina simulada; 'machine' continua identificando o computador das medições.
+        'results': results,
+    }
+    with open(args.saida, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados gravados em {args.saida}")
+
+    invalid = [row for row in results if row.get('stale_reads')]
+    for row in invalid: # A técnica 9 deixou conflitos sem tratamento: é um erro do escalonador, não de desempenho.
+        print(f"FALHA: técnica 9 com {row['instructions']} instruções: {row['stale_reads']} leitura(s) de valor desatualizado")
+    if invalid:
+        return 1
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            previous = json.load(f)['results']
+        slower = compare(results, previous, args.tolerancia)
+        for size, name, old, new in slower:
+            print(f"REGRESSÃO: {name} com {size} instruções: {old:.4f} s -> {new:.4f} s ({new / old:.2f}x)")
+        if slower:
+            return 1
+        print(f"Nenhuma passada ficou mais de {args.tolerancia:.0%} mais lenta que em {args.comparar}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# Modelos de predição de desvios, alternativa às técnicas 7 (NOP após desvio) e 8 (delayed branch).
+# São alimentados pelo trace dinâmico do interpretador (resultado real de cada desvio executado) e contam os erros
+# de predição e os ciclos perdidos com o descarte das instruções buscadas no caminho errado.
+# Desvios condicionais usam um preditor de direção; jal/jalr usam um BTB (sem BTB, a busca segue sequencial e erra sempre).
+from machine import DEFAULT_MACHINE # Ciclos perdidos por erro: a penalidade de desvio da máquina analisada.
+
+OPCODE_BRANCH = 0x63 # Desvios condicionais (beq, bne, ...).
+PREDICTOR_ENTRIES = 1024 # Entradas das tabelas de preditores e do BTB (potência de 2).
+GSHARE_HISTORY_BITS = 10 # Bits de histórico global do gshare.
+
+class StaticNotTaken: # Estático: prevê sempre não tomado.
+    def predict(self, pc, backward):
+        return False
+
+    def update(self, pc, taken):
+        pass
+
+class BackwardTakenForwardNot: # Estático BTFN: desvios para trás (laços) tomados, para frente não tomados.
+    def predict(self, pc, backward):
+        return backward
+
+    def update(self, pc, taken):
+        pass
+
+class OneBitPredictor: # Dinâmico: repete o último resultado de cada desvio.
+    def __init__(self, entries=PREDICTOR_ENTRIES):
+        self.mask = entries - 1
+        self.table = [False] * entries
+
+    def predict(self, pc, backward):
+        return self.table[(pc >> 2) & self.mask]
+
+    def update(self, pc, taken):
+        self.table[(pc >> 2) & self.mask] = taken
+
+class TwoBitPredictor: # Dinâmico: contador saturado de 2 bits (0-1 não tomado, 2-3 tomado).
+    def __init__(self, entries=PREDICTOR_ENTRIES):
+        self.mask = entries - 1
+        self.counters = [1] * entries # Começa em "fracamente não tomado".
+
+    def predict(self, pc, backward):
+        return self.counters[(pc >> 2) & self.mask] >= 2
+
+    def update(self, pc, taken):
+        i = (pc >> 2) & self.mask
+        self.counters[i] = min(3, self.counters[i] + 1) if taken else max(0, self.counters[i] - 1)
+
+class GsharePredictor: # Dinâmico: contadores de 2 bits indexados por PC XOR histórico global.
+    def __init__(self, entries=PREDICTOR_ENTRIES, history_bits=GSHARE_HISTORY_BITS):
+        self.mask = entries - 1
+        self.history_mask = (1 << history_bits) - 1
+        self.history = 0
+        self.counters = [1] * entries
+
+    def index(self, pc):
+        return ((pc >> 2) ^ self.history) & self.mask
+
+    def predict(self, pc, backward):
+        return self.counters[self.index(pc)] >= 2
+
+    def update(self, pc, taken):
+        i = self.index(pc)
+        self.counters[i] = min(3, self.counters[i] + 1) if taken else max(0, self.counters[i] - 1)
+        self.history = ((self.history << 1) | taken) & self.history_mask
+
+class BranchTargetBuffer: # BTB de mapeamento direto: PC do salto -> último destino.
+    def __init__(self, entries=PREDICTOR_ENTRIES):
+        self.mask = entries - 1
+        self.tags = [None] * entries
+        self.targets = [0] * entries
+
+    def lookup(self, pc): # Destino previsto (None se o PC não está no BTB).
+        i = (pc >> 2) & self.mask
+        return self.targets[i] if self.tags[i] == pc else None
+
+    def update(self, pc, target):
+        i = (pc >> 2) & self.mask
+        self.tags[i] = pc
+        self.targets[i] = target
+
+# Preditores de direção disponíveis: nome no relatório -> classe.
+PREDICTORS = {
+    'Estático não tomado': StaticNotTaken,
+    'Estático BTFN': BackwardTakenForwardNot,
+    'Dinâmico 1 bit': OneBitPredictor,
+    'Dinâmico 2 bits': TwoBitPredictor,
+    'gshare': GsharePredictor,
+}
+
+def simulate_predictor(predictor, trace, words, text_base, btb=None, machine=DEFAULT_MACHINE):
+    """Reproduz o trace dinâmico no preditor e retorna os erros de predição e os ciclos de flush"""
+    penalty = machine.branch_penalty # Ciclos buscados no caminho errado até o desvio ser resolvido.
+    indices, outcomes = trace.indices, trace.taken
+    last = len(indices) - 1
+    branches = branch_misses = jumps = jump_misses = 0
+    for k, taken in enumerate(outcomes):
+        if taken < 0: # Não é instrução de controle.
+            continue
+        index = indices[k]
+        word = words[index]
+        pc = text_base + 4 * index
+        if word & 0x7F == OPCODE_BRANCH: # Condicional: preditor de direção.
+            branches += 1
+            backward = bool(word >> 31) # Bit de sinal do deslocamento: destino antes do desvio.
+            if predictor.predict(pc, backward) != bool(taken):
+                branch_misses += 1
+            predictor.update(pc, bool(taken))
+        else: # jal/jalr: destino previsto pelo BTB.
+            jumps += 1
+            target = text_base + 4 * indices[k + 1] if k < last else None
+            if btb is None or btb.lookup(pc) != target:
+                jump_misses += 1
+            if btb is not None:
+                btb.update(pc, target)
+    misses = branch_misses + jump_misses
+    return {
+        'branches': branches,
+        'branch_mispredictions': branch_misses,
+        'misprediction_rate': branch_misses / branches if branches else 0.0,
+        'jumps': jumps,
+        'jump_mispredictions': jump_misses,
+        'flushes': misses,
+        'flush_cycles': misses * penalty,
+    }
+
+def predictor_report(trace, words, text_base, use_btb=True, machine=DEFAULT_MACHINE): # Todos os preditores sobre o mesmo trace.
+    return {name: simulate_predictor(factory(), trace, words, text_base,
+                                     BranchTargetBuffer() if use_btb else None, machine)
+            for name, factory in PREDICTORS.items()}
+
+def predictor_lines(report, use_btb=True): # Uma linha de relatório por preditor (interpretador e app2).
+    suffix = " + BTB" if use_btb else ""
+    if not any(stats['branches'] for stats in report.values()): # Sem desvios condicionais, uma taxa de 0% enganaria.
+        return ["Aviso: nenhum desvio condicional executado; as taxas de erro dos preditores não foram avaliadas."]
+    return [f"{name}{suffix}: erro em {stats['misprediction_rate']:.1%} dos desvios condicionais "
+            f"({stats['branch_mispredictions']}/{stats['branches']}), jal/jalr errados: "
+            f"{stats['jump_mispredictions']}/{stats['jumps']}, flushes: {stats['flushes']} ({stats['flush_cycles']} ciclos perdidos)"
+            for name, stats in report.items()]
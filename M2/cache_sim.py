@@ -0,0 +1,150 @@
+# Simulador de cache de dados configurável, alimentado pelos loads/stores do trace dinâmico do interpretador.
+# Compara as duas versões das rotinas do M3 (linha-coluna e coluna-linha) para cada ordem de matriz (1 a 10):
+# taxa de acerto, falhas por tipo (compulsórias, de capacidade e de conflito) e tempo médio de acesso (AMAT).
+import os # Caminho padrão do programa do M3.
+import sys # Parâmetros da linha de comando.
+import random # Substituição aleatória (com semente fixa, para resultados reproduzíveis).
+import argparse # Interface de linha de comando.
+from collections import OrderedDict # Cache totalmente associativa de referência (classificação dos 3 Cs).
+
+from interpreter import load_program, run_program, NO_ADDRESS # Execução do programa e trace de endereços.
+
+OPCODE_STORE = 0x23 # sw, sh, sb
+REPLACEMENT_POLICIES = ('LRU', 'FIFO', 'random')
+WRITE_POLICIES = ('write-back', 'write-through')
+M3_PROGRAM = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'M3', 'codigoGuilhermePedroKonsViniciusPereira.asm')
+TRAVERSALS = {0: 'linha-coluna', 1: 'coluna-linha'} # Resposta do M3 à pergunta de ordem de leitura -> nome.
+
+class Cache: # Cache de dados associativa por conjunto.
+    """Cache com tamanho, linha, associatividade, substituição e política de escrita configuráveis"""
+
+    def __init__(self, size=512, line_size=16, associativity=2, replacement='LRU', write_policy='write-back', seed=0):
+        if replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f"política de substituição inválida: {replacement}")
+        if write_policy not in WRITE_POLICIES:
+            raise ValueError(f"política de escrita inválida: {write_policy}")
+        lines = size // line_size
+        if lines == 0 or lines % associativity:
+            raise ValueError("o tamanho deve ser múltiplo de linha x associatividade")
+        self.line_size = line_size
+        self.associativity = associativity
+        self.num_sets = lines // associativity
+        self.replacement = replacement
+        self.write_back = write_policy == 'write-back' # Write-back com write-allocate; write-through sem write-allocate.
+        self.sets = [dict() for _ in range(self.num_sets)] # Conjunto -> {tag: sujo}, na ordem de substituição.
+        self.rng = random.Random(seed)
+        self.seen = set() # Blocos já acessados (falhas compulsórias).
+        self.shadow = OrderedDict() # Cache totalmente associativa LRU de mesma capacidade (falhas de capacidade).
+        self.shadow_lines = lines
+        self.accesses = self.hits = 0
+        self.compulsory = self.capacity = self.conflict = 0
+        self.writebacks = 0 # Linhas sujas gravadas na memória ao serem substituídas.
+        self.memory_writes = 0 # Escritas propagadas direto à memória (write-through).
+
+    def access(self, address, is_store=False): # Acessa um endereço; retorna True em caso de acerto.
+        block = address // self.line_size
+        index, tag = block % self.num_sets, block // self.num_sets
+        ways = self.sets[index]
+        self.accesses += 1
+
+        shadow_hit = block in self.shadow # Cache de referência: atualiza sempre, como LRU.
+        if shadow_hit:
+            self.shadow.move_to_end(block)
+        else:
+            self.shadow[block] = True
+            if len(self.shadow) > self.shadow_lines:
+                self.shadow.popitem(last=False)
+
+        if not self.write_back and is_store:
+            self.memory_writes += 1 # Write-through: toda escrita chega à memória.
+        if tag in ways:
+            self.hits += 1
+            if self.replacement == 'LRU': # Move para o fim (mais recente).
+                ways[tag] = ways.pop(tag)
+            if is_store and self.write_back:
+                ways[tag] = True
+            return True
+
+        # Falha: classificação dos 3 Cs.
+        if block not in self.seen:
+            self.compulsory += 1
+        elif not shadow_hit:
+            self.capacity += 1
+        else:
+            self.conflict += 1
+        self.seen.add(block)
+
+        if is_store and not self.write_back:
+            return False # Sem write-allocate: a linha não é trazida para a cache.
+        if len(ways) >= self.associativity: # Conjunto cheio: escolhe a vítima.
+            victim = self.rng.choice(list(ways)) if self.replacement == 'random' else next(iter(ways))
+            if ways.pop(victim):
+                self.writebacks += 1
+        ways[tag] = is_store and self.write_back
+        return False
+
+    def stats(self, hit_time=1, miss_penalty=100): # Resumo numérico da simulação.
+        misses = self.accesses - self.hits
+        miss_rate = misses / self.accesses if self.accesses else 0.0
+        return {
+            'accesses': self.accesses,
+            'hits': self.hits,
+            'misses': misses,
+            'hit_rate': 1.0 - miss_rate if self.accesses else 0.0,
+            'compulsory': self.compulsory,
+            'capacity': self.capacity,
+            'conflict': self.conflict,
+            'writebacks': self.writebacks,
+            'memory_writes': self.memory_writes,
+            'amat': hit_time + miss_rate * miss_penalty, # Tempo médio de acesso, em ciclos.
+        }
+
+def memory_accesses(trace, words): # (endereço, é escrita) de cada load/store do trace dinâmico.
+    for index, address in zip(trace.indices, trace.addresses):
+        if address != NO_ADDRESS:
+            yield address, words[index] & 0x7F == OPCODE_STORE
+
+def simulate_cache(trace, words, hit_time=1, miss_penalty=100, **config): # Passa o trace por uma cache nova.
+    cache = Cache(**config)
+    for address, is_store in memory_accesses(trace, words):
+        cache.access(address, is_store)
+    return cache.stats(hit_time, miss_penalty)
+
+def traversal_report(program_path=M3_PROGRAM, orders=range(1, 11), hit_time=1, miss_penalty=100, **config):
+    """Executa o programa do M3 para cada ordem de leitura e ordem de matriz e simula a cache"""
+    words, data, text_base, data_base = load_program(program_path)
+    report = {}
+    for choice, name in TRAVERSALS.items():
+        for order in orders:
+            _, trace = run_program(words, data, text_base, data_base, inputs=(choice, order))
+            report[(name, order)] = simulate_cache(trace, words, hit_time, miss_penalty, **config)
+    return report
+
+def main(argv=None): # Imprime a comparação linha-coluna x coluna-linha.
+    parser = argparse.ArgumentParser(description="Simula uma cache de dados sobre as rotinas de matriz do M3.")
+    parser.add_argument('programa', nargs='?', default=M3_PROGRAM, help="programa do M3 (.asm)")
+    parser.add_argument('--tamanho', type=int, default=512, help="capacidade em bytes")
+    parser.add_argument('--linha', type=int, default=16, help="tamanho da linha em bytes")
+    parser.add_argument('--associatividade', type=int, default=2, help="vias por conjunto")
+    parser.add_argument('--substituicao', choices=REPLACEMENT_POLICIES, default='LRU')
+    parser.add_argument('--escrita', choices=WRITE_POLICIES, default='write-back')
+    parser.add_argument('--tempo-acerto', type=float, default=1, help="ciclos de um acerto")
+    parser.add_argument('--penalidade', type=float, default=100, help="ciclos extras de uma falha")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.programa):
+        print(f"Arquivo {args.programa} não encontrado!")
+        return 1
+    report = traversal_report(args.programa, hit_time=args.tempo_acerto, miss_penalty=args.penalidade,
+                              size=args.tamanho, line_size=args.linha, associativity=args.associatividade,
+                              replacement=args.substituicao, write_policy=args.escrita)
+    print(f"=== CACHE DE DADOS: {args.tamanho} B, linha de {args.linha} B, {args.associatividade} via(s), "
+          f"{args.substituicao}, {args.escrita} ===")
+    for (name, order), stats in report.items():
+        print(f"{name} ordem {order:2d}: acessos {stats['accesses']:4d}, acerto {stats['hit_rate']:.1%}, "
+              f"falhas {stats['misses']} (compulsórias {stats['compulsory']}, capacidade {stats['capacity']}, "
+              f"conflito {stats['conflict']}), AMAT {stats['amat']:.2f} ciclos")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# Grafo de fluxo de controle (CFG) do programa: blocos básicos, sucessores e realocação de desvios.
+# Um bloco começa no início do programa, em todo alvo de desvio/salto e após cada instrução de controle ou ecall;
+# termina antes do próximo início. As técnicas do M2 reordenam só dentro de um bloco, e os deslocamentos de
+# branches, jal e pares auipc (la, call) são recalculados depois que NOPs são inseridos ou instruções são movidas.
+# Usa apenas a palavra de cada instrução (campo `word`), sem depender do app2.
+from collections import namedtuple # Registro imutável de cada bloco.
+
+OPCODE_LOAD = 0x03   # lw, lh, lb...
+OPCODE_OP_IMM = 0x13 # addi, ...
+OPCODE_AUIPC = 0x17  # auipc
+OPCODE_STORE = 0x23  # sw, sh, sb
+OPCODE_BRANCH = 0x63 # beq, bne...
+OPCODE_JALR = 0x67   # jalr
+OPCODE_JAL = 0x6F    # jal
+OPCODE_SYSTEM = 0x73 # ecall/ebreak
+TERMINATORS = (OPCODE_BRANCH, OPCODE_JAL, OPCODE_JALR, OPCODE_SYSTEM) # Encerram um bloco.
+
+BRANCH_RANGE = 1 << 12 # Alcance (em bytes, com sinal) do deslocamento de 13 bits dos branches.
+JAL_RANGE = 1 << 20 # Alcance do deslocamento de 21 bits do jal.
+IMM12_RANGE = 1 << 11 # Alcance do imediato de 12 bits (addi, loads, stores, jalr).
+NOP_WORD = 0x00000013 # addi x0, x0, 0
+
+# Bloco básico: instruções [start, end) e índices dos blocos sucessores (destino e/ou sequência).
+BasicBlock = namedtuple('BasicBlock', 'start end successors')
+
+def branch_offset(word): # Deslocamento (em bytes, com sinal) de um branch (tipo B) ou jal (tipo J); None nos demais.
+    opcode = word & 0x7F
+    if opcode == OPCODE_BRANCH:
+        imm = ((word >> 31) << 12) | (((word >> 7) & 1) << 11) | (((word >> 25) & 0x3F) << 5) | (((word >> 8) & 0xF) << 1)
+        return imm - (1 << 13) if imm & (1 << 12) else imm
+    if opcode == OPCODE_JAL:
+        imm = ((word >> 31) << 20) | (((word >> 12) & 0xFF) << 12) | (((word >> 20) & 1) << 11) | (((word >> 21) & 0x3FF) << 1)
+        return imm - (1 << 21) if imm & (1 << 20) else imm
+    return None
+
+def with_branch_offset(word, offset): # Recodifica o deslocamento de um branch/jal (None se não couber no campo).
+    if word & 0x7F == OPCODE_BRANCH:
+        if not -BRANCH_RANGE <= offset < BRANCH_RANGE:
+            return None
+        imm = offset & 0x1FFF
+        return ((word & 0x01FFF07F) | ((imm >> 12) << 31) | (((imm >> 5) & 0x3F) << 25)
+                | (((imm >> 1) & 0xF) << 8) | (((imm >> 11) & 1) << 7))
+    if not -JAL_RANGE <= offset < JAL_RANGE:
+        return None
+    imm = offset & 0x1FFFFF
+    return ((word & 0xFFF) | ((imm >> 20) << 31) | (((imm >> 1) & 0x3FF) << 21)
+            | (((imm >> 11) & 1) << 20) | (((imm >> 12) & 0xFF) << 12))
+
+def branch_target(words, i): # Índice da instrução alvo do branch/jal em `i` (None se não houver alvo dentro do programa).
+    offset = branch_offset(words[i])
+    if offset is None or offset % 4:
+        return None
+    target = i + offset // 4
+    return target if 0 <= target < len(words) else None
+
+def build_cfg(instructions): # Define o construtor do CFG.
+    """Divide o programa em blocos básicos e registra os sucessores de cada um"""
+    words = [instr.word for instr in instructions]
+    n = len(words)
+    leaders = {0} if n else set() # Primeiras instruções de cada bloco.
+    for i, word in enumerate(words):
+        if word & 0x7F in TERMINATORS:
+            if i + 1 < n:
+                leaders.add(i + 1)
+            target = branch_target(words, i)
+            if target is not None:
+                leaders.add(target)
+    starts = sorted(leaders)
+    block_at = {start: b for b, start in enumerate(starts)} # Índice da instrução líder -> índice do bloco.
+
+    blocks = []
+    for b, start in enumerate(starts):
+        end = starts[b + 1] if b + 1 < len(starts) else n
+        last = words[end - 1] & 0x7F
+        successors = []
+        target = branch_target(words, end - 1)
+        if target is not None: # Destino do branch/jal.
+            successors.append(block_at[target])
+        # Segue em sequência: bloco sem terminador, branch não tomado, ecall e retorno de chamada (jal com rd != x0).
+        falls_through = last != OPCODE_JALR and not (last == OPCODE_JAL and (words[end - 1] >> 7) & 0x1F == 0)
+        if falls_through and end < n and block_at[end] not in successors:
+            successors.append(block_at[end])
+        blocks.append(BasicBlock(start, end, tuple(successors))) # jalr (retorno ou salto indireto): destino desconhecido.
+    return blocks
+
+def block_index(cfg, n): # Índice do bloco de cada uma das `n` instruções.
+    index = [0] * n
+    for b, block in enumerate(cfg):
+        index[block.start:block.end] = [b] * (block.end - block.start)
+    return index
+
+def imm12(value): # Imediato de 12 bits com sinal de um tipo I (addi, loads, jalr).
+    return value - 4096 if value & 0x800 else value
+
+def auipc_consumers(words, cfg_index, i): # Instruções que completam o endereço do auipc em `i` (ex.: addi de la, jalr de call).
+    """Índices das consumidoras do auipc, ou None se o valor parcial for usado de outra forma ou sair do bloco"""
+    rd = (words[i] >> 7) & 0x1F
+    consumers = []
+    for k in range(i + 1, len(words)):
+        if cfg_index[k] != cfg_index[i]: # O valor parcial sai do bloco: não é possível realocá-lo.
+            return None
+        word = words[k]
+        opcode = word & 0x7F
+        rs1, rs2, writes = (word >> 15) & 0x1F, (word >> 20) & 0x1F, (word >> 7) & 0x1F
+        uses_rs2 = opcode in (OPCODE_STORE, OPCODE_BRANCH, 0x33) # Tipos S, B e R também leem rs2.
+        if uses_rs2 and rs2 == rd:
+            return None
+        if rs1 == rd and opcode not in (OPCODE_SYSTEM, 0x37, OPCODE_AUIPC, OPCODE_JAL):
+            if opcode not in (OPCODE_OP_IMM, OPCODE_LOAD, OPCODE_STORE, OPCODE_JALR) or (opcode == OPCODE_OP_IMM and (word >> 12) & 7):
+                return None # Só addi, loads, stores e jalr somam um imediato ao endereço.
+            consumers.append(k)
+        if opcode == OPCODE_SYSTEM and rd in (10, 11, 17): # ecall lê a0, a1 e a7 implicitamente.
+            return None
+        if writes == rd and opcode not in (OPCODE_STORE, OPCODE_BRANCH): # O registrador foi sobrescrito: fim do uso.
+            return consumers
+    return consumers if consumers else None
+
+def consumer_imm(word): # Imediato de 12 bits de uma consumidora (tipo I ou S).
+    if word & 0x7F == OPCODE_STORE:
+        return imm12(((word >> 25) << 5) | ((word >> 7) & 0x1F))
+    return imm12(word >> 20)
+
+def with_consumer_imm(word, imm): # Recodifica o imediato de 12 bits de uma consumidora.
+    imm &= 0xFFF
+    if word & 0x7F == OPCODE_STORE:
+        return (word & 0x01FFF07F) | ((imm >> 5) << 25) | ((imm & 0x1F) << 7)
+    return (word & 0x000FFFFF) | (imm << 20)
+
+def relocate(words, origins, cfg): # Define a realocação de desvios de um programa transformado.
+    """Palavras do programa transformado com deslocamentos corrigidos e as posições que não puderam ser corrigidas
+
+    `words` são as palavras originais; `origins[p]` é o índice original da instrução na posição p (None = NOP
+    inserido). Um desvio para o bloco B passa a apontar para a primeira posição ocupada por uma instrução de B.
+    """
+    n = len(words)
+    index = block_index(cfg, n)
+    position = [None] * n # Índice original -> posição no programa transformado.
+    block_start = [None] * len(cfg) # Bloco -> primeira posição ocupada por uma de suas instruções.
+    for p, origin in enumerate(origins):
+        if origin is not None:
+            position[origin] = p
+            b = index[origin]
+            if block_start[b] is None:
+                block_start[b] = p
+
+    def new_address(origin, target): # Posição nova do alvo `target` de uma referência feita pela instrução `origin`.
+        return block_start[index[target]] if cfg[index[target]].start == target else position[target]
+
+    out = [words[o] if o is not None else NOP_WORD for o in origins]
+    unresolved = []
+    for p, origin in enumerate(origins):
+        if origin is None:
+            continue
+        word = words[origin]
+        opcode = word & 0x7F
+        if opcode in (OPCODE_BRANCH, OPCODE_JAL):
+            target = branch_target(words, origin)
+            if target is None:
+                continue
+            fixed = with_branch_offset(word, 4 * (new_address(origin, target) - p))
+            if fixed is None:
+                unresolved.append(p)
+            else:
+                out[p] = fixed
+        elif opcode == OPCODE_AUIPC: # Endereço relativo ao PC (la, call): o auipc ou o alvo podem ter mudado de lugar.
+            consumers = auipc_consumers(words, index, origin)
+            if consumers is None:
+                if p != origin: # Sem as consumidoras não há como compensar o deslocamento.
+                    unresolved.append(p)
+                continue
+            hi = word & 0xFFFFF000
+            hi = hi - (1 << 32) if hi & 0x80000000 else hi
+            values = [] # Novo valor (relativo à nova posição do auipc) de cada consumidora.
+            for k in consumers:
+                value = hi + consumer_imm(words[k])
+                target = origin + value // 4
+                if value % 4 == 0 and 0 <= target < n: # Endereço dentro do código: segue o alvo realocado.
+                    values.append(4 * (new_address(origin, target) - p))
+                else: # Endereço de dados: só compensa o deslocamento do próprio auipc.
+                    values.append(value - 4 * (p - origin))
+            if all(v == hi + consumer_imm(words[k]) for k, v in zip(consumers, values)):
+                continue # Nada mudou para este par.
+            new_hi = (values[0] + IMM12_RANGE) & ~0xFFF
+            if any(not -IMM12_RANGE <= v - new_hi < IMM12_RANGE for v in values):
+                unresolved.append(p)
+                continue
+            out[p] = (word & 0xFFF) | (new_hi & 0xFFFFF000)
+            for k, value in zip(consumers, values):
+                out[position[k]] = with_consumer_imm(words[k], value - new_hi)
+    return out, unresolved
@@ -0,0 +1,76 @@
+# Cache de decodificação compartilhado pelo M1 e pelo M2: palavra de 32 bits -> registro decodificado imutável.
+# Programas reais repetem poucas palavras distintas, então cada palavra é decodificada uma única vez e todas as
+# ocorrências compartilham o mesmo registro. A cache é limitada (LRU) e pode ser gravada em disco entre execuções.
+import os # Verifica se o arquivo da cache existe.
+import json # Formato da cache em disco (não executa código ao carregar, ao contrário do pickle).
+from collections import OrderedDict # Ordem de uso para a política LRU.
+
+DEFAULT_CACHE_SIZE = 1 << 16 # Palavras distintas mantidas em memória.
+CACHE_FORMAT = 1 # Versão do arquivo; arquivos de outra versão são ignorados.
+
+class DecodeCache: # Cache LRU limitada de decodificação.
+    """Memoriza `decode(word)`; `record` reconstrói os registros (namedtuple) lidos do disco a partir de seus campos"""
+
+    def __init__(self, decode, record=None, maxsize=DEFAULT_CACHE_SIZE):
+        self.decode_word = decode
+        self.record = record
+        self.maxsize = maxsize
+        self.entries = OrderedDict() # Palavra -> registro, do menos para o mais recentemente usado.
+        self.added = {} # Entradas decodificadas desde a última chamada a take_new_entries().
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, word): # Registro decodificado da palavra (compartilhado entre todas as ocorrências).
+        entries = self.entries
+        record = entries.get(word)
+        if record is not None:
+            self.hits += 1
+            entries.move_to_end(word)
+            return record
+        self.misses += 1
+        record = self.decode_word(word)
+        entries[word] = record
+        self.added[word] = record
+        if len(entries) > self.maxsize: # Descarta a palavra usada há mais tempo.
+            entries.popitem(last=False)
+        return record
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self): # Contadores de acertos e falhas.
+        total = self.hits + self.misses
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
+
+    def take_new_entries(self): # Entradas novas (ex.: para enviar de um processo do pool ao principal).
+        added, self.added = self.added, {}
+        return added
+
+    def update(self, entries): # Incorpora entradas decodificadas em outro processo.
+        for word, record in entries.items():
+            self.entries[word] = record
+            self.entries.move_to_end(word)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def save(self, path): # Grava a cache em disco (campos dos registros, não os objetos).
+        items = [[word, list(record) if isinstance(record, tuple) else record] for word, record in self.entries.items()]
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'format': CACHE_FORMAT, 'entries': items}, f)
+        os.replace(tmp_path, path) # Troca atômica: uma execução interrompida não corrompe a cache.
+
+    def load(self, path): # Carrega uma cache gravada; retorna quantas entradas foram lidas.
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError): # Arquivo ilegível: começa com a cache vazia.
+            return 0
+        if data.get('format') != CACHE_FORMAT:
+            return 0
+        loaded = {word: self.record(*fields) if self.record is not None else fields for word, fields in data['entries']}
+        self.update(loaded)
+        return len(loaded)
@@ -0,0 +1,104 @@
+# Análise de emissão dupla (superescalar em ordem, 2 instruções por ciclo) para as saídas do M2.
+# Regras de agrupamento: uma porta de memória (no máximo um load/store por grupo), um desvio por ciclo e sempre
+# como última instrução do grupo, ecall (e instruções desconhecidas) sozinhas, e nada de dependência RAW ou WAW
+# dentro do grupo (registradores de decode_registers). O simulador emite em ordem, formando grupos gulosamente,
+# com as distâncias de resultado e a penalidade de desvio da máquina (machine.py).
+# Só usa os campos word, type, rd, rs1, rs2, is_load, is_store e is_branch, por isso não depende do app2.py.
+from machine import DEFAULT_MACHINE
+
+OPCODE_SYSTEM = 0x73 # ecall/ebreak
+ISSUE_WIDTH = 2 # Instruções por ciclo do núcleo avaliado.
+PAIR_REASONS = { # Motivo (na ordem de verificação) -> descrição nos relatórios.
+    'sistema': 'ecall/instrução desconhecida',
+    'desvio': 'desvio no primeiro slot',
+    'memoria': 'porta de memória única',
+    'raw': 'dependência RAW',
+    'waw': 'dependência WAW',
+}
+
+def is_serializing(instr): # ecall e instruções desconhecidas são emitidas sozinhas.
+    return instr.opcode == OPCODE_SYSTEM or instr.type == 'Desconhecido'
+
+def join_conflict(group, instr, width=ISSUE_WIDTH): # Motivo pelo qual `instr` não pode entrar no grupo (None se pode).
+    if len(group) >= width:
+        return 'largura'
+    if group and (is_serializing(instr) or any(is_serializing(other) for other in group)):
+        return 'sistema'
+    if any(other.is_branch for other in group): # O desvio fecha o grupo (a próxima já está em outro caminho).
+        return 'desvio'
+    if (instr.is_load or instr.is_store) and any(other.is_load or other.is_store for other in group):
+        return 'memoria'
+    for other in group:
+        if other.rd and (instr.rs1 == other.rd or instr.rs2 == other.rd):
+            return 'raw'
+        if other.rd and instr.rd == other.rd:
+            return 'waw'
+    return None
+
+def pairing_conflicts(instructions, forwarding=True, machine=DEFAULT_MACHINE): # Define a análise de pares adjacentes.
+    """Um registro por par adjacente (i, i+1) que não pode ser emitido junto, com o motivo e o atraso da segunda"""
+    # `cycles`: ciclos entre as emissões das duas (1 quando o par só é separado; numa dependência RAW, a distância
+    # de resultado da produtora na máquina).
+    conflicts = []
+    for i in range(len(instructions) - 1):
+        reason = join_conflict([instructions[i]], instructions[i + 1])
+        if reason is not None:
+            cycles = machine.result_distance(instructions[i], forwarding) if reason == 'raw' else 1
+            conflicts.append({'position': i + 1, 'source': i, 'reason': reason, 'cycles': cycles})
+    return conflicts
+
+def simulate_dual_issue(stream, forwarding=False, delay_slots=0, machine=DEFAULT_MACHINE, width=ISSUE_WIDTH):
+    """Simula a emissão em ordem de até `width` instruções por ciclo (com interlock) e retorna ciclos e IPC"""
+    # Mesmas convenções de simulate_pipeline: os desvios são considerados tomados, `delay_slots` instruções após
+    # cada desvio são sempre executadas e os NOPs ocupam vaga de emissão, mas não contam como trabalho útil.
+    penalty = machine.branch_penalty
+    ready = {} # Registrador -> ciclo mais cedo em que uma consumidora pode ser emitida.
+    group = [] # Instruções emitidas no ciclo corrente.
+    cycle = -1 # Ciclo de emissão do grupo corrente.
+    count = nops = stall_cycles = flush_cycles = groups_full = 0
+    slots_left = 0 # Delay slots restantes do último desvio.
+    pending_flush = 0 # Ciclos perdidos a aplicar quando os delay slots terminarem.
+
+    for instr in stream:
+        count += 1
+        if instr.type == 'NOP':
+            nops += 1
+        earliest = max((ready.get(reg, 0) for reg in (instr.rs1, instr.rs2) if reg), default=0)
+        flush = 0
+        if slots_left > 0:
+            slots_left -= 1
+        elif pending_flush:
+            flush, pending_flush = pending_flush, 0
+        if not flush and group and earliest <= cycle and join_conflict(group, instr, width) is None:
+            group.append(instr) # Emitida no mesmo ciclo do grupo corrente.
+        else:
+            if len(group) == width:
+                groups_full += 1
+            start = cycle + 1 + flush
+            if earliest > start:
+                stall_cycles += earliest - start
+                start = earliest
+            cycle = start
+            group = [instr]
+        if instr.rd:
+            ready[instr.rd] = cycle + machine.result_distance(instr, forwarding)
+        if instr.is_branch:
+            lost = max(0, penalty - delay_slots)
+            if lost:
+                flush_cycles += lost
+                pending_flush = lost
+            slots_left = delay_slots
+    if len(group) == width:
+        groups_full += 1
+
+    cycles = cycle + len(machine.stages) if count else 0 # O último grupo termina o último estágio.
+    useful = count - nops
+    return {
+        'cycles': cycles,
+        'instructions': useful,
+        'nops': nops,
+        'stall_cycles': stall_cycles,
+        'flush_cycles': flush_cycles,
+        'full_groups': groups_full, # Ciclos em que `width` instruções foram emitidas juntas.
+        'ipc': useful / cycles if cycles else 0.0,
+    }
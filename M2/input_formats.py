@@ -0,0 +1,82 @@
+# Formatos de entrada compartilhados pelo M1 e pelo M2: detecção do formato e leitura das palavras de 32 bits.
+# Aceita código-fonte (.asm/.s, montado pelo montador embutido), ELF (seção .text), binário cru (.bin, palavras
+# little-endian) e texto hexadecimal (uma palavra por linha). Binários e ELFs são mapeados em memória, sem cópia.
+import os # Extensão e tamanho do arquivo de entrada.
+import sys # Ordem de bytes da máquina.
+import mmap # Mapeia arquivos binários grandes na memória sem copiá-los.
+import struct # Leitura dos cabeçalhos de arquivos ELF.
+from array import array # Palavras de 32 bits de forma compacta.
+from assembler import assemble_file # Montador: programas .asm são lidos sem passar por um arquivo .hex.
+
+try: # NumPy é opcional: com ele, as palavras de um binário viram um array sobre o próprio mapeamento.
+    import numpy as np
+except ImportError:
+    np = None
+
+ELF_MAGIC = b'\x7fELF' # Assinatura dos arquivos ELF.
+HEX_TEXT_BYTES = frozenset(b'0123456789abcdefABCDEFxX \t\r\n') # Bytes possíveis em um arquivo .hex em texto.
+
+def detect_input_format(file_path): # Define uma função que identifica o formato do arquivo de entrada.
+    """Retorna 'asm' (código-fonte), 'elf', 'bin' (palavras little-endian) ou 'hex' (texto, uma palavra por linha)"""
+    if os.path.splitext(file_path)[1].lower() in ('.asm', '.s'): # Código-fonte: montado pelo montador embutido.
+        return 'asm'
+    with open(file_path, 'rb') as f:
+        head = f.read(64) # O início do arquivo basta para decidir.
+    if head.startswith(ELF_MAGIC):
+        return 'elf'
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.bin':
+        return 'bin'
+    if extension == '.hex' or all(b in HEX_TEXT_BYTES for b in head): # Texto hexadecimal continua sendo o padrão.
+        return 'hex'
+    return 'bin'
+
+def elf_text_section(buf): # Define uma função que localiza a seção .text de um ELF (32 ou 64 bits).
+    """Retorna (deslocamento, tamanho) da seção .text"""
+    endian = '<' if buf[5] == 1 else '>' # EI_DATA: 1 = little-endian, 2 = big-endian.
+    if buf[4] == 1: # EI_CLASS 1: ELF32.
+        e_shoff, = struct.unpack_from(endian + 'I', buf, 0x20)
+        e_shentsize, e_shnum, e_shstrndx = struct.unpack_from(endian + 'HHH', buf, 0x2E)
+        section_format = endian + 'IIIIII' # sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size
+    else: # EI_CLASS 2: ELF64.
+        e_shoff, = struct.unpack_from(endian + 'Q', buf, 0x28)
+        e_shentsize, e_shnum, e_shstrndx = struct.unpack_from(endian + 'HHH', buf, 0x3A)
+        section_format = endian + 'IIQQQQ'
+
+    def section(index): # Campos do cabeçalho da seção `index`.
+        return struct.unpack_from(section_format, buf, e_shoff + index * e_shentsize)
+
+    names_offset = section(e_shstrndx)[4] # Tabela de nomes das seções.
+    for index in range(e_shnum):
+        name, _, _, _, offset, size = section(index)
+        start = names_offset + name
+        if buf[start:buf.find(b'\0', start)] == b'.text':
+            return offset, size
+    raise ValueError("seção .text não encontrada no arquivo ELF")
+
+def map_binary_words(file_path, input_format): # Define uma função que mapeia as palavras de um .bin/ELF.
+    """Palavras de 32 bits de um .bin/ELF como visão sem cópia sobre o arquivo mapeado em memória"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return array('I')
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) # O mapeamento continua válido após fechar o arquivo.
+    start, size = elf_text_section(mapped) if input_format == 'elf' else (0, len(mapped))
+    size -= size % 4 # Ignora bytes finais que não completam uma palavra.
+    if np is not None: # Array NumPy diretamente sobre o mapeamento, em little-endian (como no RISC-V).
+        return np.frombuffer(mapped, dtype='<u4', count=size // 4, offset=start)
+    view = memoryview(mapped)[start:start + size]
+    if sys.byteorder == 'little': # Mesma ordem de bytes da máquina: a visão pode ser reinterpretada sem cópia.
+        return view.cast('I')
+    words = array('I', view) # Máquina big-endian: copia e inverte os bytes de cada palavra.
+    words.byteswap()
+    return words
+
+def load_words(file_path, input_format=None): # Define uma função que devolve as palavras de 32 bits de um arquivo.
+    """Palavras de 32 bits do programa; para .bin/ELF, uma visão sem cópia sobre o arquivo mapeado em memória"""
+    input_format = input_format or detect_input_format(file_path)
+    if input_format == 'asm': # Código-fonte: palavras geradas pelo montador.
+        return array('I', assemble_file(file_path).words)
+    if input_format == 'hex': # Texto: uma palavra por linha.
+        with open(file_path, 'r') as f:
+            return array('I', (int(line, 16) for line in f if line.strip()))
+    return map_binary_words(file_path, input_format)
@@ -0,0 +1,370 @@
+# Interpretador funcional RV32I (com a extensão M) para executar os programas do M2 (.asm) e do M3 e gerar o trace dinâmico.
+# Cada palavra do .text é decodificada uma única vez (cache de decodificação indexado pelo PC) e despachada por uma
+# tabela indexada por opcode/funct3 (e funct7 quando necessário). As chamadas de sistema (ecall) são simuladas.
+# O trace dinâmico permite ponderar cada conflito (e cada NOP das técnicas) pelo número de vezes que é executado.
+import os # Verifica a existência dos arquivos de entrada.
+import sys # Parâmetros da linha de comando.
+import argparse # Interface de linha de comando.
+from array import array # Trace compacto (uma entrada por instrução executada).
+
+from assembler import assemble_file, TEXT_BASE, DATA_BASE # Montador dos programas .asm.
+import app2 # Decodificação, detecções e técnicas do M2.
+from branch_predictor import predictor_report, predictor_lines # Preditores de desvio alimentados pelo trace.
+from machine import DEFAULT_MACHINE, load_machine # Pipeline das técnicas e penalidade dos erros de predição.
+
+MASK = 0xFFFFFFFF # Registradores guardam valores de 32 bits sem sinal.
+STACK_TOP = 0x7FFFEFFC # Valor inicial de sp (padrão do RARS).
+GLOBAL_POINTER = 0x10008000 # Valor inicial de gp (padrão do RARS).
+STACK_SIZE = 1 << 20 # Bytes reservados para a pilha.
+HEAP_SIZE = 1 << 16 # Bytes livres após o .data.
+MAX_STEPS = 10_000_000 # Limite de instruções executadas (evita laços infinitos).
+NO_ADDRESS = MASK # Marcador de "sem acesso à memória" no trace de endereços.
+
+KIND_OTHER, KIND_MEMORY, KIND_CONTROL = 0, 1, 2 # Categorias usadas para montar o trace.
+
+def signed(value): # Interpreta um valor de 32 bits como inteiro com sinal.
+    return value - 0x100000000 if value & 0x80000000 else value
+
+class Memory: # Memória esparsa em segmentos contíguos (código, dados e pilha).
+    """Segmentos (início, fim, bytearray) endereçados em little-endian"""
+    __slots__ = ('segments',)
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    def locate(self, address, size): # Encontra o segmento que contém [address, address + size).
+        for start, end, buf in self.segments:
+            if start <= address and address + size <= end:
+                return buf, address - start
+        raise ValueError(f"acesso inválido à memória no endereço 0x{address:08X}")
+
+    def load(self, address, size, is_signed=False):
+        buf, offset = self.locate(address, size)
+        return int.from_bytes(buf[offset:offset + size], 'little', signed=is_signed) & MASK
+
+    def store(self, address, size, value):
+        buf, offset = self.locate(address, size)
+        buf[offset:offset + size] = (value & ((1 << (8 * size)) - 1)).to_bytes(size, 'little')
+
+    def load_string(self, address): # Lê uma string terminada em zero (ecall 4).
+        buf, offset = self.locate(address, 1)
+        end = buf.find(0, offset)
+        return bytes(buf[offset:end if end >= 0 else len(buf)]).decode('utf-8', errors='replace')
+
+class Machine: # Estado arquitetural: registradores, memória e E/S simulada.
+    __slots__ = ('regs', 'memory', 'inputs', 'output', 'exit_code', 'waiting_input')
+
+    def __init__(self, memory, inputs=()):
+        self.regs = [0] * 32
+        self.regs[2] = STACK_TOP # sp
+        self.regs[3] = GLOBAL_POINTER # gp
+        self.memory = memory
+        self.inputs = iter(inputs) # Valores devolvidos pelas leituras (ecall 5), em ordem.
+        self.output = [] # Texto impresso pelo programa.
+        self.exit_code = None
+        self.waiting_input = False # A execução parou numa leitura (ecall 5) sem entradas restantes.
+
+class DynamicTrace: # Trace dinâmico: uma entrada por instrução executada.
+    """Índice estático executado, endereço acessado e resultado do desvio, passo a passo"""
+    __slots__ = ('indices', 'addresses', 'taken')
+
+    def __init__(self):
+        self.indices = array('I') # Índice da instrução no .text.
+        self.addresses = array('I') # Endereço de load/store (NO_ADDRESS nas demais).
+        self.taken = array('b') # 1 desvio tomado, 0 não tomado, -1 não é desvio.
+
+    def __len__(self):
+        return len(self.indices)
+
+# Manipuladores: recebem (máquina, pc, rd, rs1, rs2, imm) e devolvem o próximo PC (None encerra a execução).
+def op_add(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (r[rs1] + r[rs2]) & MASK; return pc + 4
+def op_sub(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (r[rs1] - r[rs2]) & MASK; return pc + 4
+def op_sll(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (r[rs1] << (r[rs2] & 31)) & MASK; return pc + 4
+def op_slt(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = int(signed(r[rs1]) < signed(r[rs2])); return pc + 4
+def op_sltu(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = int(r[rs1] < r[rs2]); return pc + 4
+def op_xor(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] ^ r[rs2]; return pc + 4
+def op_srl(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] >> (r[rs2] & 31); return pc + 4
+def op_sra(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (signed(r[rs1]) >> (r[rs2] & 31)) & MASK; return pc + 4
+def op_or(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] | r[rs2]; return pc + 4
+def op_and(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] & r[rs2]; return pc + 4
+def op_mul(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (r[rs1] * r[rs2]) & MASK; return pc + 4
+def op_mulh(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = ((signed(r[rs1]) * signed(r[rs2])) >> 32) & MASK; return pc + 4
+def op_mulhsu(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = ((signed(r[rs1]) * r[rs2]) >> 32) & MASK; return pc + 4
+def op_mulhu(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = ((r[rs1] * r[rs2]) >> 32) & MASK; return pc + 4
+
+def op_div(m, pc, rd, rs1, rs2, imm): # Divisão com sinal truncada em direção a zero (divisão por zero -> -1).
+    r = m.regs
+    a, b = signed(r[rs1]), signed(r[rs2])
+    r[rd] = MASK if b == 0 else (abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)) & MASK
+    return pc + 4
+
+def op_divu(m, pc, rd, rs1, rs2, imm):
+    r = m.regs
+    r[rd] = MASK if r[rs2] == 0 else r[rs1] // r[rs2]
+    return pc + 4
+
+def op_rem(m, pc, rd, rs1, rs2, imm): # Resto com o sinal do dividendo (divisão por zero -> dividendo).
+    r = m.regs
+    a, b = signed(r[rs1]), signed(r[rs2])
+    r[rd] = r[rs1] if b == 0 else (abs(a) % abs(b) * (-1 if a < 0 else 1)) & MASK
+    return pc + 4
+
+def op_remu(m, pc, rd, rs1, rs2, imm):
+    r = m.regs
+    r[rd] = r[rs1] if r[rs2] == 0 else r[rs1] % r[rs2]
+    return pc + 4
+
+def op_addi(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (r[rs1] + imm) & MASK; return pc + 4
+def op_slti(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = int(signed(r[rs1]) < imm); return pc + 4
+def op_sltiu(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = int(r[rs1] < (imm & MASK)); return pc + 4
+def op_xori(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] ^ (imm & MASK); return pc + 4
+def op_ori(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] | (imm & MASK); return pc + 4
+def op_andi(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] & (imm & MASK); return pc + 4
+def op_slli(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (r[rs1] << (imm & 31)) & MASK; return pc + 4
+def op_srli(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = r[rs1] >> (imm & 31); return pc + 4
+def op_srai(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = (signed(r[rs1]) >> (imm & 31)) & MASK; return pc + 4
+
+def op_lb(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = m.memory.load((r[rs1] + imm) & MASK, 1, True); return pc + 4
+def op_lh(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = m.memory.load((r[rs1] + imm) & MASK, 2, True); return pc + 4
+def op_lw(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = m.memory.load((r[rs1] + imm) & MASK, 4); return pc + 4
+def op_lbu(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = m.memory.load((r[rs1] + imm) & MASK, 1); return pc + 4
+def op_lhu(m, pc, rd, rs1, rs2, imm): r = m.regs; r[rd] = m.memory.load((r[rs1] + imm) & MASK, 2); return pc + 4
+def op_sb(m, pc, rd, rs1, rs2, imm): r = m.regs; m.memory.store((r[rs1] + imm) & MASK, 1, r[rs2]); return pc + 4
+def op_sh(m, pc, rd, rs1, rs2, imm): r = m.regs; m.memory.store((r[rs1] + imm) & MASK, 2, r[rs2]); return pc + 4
+def op_sw(m, pc, rd, rs1, rs2, imm): r = m.regs; m.memory.store((r[rs1] + imm) & MASK, 4, r[rs2]); return pc + 4
+
+def op_beq(m, pc, rd, rs1, rs2, imm): r = m.regs; return (pc + imm) & MASK if r[rs1] == r[rs2] else pc + 4
+def op_bne(m, pc, rd, rs1, rs2, imm): r = m.regs; return (pc + imm) & MASK if r[rs1] != r[rs2] else pc + 4
+def op_blt(m, pc, rd, rs1, rs2, imm): r = m.regs; return (pc + imm) & MASK if signed(r[rs1]) < signed(r[rs2]) else pc + 4
+def op_bge(m, pc, rd, rs1, rs2, imm): r = m.regs; return (pc + imm) & MASK if signed(r[rs1]) >= signed(r[rs2]) else pc + 4
+def op_bltu(m, pc, rd, rs1, rs2, imm): r = m.regs; return (pc + imm) & MASK if r[rs1] < r[rs2] else pc + 4
+def op_bgeu(m, pc, rd, rs1, rs2, imm): r = m.regs; return (pc + imm) & MASK if r[rs1] >= r[rs2] else pc + 4
+
+def op_jal(m, pc, rd, rs1, rs2, imm): m.regs[rd] = pc + 4; return (pc + imm) & MASK
+
+def op_jalr(m, pc, rd, rs1, rs2, imm): # O destino é calculado antes de escrever rd (rd pode ser igual a rs1).
+    target = (m.regs[rs1] + imm) & MASK & ~1
+    m.regs[rd] = pc + 4
+    return target
+
+def op_lui(m, pc, rd, rs1, rs2, imm): m.regs[rd] = imm & MASK; return pc + 4
+def op_auipc(m, pc, rd, rs1, rs2, imm): m.regs[rd] = (pc + imm) & MASK; return pc + 4
+
+def op_ecall(m, pc, rd, rs1, rs2, imm): # Chamadas de sistema do RARS simuladas (código em a7).
+    r = m.regs
+    code = r[17]
+    if code == 1: # Imprime inteiro.
+        m.output.append(str(signed(r[10])))
+    elif code == 4: # Imprime string.
+        m.output.append(m.memory.load_string(r[10]))
+    elif code == 11: # Imprime caractere.
+        m.output.append(chr(r[10] & 0xFF))
+    elif code == 5: # Lê inteiro: sem entradas restantes, a execução termina.
+        value = next(m.inputs, None)
+        if value is None:
+            m.waiting_input = True
+            return None
+        r[10] = value & MASK
+    elif code == 10: # Encerra.
+        m.exit_code = 0
+        return None
+    elif code == 93: # Encerra com código em a0.
+        m.exit_code = signed(r[10])
+        return None
+    return pc + 4 # Demais códigos são ignorados.
+
+def op_illegal(m, pc, rd, rs1, rs2, imm):
+    raise ValueError(f"instrução inválida em 0x{pc:08X}")
+
+# Tabela de despacho: opcode | funct3 << 7 (| funct7 << 10 para tipo R e deslocamentos com imediato).
+DISPATCH = {
+    0x33 | 0 << 7 | 0x00 << 10: op_add, 0x33 | 0 << 7 | 0x20 << 10: op_sub, 0x33 | 1 << 7: op_sll,
+    0x33 | 2 << 7: op_slt, 0x33 | 3 << 7: op_sltu, 0x33 | 4 << 7: op_xor, 0x33 | 5 << 7: op_srl,
+    0x33 | 5 << 7 | 0x20 << 10: op_sra, 0x33 | 6 << 7: op_or, 0x33 | 7 << 7: op_and,
+    0x33 | 0 << 7 | 0x01 << 10: op_mul, 0x33 | 1 << 7 | 0x01 << 10: op_mulh, 0x33 | 2 << 7 | 0x01 << 10: op_mulhsu,
+    0x33 | 3 << 7 | 0x01 << 10: op_mulhu, 0x33 | 4 << 7 | 0x01 << 10: op_div, 0x33 | 5 << 7 | 0x01 << 10: op_divu,
+    0x33 | 6 << 7 | 0x01 << 10: op_rem, 0x33 | 7 << 7 | 0x01 << 10: op_remu,
+    0x13 | 0 << 7: op_addi, 0x13 | 2 << 7: op_slti, 0x13 | 3 << 7: op_sltiu, 0x13 | 4 << 7: op_xori,
+    0x13 | 6 << 7: op_ori, 0x13 | 7 << 7: op_andi, 0x13 | 1 << 7: op_slli, 0x13 | 5 << 7: op_srli,
+    0x13 | 5 << 7 | 0x20 << 10: op_srai,
+    0x03 | 0 << 7: op_lb, 0x03 | 1 << 7: op_lh, 0x03 | 2 << 7: op_lw, 0x03 | 4 << 7: op_lbu, 0x03 | 5 << 7: op_lhu,
+    0x23 | 0 << 7: op_sb, 0x23 | 1 << 7: op_sh, 0x23 | 2 << 7: op_sw,
+    0x63 | 0 << 7: op_beq, 0x63 | 1 << 7: op_bne, 0x63 | 4 << 7: op_blt, 0x63 | 5 << 7: op_bge,
+    0x63 | 6 << 7: op_bltu, 0x63 | 7 << 7: op_bgeu,
+    **{0x6F | f3 << 7: op_jal for f3 in range(8)}, # jal não tem funct3: todas as combinações levam ao mesmo manipulador.
+    **{0x37 | f3 << 7: op_lui for f3 in range(8)},
+    **{0x17 | f3 << 7: op_auipc for f3 in range(8)},
+    0x67 | 0 << 7: op_jalr, 0x73 | 0 << 7: op_ecall,
+}
+
+def decode_for_execution(word): # Decodifica uma palavra em (manipulador, rd, rs1, rs2, imm, categoria).
+    opcode = word & 0x7F
+    funct3 = (word >> 12) & 0x7
+    funct7 = word >> 25
+    rd, rs1, rs2 = (word >> 7) & 0x1F, (word >> 15) & 0x1F, (word >> 20) & 0x1F
+    key = opcode | funct3 << 7
+    if opcode == 0x33 or (opcode == 0x13 and funct3 in (1, 5)): # funct7 diferencia add/sub/mul, srl/sra etc.
+        key |= funct7 << 10
+    handler = DISPATCH.get(key, op_illegal)
+
+    if opcode in (0x37, 0x17): # Tipo U.
+        imm = signed(word & 0xFFFFF000)
+    elif opcode == 0x6F: # Tipo J.
+        imm = ((word >> 31) & 1) << 20 | ((word >> 12) & 0xFF) << 12 | ((word >> 20) & 1) << 11 | ((word >> 21) & 0x3FF) << 1
+        imm -= (imm & 0x100000) << 1
+    elif opcode == 0x63: # Tipo B.
+        imm = ((word >> 31) & 1) << 12 | ((word >> 7) & 1) << 11 | ((word >> 25) & 0x3F) << 5 | ((word >> 8) & 0xF) << 1
+        imm -= (imm & 0x1000) << 1
+    elif opcode == 0x23: # Tipo S.
+        imm = signed(word) >> 20 & ~0x1F | (word >> 7) & 0x1F
+    else: # Tipo I (e R, que ignora o imediato).
+        imm = signed(word) >> 20
+
+    if opcode in (0x03, 0x23):
+        kind = KIND_MEMORY
+    elif opcode in (0x63, 0x6F, 0x67):
+        kind = KIND_CONTROL
+    else:
+        kind = KIND_OTHER
+    return handler, rd, rs1, rs2, imm, kind
+
+def load_program(path): # Carrega um programa: .asm é montado; .hex/.bin/ELF só têm o segmento de código.
+    """Retorna (palavras do .text, bytes do .data, endereço do .text, endereço do .data)"""
+    if path.lower().endswith(('.asm', '.s')):
+        program = assemble_file(path)
+        return program.words, program.data, program.text_base, program.data_base
+    words = app2.load_words(path)
+    return list(words.tolist() if hasattr(words, 'tolist') else words), b'', TEXT_BASE, DATA_BASE
+
+def run_program(words, data=b'', text_base=TEXT_BASE, data_base=DATA_BASE, inputs=(), max_steps=MAX_STEPS):
+    """Executa o programa e retorna (máquina, trace dinâmico); para em ecall 10/93, fim das entradas ou fim do .text"""
+    decoded = [decode_for_execution(word) for word in words] # Cache de decodificação: uma vez por palavra do .text.
+    code = bytearray(b''.join(word.to_bytes(4, 'little') for word in words))
+    memory = Memory([
+        (text_base, text_base + len(code), code),
+        (data_base, data_base + len(data) + HEAP_SIZE, bytearray(data) + bytearray(HEAP_SIZE)),
+        (STACK_TOP + 4 - STACK_SIZE, STACK_TOP + 4, bytearray(STACK_SIZE)),
+    ])
+    machine = Machine(memory, inputs)
+    regs = machine.regs
+    trace = DynamicTrace()
+    indices_append, addresses_append, taken_append = trace.indices.append, trace.addresses.append, trace.taken.append
+    count = len(decoded)
+    pc = text_base
+
+    for _ in range(max_steps):
+        index = (pc - text_base) >> 2
+        if pc & 3 or not 0 <= index < count: # Saiu do .text (fim do programa, como no RARS).
+            break
+        handler, rd, rs1, rs2, imm, kind = decoded[index]
+        indices_append(index)
+        addresses_append((regs[rs1] + imm) & MASK if kind == KIND_MEMORY else NO_ADDRESS)
+        next_pc = handler(machine, pc, rd, rs1, rs2, imm)
+        regs[0] = 0 # x0 é sempre zero.
+        taken_append(-1 if kind != KIND_CONTROL else int(next_pc != pc + 4))
+        if next_pc is None:
+            break
+        pc = next_pc
+    return machine, trace
+
+def stop_warning(machine, trace, max_steps=MAX_STEPS): # Aviso quando a execução não chegou ao fim do programa (None se chegou).
+    if machine.waiting_input:
+        return "a execução parou numa leitura de inteiro sem entradas restantes (use --entradas)"
+    if len(trace) >= max_steps:
+        return f"a execução parou no limite de {max_steps} instruções"
+    return None
+
+def execution_counts(trace, size): # Quantas vezes cada instrução estática foi executada.
+    counts = [0] * size
+    for index in trace.indices:
+        counts[index] += 1
+    return counts
+
+def weight_conflicts(conflicts, counts): # Total dinâmico de conflitos: cada conflito pesa o número de execuções da consumidora.
+    return sum(counts[conflict['position']] for conflict in conflicts)
+
+def dynamic_nops(view, counts): # NOPs executados pelo programa transformado, dadas as execuções de view.base.
+    total = 0
+    for pos, nops in view.nops_after.items():
+        index = pos if view.order is None else view.order[pos]
+        total += nops * counts[index]
+    return total
+
+def write_trace(filename, trace, words, text_base=TEXT_BASE): # Grava o trace dinâmico (uma instrução executada por linha).
+    with open(filename, 'w') as f:
+        for index, address, taken in zip(trace.indices, trace.addresses, trace.taken):
+            line = f"{text_base + 4 * index:08X} {words[index]:08X}"
+            if address != NO_ADDRESS:
+                line += f" M {address:08X}" # Endereço acessado pelo load/store.
+            elif taken >= 0:
+                line += " T" if taken else " N" # Desvio tomado / não tomado.
+            f.write(line + "\n")
+
+def dynamic_report(words, trace, text_base=TEXT_BASE, machine=DEFAULT_MACHINE): # Conflitos e NOPs das técnicas ponderados pelas execuções reais.
+    """Executa as detecções e técnicas 3 a 9 sobre o programa, pondera cada resultado pelo trace e roda os preditores"""
+    original = [app2.DECODE_CACHE.decode(word) for word in words]
+    counts = execution_counts(trace, len(original))
+    results = app2.run_all_passes(original, parallel=False, machine=machine)
+    reord_cf = results['reord_cf'][0]
+    return {
+        'executed': len(trace),
+        'data_conflicts_sf': weight_conflicts(results['data_sf'], counts),
+        'data_conflicts_cf': weight_conflicts(results['data_cf'], counts),
+        'control_conflicts': weight_conflicts(results['control'], counts),
+        'technique_3_nops': dynamic_nops(results['nop_sf'][0], counts),
+        'technique_4_nops': dynamic_nops(results['nop_cf'][0], counts),
+        'technique_5_nops': dynamic_nops(results['reord_sf'][0], counts),
+        'technique_6_nops': dynamic_nops(reord_cf, counts),
+        'technique_7_nops': dynamic_nops(results['branch_nop'][0], counts),
+        'technique_8_nops': dynamic_nops(results['branch_delay'][0], counts),
+        # A visão da técnica 9 é sobre o programa original e seus NOPs já incluem os da técnica 6.
+        'technique_9_nops': dynamic_nops(results['combined'][0], counts),
+        'predictors': predictor_report(trace, words, text_base, machine=machine), # Alternativa às técnicas 7 e 8.
+    }
+
+def main(argv=None): # Executa um programa e imprime a saída, o trace e o relatório dinâmico.
+    parser = argparse.ArgumentParser(description="Executa um programa RV32I e pondera os conflitos pelo trace dinâmico.")
+    parser.add_argument('entrada', help="programa .asm (montado automaticamente), .hex, .bin ou ELF")
+    parser.add_argument('--entradas', type=int, nargs='*', default=[], help="valores devolvidos pelas leituras de inteiro (ecall 5)")
+    parser.add_argument('--trace', help="arquivo para gravar o trace dinâmico")
+    parser.add_argument('--max-passos', type=int, default=MAX_STEPS, help="limite de instruções executadas")
+    parser.add_argument('--maquina', default='classico', help="máquina (classico, rv32m, profundo) ou descrição em .json")
+    args = parser.parse_args(argv)
+    try:
+        pipeline = load_machine(args.maquina)
+    except (OSError, ValueError, TypeError) as exc:
+        parser.error(f"máquina inválida: {exc}")
+
+    if not os.path.exists(args.entrada):
+        print(f"Arquivo {args.entrada} não encontrado!")
+        return 1
+    words, data, text_base, data_base = load_program(args.entrada)
+    machine, trace = run_program(words, data, text_base, data_base, args.entradas, args.max_passos)
+    if args.trace:
+        write_trace(args.trace, trace, words, text_base)
+
+    report = dynamic_report(words, trace, text_base, pipeline)
+    print("=== EXECUÇÃO ===")
+    print(f"Saída do programa: {''.join(machine.output)!r}")
+    print(f"Instruções estáticas: {len(words)}")
+    print(f"Instruções executadas: {report['executed']}")
+    warning = stop_warning(machine, trace, args.max_passos)
+    if warning:
+        print(f"Aviso: {warning}; os totais abaixo cobrem só o trecho executado.")
+    print()
+    print("=== CONFLITOS E NOPs PONDERADOS PELA EXECUÇÃO ===")
+    print(f"Conflitos de dados sem forwarding: {report['data_conflicts_sf']}")
+    print(f"Conflitos de dados com forwarding: {report['data_conflicts_cf']}")
+    print(f"Conflitos de controle: {report['control_conflicts']}")
+    for n in range(3, 10):
+        print(f"Técnica {n} - NOPs executados: {report[f'technique_{n}_nops']}")
+    print()
+    print("=== CONFLITOS DE CONTROLE: TÉCNICAS 7 E 8 x PREDIÇÃO DE DESVIOS ===")
+    print(f"Técnica 7 - NOP após desvio: {report['technique_7_nops']} ciclos perdidos")
+    print(f"Técnica 8 - Delayed Branch: {report['technique_8_nops']} ciclos perdidos (delay slots com NOP)")
+    for line in predictor_lines(report['predictors']):
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# Descrição parametrizada da máquina (pipeline) usada pelas detecções, técnicas e pelo simulador do M2.
+# Estágios, caminhos de forwarding, estágio e latência do resultado de cada classe de instrução (ULA, loads,
+# mul e div da extensão M) e estágio em que os desvios são resolvidos. A partir disso são derivadas a distância
+# mínima entre produtora e consumidora, os NOPs de cada dependência RAW, a janela em que um conflito ainda custa
+# NOPs e a penalidade (delay slots) dos desvios. A máquina padrão é o pipeline clássico de 5 estágios do M1.
+# Usa apenas os campos word, rd, rs1, rs2 e is_load das instruções, sem depender do app2.
+import json # Descrições de máquina em arquivo.
+
+INSTRUCTION_CLASSES = ('alu', 'load', 'mul', 'div') # Classes com estágio e latência de resultado próprios.
+MULDIV_MASK = 0xFE00007F # funct7 + opcode.
+MULDIV_MATCH = 0x02000033 # funct7 = 0000001 e opcode OP: mul, mulh, mulhsu, mulhu, div, divu, rem, remu.
+
+def instruction_class(instr): # Classe de temporização de uma instrução.
+    if instr.is_load:
+        return 'load'
+    if instr.word & MULDIV_MASK == MULDIV_MATCH:
+        return 'div' if instr.word & 0x4000 else 'mul' # funct3 >= 4: div, divu, rem, remu.
+    return 'alu'
+
+class MachineModel: # Descrição de um pipeline em ordem, com emissão de uma instrução por ciclo.
+    """Estágios, forwarding, latências e resolução de desvios; deriva distâncias, NOPs e janelas de conflito"""
+    # Modelo de temporização (distâncias em ciclos entre os IFs de produtora e consumidora):
+    # - o resultado de uma classe existe no fim de `result_stage[classe]`, após `latency[classe]` ciclos nele
+    #   (unidades com mais de um ciclo são supostas segmentadas: só atrasam o resultado, não o pipeline);
+    # - com forwarding, o valor é encaminhado do primeiro estágio de `forwarding_paths` a partir do estágio do
+    #   resultado para o início de `execute_stage` da consumidora;
+    # - sem forwarding (ou sem caminho), o valor é escrito no último estágio (1ª metade do ciclo) e lido em
+    #   `read_stage` (2ª metade).
+
+    def __init__(self, name='clássico de 5 estágios', stages=('IF', 'ID', 'EX', 'MEM', 'WB'), read_stage='ID',
+                 execute_stage='EX', forwarding_paths=('EX', 'MEM'), result_stage=None, latency=None, branch_stage='ID'):
+        self.name = name
+        self.stages = tuple(stages)
+        self.read_stage = read_stage
+        self.execute_stage = execute_stage
+        self.forwarding_paths = tuple(forwarding_paths)
+        self.result_stage = {'alu': execute_stage, 'load': 'MEM', 'mul': execute_stage, 'div': execute_stage}
+        self.result_stage.update(result_stage or {})
+        self.latency = dict.fromkeys(INSTRUCTION_CLASSES, 1)
+        self.latency.update(latency or {})
+        self.branch_stage = branch_stage
+        for stage in (read_stage, execute_stage, branch_stage, *self.forwarding_paths, *self.result_stage.values()):
+            if stage not in self.stages:
+                raise ValueError(f"estágio '{stage}' não faz parte da máquina {name} ({', '.join(self.stages)})")
+        unknown = set(self.result_stage) | set(self.latency)
+        unknown.difference_update(INSTRUCTION_CLASSES)
+        if unknown:
+            raise ValueError(f"classe(s) de instrução desconhecida(s): {', '.join(sorted(unknown))}")
+        if any(cycles < 1 for cycles in self.latency.values()):
+            raise ValueError("a latência de cada classe deve ser de pelo menos 1 ciclo")
+        # Distância mínima por classe, sem e com forwarding (tabela consultada em cada custo de dependência).
+        self.distances = {forwarding: {cls: self.required_distance(cls, forwarding) for cls in INSTRUCTION_CLASSES}
+                          for forwarding in (False, True)}
+
+    def required_distance(self, cls, forwarding=False): # Distância mínima entre os IFs para ler o resultado de `cls`.
+        stage = self.stages.index
+        extra = self.latency[cls] - 1 # Ciclos além do primeiro no estágio do resultado.
+        # Escrita no último estágio e leitura no estágio de leitura de registradores.
+        distance = len(self.stages) - 1 + extra - stage(self.read_stage)
+        if forwarding:
+            paths = [stage(path) for path in self.forwarding_paths if stage(path) >= stage(self.result_stage[cls])]
+            if paths: # Encaminhado do fim do primeiro caminho disponível para o início do estágio de execução.
+                distance = min(distance, min(paths) + extra + 1 - stage(self.execute_stage))
+        return max(1, distance)
+
+    def result_distance(self, producer, forwarding=False): # Distância mínima para as consumidoras de `producer`.
+        return self.distances[forwarding][instruction_class(producer)]
+
+    def stall_nops(self, producer, consumer, distance, forwarding=False): # NOPs de uma dependência RAW a `distance` posições.
+        if producer.rd is None or producer.rd == 0: # A produtora não escreve em registrador válido.
+            return 0
+        if consumer.rs1 != producer.rd and consumer.rs2 != producer.rd: # A consumidora não lê o registrador escrito.
+            return 0
+        return max(0, self.distances[forwarding][instruction_class(producer)] - distance) # Mesmo que result_distance, sem a chamada extra.
+
+    def window(self, forwarding=False): # Maior distância em que uma dependência RAW ainda custa NOPs.
+        return max(self.distances[forwarding].values()) - 1
+
+    @property
+    def branch_penalty(self): # Ciclos buscados no caminho errado até o desvio ser resolvido.
+        return self.stages.index(self.branch_stage)
+
+    @property
+    def delay_slots(self): # Slots após cada desvio nas técnicas 7 (NOPs) e 8 (delayed branch).
+        return self.branch_penalty
+
+    def describe(self): # Resumo de uma linha para os relatórios.
+        distances = ', '.join(f"{cls} {self.distances[False][cls]}/{self.distances[True][cls]}" for cls in INSTRUCTION_CLASSES)
+        return (f"{self.name}: {'-'.join(self.stages)}, forwarding de {', '.join(self.forwarding_paths) or 'nenhum estágio'},"
+                f" desvio resolvido em {self.branch_stage} (distâncias s/ e c/ forwarding: {distances})")
+
+    def to_dict(self): # Campos da descrição, no formato aceito por from_dict.
+        return {'name': self.name, 'stages': list(self.stages), 'read_stage': self.read_stage,
+                'execute_stage': self.execute_stage, 'forwarding_paths': list(self.forwarding_paths),
+                'result_stage': self.result_stage, 'latency': self.latency, 'branch_stage': self.branch_stage}
+
+    @classmethod
+    def from_dict(cls, fields):
+        return cls(**fields)
+
+DEFAULT_MACHINE = MachineModel() # Pipeline clássico: IF, ID, EX, MEM, WB; desvio resolvido no ID.
+
+MACHINES = { # Máquinas pré-definidas, selecionáveis pelo nome (--maquina).
+    'classico': DEFAULT_MACHINE,
+    'rv32m': MachineModel('5 estágios com mul/div multiciclo', latency={'mul': 3, 'div': 6}),
+    'profundo': MachineModel('7 estágios', stages=('IF1', 'IF2', 'ID', 'EX', 'MEM1', 'MEM2', 'WB'),
+                             forwarding_paths=('EX', 'MEM1', 'MEM2'), result_stage={'load': 'MEM2'},
+                             latency={'mul': 3, 'div': 6}, branch_stage='EX'),
+}
+
+def load_machine(spec): # Máquina pré-definida (pelo nome) ou descrição em JSON (campos de MachineModel).
+    if spec in MACHINES:
+        return MACHINES[spec]
+    if not spec.endswith('.json'):
+        raise ValueError(f"máquina desconhecida: {spec} (use {', '.join(MACHINES)} ou um arquivo .json)")
+    with open(spec) as f:
+        return MachineModel.from_dict(json.load(f))
@@ -0,0 +1,79 @@
+# Gravação das saídas do app2: cada programa ou relatório é montado inteiro em memória e gravado com uma única
+# chamada (em vez de um f.write por linha). Formatos, escolhidos com --formatos:
+# - 'texto': os .hex (uma palavra por linha) e os relatórios .txt de sempre;
+# - 'binario': .bin com as palavras em little-endian (a ordem do RISC-V), que o próprio app2 lê de volta;
+# - 'jsonl' / 'jsonl.gz': um relatório consolidado (relatorio.jsonl, opcionalmente compactado) com uma linha JSON
+#   por programa de saída, uma por lista de conflitos e uma com o resumo numérico.
+# Sem nenhum formato ('nenhum'), nada é gravado: só o resumo numérico é devolvido.
+import os # Caminhos dos arquivos de saída.
+import sys # Ordem de bytes da máquina.
+import gzip # Relatório consolidado compactado.
+import json # Formato do relatório consolidado.
+from array import array # Palavras de 32 bits.
+
+OUTPUT_FORMATS = ('texto', 'binario', 'jsonl', 'jsonl.gz') # Formatos aceitos por --formatos.
+DEFAULT_FORMATS = ('texto',) # Saídas em texto, como sempre.
+REPORT_NAME = 'relatorio' # Nome do relatório consolidado (relatorio.jsonl ou relatorio.jsonl.gz).
+
+def hex_text(words): # Texto hexadecimal de todas as palavras (8 dígitos maiúsculos por linha) com uma única formatação.
+    return ('%08X\n' * len(words)) % tuple(words)
+
+def little_endian_bytes(words): # Bytes das palavras em little-endian, qualquer que seja a ordem de bytes da máquina.
+    words = array('I', words)
+    if sys.byteorder != 'little':
+        words.byteswap()
+    return words.tobytes()
+
+def parse_formats(spec): # Formatos de uma lista separada por vírgulas ('texto,binario', ...); 'nenhum' desliga as saídas.
+    if not spec:
+        return DEFAULT_FORMATS
+    formats = tuple(dict.fromkeys(part.strip() for part in spec.split(',') if part.strip())) # Sem repetições.
+    if formats == ('nenhum',):
+        return ()
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown:
+        raise ValueError(f"formato(s) de saída desconhecido(s): {', '.join(unknown)} (use {', '.join(OUTPUT_FORMATS)} ou nenhum)")
+    return formats
+
+class OutputWriter: # Grava os resultados de uma análise nos formatos pedidos.
+    """Programas e relatórios de conflitos em `output_dir`; o relatório consolidado é gravado em close()"""
+    # `render_report(conflitos, título, linhas do fonte)` monta as linhas de um relatório em texto; só é chamada
+    # quando o formato 'texto' foi pedido.
+
+    def __init__(self, output_dir, formats=DEFAULT_FORMATS, render_report=None):
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.render_report = render_report
+        self.text = 'texto' in self.formats
+        self.binary = 'binario' in self.formats
+        self.records = [] if 'jsonl' in self.formats or 'jsonl.gz' in self.formats else None # Linhas do relatório consolidado.
+
+    def write(self, name, data): # Uma única escrita por arquivo (texto ou bytes).
+        with open(os.path.join(self.output_dir, name), 'wb' if isinstance(data, bytes) else 'w') as f:
+            f.write(data)
+
+    def program(self, name, words, **fields): # Programa de saída (`name` sem extensão); `fields` vão para o relatório consolidado.
+        if self.text:
+            self.write(name + '.hex', hex_text(words))
+        if self.binary:
+            self.write(name + '.bin', little_endian_bytes(words))
+        if self.records is not None:
+            self.records.append({'kind': 'program', 'name': name, **fields, 'instructions': len(words), 'words': list(words)})
+
+    def report(self, name, conflicts, title, source_lines=None): # Relatório de conflitos (`name` sem extensão).
+        if self.text:
+            self.write(name + '.txt', ''.join(self.render_report(conflicts, title, source_lines)))
+        if self.records is not None:
+            self.records.append({'kind': 'conflicts', 'name': name, 'title': title, 'count': len(conflicts), 'conflicts': conflicts})
+
+    def close(self, summary=None): # Grava o relatório consolidado (com o resumo numérico ao final).
+        if self.records is None:
+            return
+        if summary is not None:
+            self.records.append({'kind': 'summary', **summary})
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self.records)
+        if 'jsonl' in self.formats:
+            self.write(REPORT_NAME + '.jsonl', data)
+        if 'jsonl.gz' in self.formats:
+            self.write(REPORT_NAME + '.jsonl.gz', gzip.compress(data.encode()))
+        self.records = []
@@ -0,0 +1,83 @@
+# Simulador de temporização de um pipeline em ordem (por padrão, o clássico de 5 estágios: IF, ID, EX, MEM, WB).
+# Consome a sequência de instruções produzida pelas técnicas do app2.py (instruções decodificadas, com NOPs)
+# e conta ciclos, bolhas (stalls), descartes por desvio (flushes) e o CPI real de cada técnica.
+# Estágios, distâncias entre produtora e consumidora e penalidade dos desvios vêm da descrição da máquina (machine.py).
+# Só usa os campos word, rd, rs1, rs2, is_load, is_branch e type das instruções, por isso não depende do app2.py.
+from machine import DEFAULT_MACHINE
+
+def result_distance(producer, forwarding, machine=DEFAULT_MACHINE): # Define uma função com a distância mínima (em ciclos de IF) até uma consumidora poder ler o resultado.
+    """Ciclos entre o IF da produtora e o IF mais cedo de uma consumidora que lê o valor correto"""
+    # No pipeline clássico: 3 sem forwarding (escrita no WB, leitura no ID), 2 para load-use com forwarding
+    # (o dado só existe no fim do MEM) e 1 para resultados da ULA encaminhados do fim do EX.
+    return machine.result_distance(producer, forwarding)
+
+def simulate_pipeline(stream, forwarding=False, interlock=True, delay_slots=0, branch_stage=None, branch_outcomes=None,
+                      machine=DEFAULT_MACHINE):
+    """Simula a sequência e retorna ciclos, bolhas, flushes, CPI e as leituras de valores desatualizados"""
+    # `interlock`: o hardware detecta conflitos de dados e insere bolhas. Sem interlock, toda leitura antes do valor
+    # estar disponível é registrada em `stale_reads` (a técnica deixou um conflito sem tratamento).
+    # `delay_slots`: quantas instruções após um desvio são sempre executadas (delayed branch / NOP após o branch).
+    # `branch_outcomes`: sequência de booleanos (tomado ou não) para cada desvio, na ordem; sem ela, todos são tomados.
+    # `branch_stage`: estágio em que os desvios são resolvidos (padrão: o da máquina).
+    penalty = machine.stages.index(branch_stage or machine.branch_stage)
+    outcomes = iter(branch_outcomes) if branch_outcomes is not None else None
+    ready = {} # Registrador -> (IF mais cedo permitido para a consumidora, posição da produtora).
+    stale_reads = [] # Conflitos não resolvidos: {'position', 'source', 'register'}.
+    stall_cycles = 0
+    flushes = 0 # Desvios tomados que descartaram instruções buscadas no caminho errado.
+    flush_cycles = 0
+    nops = 0
+    if_cycle = -1 # Ciclo de IF da instrução anterior.
+    slots_left = 0 # Delay slots restantes do último desvio.
+    pending_flush = 0 # Ciclos perdidos a aplicar quando os delay slots terminarem.
+
+    count = 0
+    for pos, instr in enumerate(stream):
+        count += 1
+        if instr.type == 'NOP':
+            nops += 1
+        cycle = if_cycle + 1
+        if slots_left > 0:
+            slots_left -= 1 # Instrução no delay slot: sempre executada, sem descarte.
+        elif pending_flush:
+            cycle += pending_flush # O caminho errado buscado após o desvio é descartado.
+            pending_flush = 0
+
+        # Conflitos de dados: a leitura de rs1/rs2 só é válida a partir do ciclo indicado pela produtora.
+        for reg in (instr.rs1, instr.rs2):
+            if reg is None or reg == 0 or reg not in ready:
+                continue
+            earliest, source = ready[reg]
+            if earliest > cycle:
+                if interlock:
+                    stall_cycles += earliest - cycle
+                    cycle = earliest
+                else:
+                    stale_reads.append({'position': pos, 'source': source, 'register': reg})
+        if_cycle = cycle
+
+        if instr.rd is not None and instr.rd != 0:
+            ready[instr.rd] = (cycle + machine.result_distance(instr, forwarding), pos)
+
+        if instr.is_branch:
+            taken = True if outcomes is None else next(outcomes, True)
+            if taken:
+                lost = max(0, penalty - delay_slots) # Os delay slots cobrem parte da penalidade.
+                if lost:
+                    flushes += 1
+                    flush_cycles += lost
+                    pending_flush = lost
+                slots_left = delay_slots
+
+    cycles = if_cycle + len(machine.stages) if count else 0 # A última instrução termina o último estágio (WB) após len(stages) - 1 ciclos.
+    useful = count - nops # Instruções do programa (os NOPs inseridos não contam como trabalho útil).
+    return {
+        'cycles': cycles,
+        'instructions': useful,
+        'nops': nops,
+        'stall_cycles': stall_cycles,
+        'flushes': flushes,
+        'flush_cycles': flush_cycles,
+        'cpi': cycles / useful if useful else 0.0,
+        'stale_reads': stale_reads,
+    }
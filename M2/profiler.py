@@ -0,0 +1,63 @@
+# Instrumentação das etapas do app2: tempo de parede e de CPU, memória alocada (tracemalloc) e instruções de
+# entrada/saída de cada passada, gravados como um perfil em JSON. Desligado, o perfilador só repassa as chamadas.
+import json # Formato do perfil.
+import time # Cronômetros.
+import tracemalloc # Memória e blocos alocados por etapa.
+from contextlib import contextmanager # Cada etapa é medida em um bloco `with`.
+
+class PassProfiler: # Perfilador por etapa.
+    """Registra uma entrada por etapa (na ordem de execução); `enabled=False` não mede nada"""
+
+    def __init__(self, enabled=True, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = [] # Registros das etapas concluídas.
+        # A memória é medida com o tracemalloc ligado desde a primeira etapa; o custo do rastreamento entra nos tempos.
+
+    @contextmanager
+    def stage(self, name, instructions_in=None): # Mede o bloco; o chamador pode preencher record['instructions_out'] e contadores.
+        record = {'stage': name, 'instructions_in': instructions_in, 'instructions_out': None}
+        if not self.enabled:
+            yield record
+            return
+        if self.trace_memory:
+            if not tracemalloc.is_tracing(): # Liga na primeira etapa e mantém ligado até stop().
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            blocks_before = len(tracemalloc.take_snapshot().traces)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = time.process_time() - cpu
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['peak_bytes'] = peak - memory_before # Pico acima do que já estava alocado antes da etapa.
+                record['retained_bytes'] = current - memory_before # Memória que continua alocada ao final.
+                record['retained_blocks'] = len(tracemalloc.take_snapshot().traces) - blocks_before
+            self.stages.append(record)
+
+    def stop(self): # Desliga o tracemalloc ao fim da execução perfilada.
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def report(self): # Perfil completo: etapas e totais.
+        return {
+            'stages': self.stages,
+            'total_wall_seconds': sum(record['wall_seconds'] for record in self.stages),
+            'total_cpu_seconds': sum(record['cpu_seconds'] for record in self.stages),
+        }
+
+    def save(self, path): # Grava o perfil em JSON.
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def summary_lines(self): # Tabela curta para o console, da etapa mais lenta para a mais rápida.
+        total = sum(record['wall_seconds'] for record in self.stages) or 1.0
+        for record in sorted(self.stages, key=lambda r: -r['wall_seconds']):
+            yield (f"{record['stage']:<58} {record['wall_seconds']:9.4f} s ({record['wall_seconds'] / total:6.1%})"
+                   f" CPU {record['cpu_seconds']:9.4f} s")
+
+NO_PROFILER = PassProfiler(enabled=False) # Perfilador padrão: não mede nada.
@@ -0,0 +1,142 @@
+# Renomeação de registradores: remove dependências falsas (WAR e WAW) antes do escalonamento.
+# Uma análise de vivacidade (liveness) sobre o CFG indica, para cada bloco básico, quais registradores ainda
+# serão lidos depois dele. Dentro do bloco, uma escrita cujo valor morre no próprio bloco (o registrador é
+# reescrito adiante ou não está vivo na saída) passa a usar um registrador livre (não usado no bloco e morto na
+# saída), e as leituras desse valor são reescritas junto. As palavras são recodificadas, então as saídas continuam
+# sendo hex válido. Usa apenas os campos word, type, rd, rs1 e rs2 das instruções, sem depender do app2.
+from cfg import build_cfg, branch_target
+
+OPCODE_AUIPC = 0x17  # auipc
+OPCODE_BRANCH = 0x63 # beq, bne...
+OPCODE_JALR = 0x67   # jalr
+OPCODE_JAL = 0x6F    # jal
+OPCODE_SYSTEM = 0x73 # ecall/ebreak
+
+ALL_REGISTERS = ((1 << 32) - 1) & ~1 # x1..x31 (x0 nunca está vivo).
+RESERVED = (0, 1, 2, 3, 4) # zero, ra, sp, gp e tp: usos implícitos (chamadas, pilha, ABI); nunca renomeados.
+ECALL_REGISTERS = tuple(range(10, 18)) # a0..a7: lidos implicitamente pelas chamadas de sistema.
+# Vivos quando o programa termina (cai no fim do código): ponteiros da ABI e os registradores de retorno.
+EXIT_LIVE = sum(1 << r for r in (1, 2, 3, 4, 10, 11))
+# Ordem de preferência dos registradores livres: temporários, argumentos e, por fim, os salvos.
+RENAME_ORDER = (5, 6, 7, 28, 29, 30, 31, 17, 16, 15, 14, 13, 12, 11, 10, 9, 8, *range(18, 28))
+
+def mask_of(registers): # Conjunto de registradores como máscara de bits (x0 ignorado).
+    mask = 0
+    for r in registers:
+        if r:
+            mask |= 1 << r
+    return mask
+
+def reads_of(instr): # Registradores lidos por uma instrução (inclusive os implícitos do ecall).
+    if instr.opcode == OPCODE_SYSTEM:
+        return (instr.rs1, instr.rs2) + ECALL_REGISTERS
+    return instr.rs1, instr.rs2
+
+def compute_liveness(instructions, cfg): # Define a análise de vivacidade por bloco básico.
+    """Máscara dos registradores vivos na saída de cada bloco do CFG"""
+    words = [instr.word for instr in instructions]
+    uses, defs, exits = [], [], []
+    for block in cfg:
+        use = written = 0
+        for instr in instructions[block.start:block.end]:
+            if instr.type == 'Desconhecido': # Instrução que o decodificador não entende: pode ler qualquer registrador.
+                use |= ALL_REGISTERS & ~written
+                continue
+            use |= mask_of(reads_of(instr)) & ~written # Lido antes de ser escrito no bloco.
+            written |= mask_of((instr.rd,))
+        uses.append(use)
+        defs.append(written)
+        last = instructions[block.end - 1]
+        unknown_target = last.opcode == OPCODE_JALR or (
+            last.opcode in (OPCODE_BRANCH, OPCODE_JAL) and branch_target(words, block.end - 1) is None)
+        if unknown_target: # Retorno, salto indireto ou desvio para fora do código: tudo pode ser lido depois.
+            exits.append(ALL_REGISTERS)
+        elif block.end == len(instructions) and last.opcode != OPCODE_JAL: # Cai no fim do programa.
+            exits.append(EXIT_LIVE)
+        else:
+            exits.append(0)
+
+    live_out = list(exits)
+    changed = True
+    while changed: # Ponto fixo: vivos na saída = vivos na entrada dos sucessores.
+        changed = False
+        for b in range(len(cfg) - 1, -1, -1):
+            out = exits[b]
+            for s in cfg[b].successors:
+                out |= uses[s] | (live_out[s] & ~defs[s])
+            if out != live_out[b]:
+                live_out[b] = out
+                changed = True
+    return live_out
+
+def live_in(instructions, block, live_out): # Registradores vivos na entrada de `block`, dada a máscara viva na sua saída.
+    live = live_out
+    for instr in reversed(instructions[block.start:block.end]):
+        if instr.type == 'Desconhecido': # Pode ler qualquer registrador.
+            return ALL_REGISTERS
+        live = (live & ~mask_of((instr.rd,))) | mask_of(reads_of(instr))
+    return live
+
+def with_registers(word, rd=None, rs1=None, rs2=None): # Recodifica os campos de registrador informados.
+    if rd is not None:
+        word = (word & ~(0x1F << 7)) | (rd << 7)
+    if rs1 is not None:
+        word = (word & ~(0x1F << 15)) | (rs1 << 15)
+    if rs2 is not None:
+        word = (word & ~(0x1F << 20)) | (rs2 << 20)
+    return word
+
+def rename_registers(instructions, decode, cfg=None): # Define a passada de renomeação.
+    """Retorna (instruções renomeadas, escritas renomeadas); `decode` converte uma palavra em instrução"""
+    instructions = list(instructions)
+    cfg = build_cfg(instructions) if cfg is None else cfg
+    live_out = compute_liveness(instructions, cfg)
+    result = list(instructions)
+    renamed = 0
+    for b, block in enumerate(cfg):
+        body = instructions[block.start:block.end]
+        if any(instr.type == 'Desconhecido' for instr in body): # Registradores invisíveis ao decodificador.
+            continue
+        referenced = live_out[b] # Registradores que não podem receber um valor novo neste bloco.
+        for instr in body:
+            referenced |= mask_of(reads_of(instr)) | mask_of((instr.rd,))
+        free = [r for r in RENAME_ORDER if not referenced >> r & 1]
+        if not free:
+            continue
+
+        # Próxima escrita de cada registrador depois de cada posição (para saber se o valor morre no bloco).
+        next_write = [None] * len(body)
+        last_write = {}
+        for k in range(len(body) - 1, -1, -1):
+            rd = body[k].rd
+            if rd:
+                next_write[k] = last_write.get(rd)
+                last_write[rd] = k
+        implicit = set(ECALL_REGISTERS) if body[-1].opcode == OPCODE_SYSTEM else set()
+
+        mapping = {} # Registrador original -> nome atual do valor (só para os valores renomeados).
+        seen = 0 # Registradores já lidos ou escritos no bloco: só essas escritas têm WAR/WAW a remover.
+        partial = 0 # Registradores com a parte alta de um auipc: o par (ex.: auipc a0 + addi a0, a0) fica intacto,
+                    # pois a realocação (cfg.auipc_consumers) precisa que o valor parcial seja sobrescrito no bloco.
+        for k, instr in enumerate(body):
+            rs1 = mapping.get(instr.rs1) if instr.rs1 else None
+            rs2 = mapping.get(instr.rs2) if instr.rs2 else None
+            rd = None
+            r = instr.rd
+            pair = instr.opcode == OPCODE_AUIPC or partial & mask_of(reads_of(instr))
+            if r:
+                partial = partial | (1 << r) if instr.opcode == OPCODE_AUIPC else partial & ~(1 << r)
+            if r and r not in RESERVED and instr.opcode not in (OPCODE_JAL, OPCODE_JALR) and not pair:
+                dies_here = next_write[k] is not None or not live_out[b] >> r & 1
+                reaches_ecall = next_write[k] is None and r in implicit
+                if seen >> r & 1 and dies_here and not reaches_ecall and free:
+                    rd = mapping[r] = free.pop(0)
+                    renamed += 1
+                else:
+                    mapping.pop(r, None)
+            elif r:
+                mapping.pop(r, None)
+            seen |= mask_of(reads_of(instr)) | mask_of((instr.rd,))
+            if rd is not None or rs1 is not None or rs2 is not None:
+                result[block.start + k] = decode(with_registers(instr.word, rd, rs1, rs2))
+    return result, renamed
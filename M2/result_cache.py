@@ -0,0 +1,145 @@
+# Cache de resultados do app2, endereçada pelo conteúdo: a chave é um hash das palavras do programa, das opções
+# da análise (máquina, renomeação, emissão dupla) e do código-fonte do M2. Cada entrada guarda, em JSON compactado,
+# as listas de conflitos, os escalonamentos (permutação + NOPs) de cada técnica e as simulações; uma entrada igual
+# dispensa todas as passadas. Os escalonamentos de cada bloco básico ficam numa cache própria (BlockScheduleCache):
+# um programa editado só reescalona os blocos cujo conteúdo (ou cauda anterior) mudou.
+import os # Diretório da cache e trocas atômicas de arquivo.
+import glob # Arquivos de código do M2 (versão do código na chave).
+import gzip # Entradas compactadas: as permutações de programas grandes ocupam vários MB em JSON.
+import json # Formato das entradas (não executa código ao carregar, ao contrário do pickle).
+import hashlib # Chaves de conteúdo.
+from array import array # Palavras de 32 bits das bases renomeadas.
+from collections import OrderedDict # Ordem de uso para a política LRU dos escalonamentos de bloco.
+
+CACHE_FORMAT = 1 # Versão das entradas; entradas de outra versão são ignoradas.
+DEFAULT_SCHEDULE_CACHE_SIZE = 1 << 16 # Escalonamentos de bloco mantidos em memória.
+
+code_digest = None # Hash do código-fonte do M2, calculado uma vez por processo.
+
+def code_version(): # Resultados gravados por outra versão do código não são reaproveitados.
+    global code_digest
+    if code_digest is None:
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        code_digest = digest.hexdigest()
+    return code_digest
+
+def content_key(words, **options): # Chave de conteúdo: palavras (bytes) + opções (JSON ordenado) + versão do código.
+    digest = hashlib.sha256(words if isinstance(words, bytes) else array('I', words).tobytes())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    digest.update(code_version().encode())
+    return digest.hexdigest()
+
+def encode_pass(value): # Resultado de uma passada (formato de run_pass) em JSON.
+    if isinstance(value, (list, dict)): # Conflitos ou estatísticas: já são JSON.
+        return value
+    order, nops_after, count, words = value
+    return {'order': order, 'nops_after': sorted(nops_after.items()), 'count': count,
+            'words': None if words is None else words.tolist()}
+
+def decode_pass(value): # Inverso de encode_pass.
+    if not isinstance(value, dict) or 'nops_after' not in value:
+        return value
+    words = value['words']
+    return (value['order'], dict(value['nops_after']), value['count'], None if words is None else array('I', words))
+
+class ResultCache: # Cache de resultados em disco, um arquivo por chave.
+    """Entradas em `directory` (subdiretório pelos 2 primeiros dígitos da chave); os escalonamentos de bloco vão em `schedules_path`"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.schedules_path = os.path.join(directory, 'escalonamentos.json.gz')
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json.gz')
+
+    def load(self, key): # Entrada da chave (None se não existe, é ilegível ou de outra versão).
+        try:
+            with gzip.open(self.path(key), 'rt') as f:
+                entry = json.load(f)
+        except (OSError, ValueError, EOFError):
+            entry = None
+        if entry is None or entry.get('format') != CACHE_FORMAT:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key, entry): # Grava a entrada (troca atômica: execuções simultâneas não corrompem a cache).
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt') as f:
+            json.dump({**entry, 'format': CACHE_FORMAT}, f)
+        os.replace(tmp_path, path)
+
+class BlockScheduleCache: # Cache LRU limitada dos escalonamentos de bloco (conteúdo do bloco + cauda -> resultado).
+    """Memoriza o escalonamento de cada bloco; pode ser gravada em disco e trocada entre processos do pool"""
+
+    def __init__(self, maxsize=DEFAULT_SCHEDULE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict() # Chave -> resultado, do menos para o mais recentemente usado.
+        self.added = {} # Entradas calculadas desde a última chamada a take_new_entries().
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(words, *options): # Chave do bloco: palavras (cauda + bloco) e opções que mudam o escalonamento.
+        digest = hashlib.blake2b(array('I', words).tobytes(), digest_size=16)
+        digest.update(repr(options).encode())
+        return digest.hexdigest()
+
+    def get(self, key): # Resultado memorizado (None se o bloco ainda não foi escalonado).
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.added[key] = value
+        if len(self.entries) > self.maxsize: # Descarta o bloco usado há mais tempo.
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self): # Esquece todos os blocos (ex.: para medir o escalonamento sem reaproveitamento).
+        self.entries.clear()
+        self.added.clear()
+
+    def take_new_entries(self): # Entradas novas (ex.: para enviar de um processo do pool ao principal).
+        added, self.added = self.added, {}
+        return added
+
+    def update(self, entries): # Incorpora entradas calculadas em outro processo (ou lidas do disco).
+        for key, value in entries.items():
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def save(self, path): # Grava a cache em disco.
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt') as f:
+            json.dump({'format': CACHE_FORMAT, 'code': code_version(), 'entries': list(self.entries.items())}, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path): # Carrega uma cache gravada pela mesma versão do código; retorna quantas entradas foram lidas.
+        try:
+            with gzip.open(path, 'rt') as f:
+                data = json.load(f)
+        except (OSError, ValueError, EOFError): # Ausente ou ilegível: começa com a cache vazia.
+            return 0
+        if data.get('format') != CACHE_FORMAT or data.get('code') != code_version():
+            return 0
+        self.update({key: value for key, value in data['entries']})
+        return len(data['entries'])
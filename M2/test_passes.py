@@ -0,0 +1,145 @@
+# Verificações automáticas do M2 (pytest): montador, validação das técnicas e equivalência dos programas transformados.
+# - riscv1-3.asm montam, bit a bit, os .hex do M1 (teste.hex, teste2.hex e teste3.hex);
+# - a saída de cada técnica não deixa leituras de valor desatualizado no hardware que ela assume (validate_stream);
+# - os programas reordenados, renomeados e com NOPs, com os desvios realocados, executam como o original no interpretador;
+# - os NOPs executados (ponderados pelo trace) de cada técnica batem com a contagem esperada.
+# Executar a partir da raiz do repositório ou do M2: python -m pytest -q
+import os
+
+import pytest
+
+import app2
+import interpreter
+from assembler import assemble_file
+from cfg import build_cfg
+from machine import MACHINES
+from workload import generate_program
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+M1_DIR = os.path.join(HERE, '..', 'M1')
+M3_PROGRAM = os.path.join(HERE, '..', 'M3', 'codigoGuilhermePedroKonsViniciusPereira.asm')
+
+ASSEMBLED_SAMPLES = {'riscv1.asm': 'teste.hex', 'riscv2.asm': 'teste2.hex', 'riscv3.asm': 'teste3.hex'} # Fonte -> .hex do M1.
+PROGRAMS = { # Programas executáveis e as entradas das leituras de inteiro (ecall 5).
+    os.path.join(HERE, 'riscv1.asm'): [],
+    os.path.join(HERE, 'riscv2.asm'): [3, 1, 2],
+    os.path.join(HERE, 'riscv3.asm'): [4, 5],
+    M3_PROGRAM: [0, 3],
+}
+TECHNIQUE_PASSES = {3: 'nop_sf', 4: 'nop_cf', 5: 'reord_sf', 6: 'reord_cf', 7: 'branch_nop', 8: 'branch_delay', 9: 'combined'}
+DATA_TECHNIQUES = (3, 4, 5, 6, 9) # Técnicas que tratam conflitos de dados; 7 e 8 só tratam os de controle.
+# Passadas cuja saída roda no interpretador (sem delay slots: nas técnicas 8 e 9 o slot é executado mesmo com o desvio tomado).
+SEQUENTIAL_PASSES = ('nop_sf', 'nop_cf', 'reord_sf', 'reord_cf', 'branch_nop', 'reord_sf_ren', 'reord_cf_ren', 'dual_issue')
+
+def decode_program(words): # Instruções decodificadas (os mesmos registros que o app2 usa).
+    return [app2.DECODE_CACHE.decode(word) for word in words]
+
+def technique_streams(results, rename=False): # Técnica -> visão, com as passadas renomeadas no lugar das originais.
+    names = {n: app2.RENAME_PASSES.get(name, name) if rename else name for n, name in TECHNIQUE_PASSES.items()}
+    return {n: results[name][0] for n, name in names.items()}
+
+def sample_instructions(): # (nome, instruções) dos programas do M1 e de cargas sintéticas.
+    programs = [(os.path.basename(path), decode_program(assemble_file(path).words)) for path in PROGRAMS]
+    for seed in (1, 2, 3):
+        programs.append((f'sintetico-{seed}', decode_program(generate_program(300, seed, load_ratio=0.4, branch_frequency=0.15))))
+    return programs
+
+@pytest.mark.parametrize('source, hex_file', sorted(ASSEMBLED_SAMPLES.items()))
+def test_assembler_matches_m1_hex(source, hex_file):
+    with open(os.path.join(M1_DIR, hex_file)) as f:
+        expected = [int(line, 16) for line in f if line.strip()]
+    assert list(assemble_file(os.path.join(HERE, source)).words) == expected
+
+@pytest.mark.parametrize('machine_name', sorted(MACHINES))
+@pytest.mark.parametrize('rename', (False, True))
+def test_techniques_leave_no_stale_reads(machine_name, rename):
+    machine = MACHINES[machine_name]
+    for name, original in sample_instructions():
+        cfg = build_cfg(original)
+        streams = technique_streams(app2.run_all_passes(original, parallel=False, machine=machine, rename=rename), rename)
+        for number, stream in streams.items():
+            forwarding, delayed = app2.TECHNIQUE_PIPELINES[number]
+            delay_slots = machine.delay_slots if delayed else 0
+            stale = app2.validate_stream(stream, forwarding, delay_slots, machine, cfg)
+            if number in DATA_TECHNIQUES:
+                assert not stale, f"{name}: técnica {number} deixou {len(stale)} leitura(s) desatualizada(s)"
+            else: # Técnicas de controle: não podem criar conflitos além dos que o original já tinha.
+                before = app2.validate_stream(original, forwarding, delay_slots, machine, cfg)
+                assert len(stale) <= len(before), f"{name}: técnica {number} criou conflitos de dados"
+
+@pytest.mark.parametrize('rename', (False, True))
+@pytest.mark.parametrize('path', sorted(PROGRAMS))
+def test_transformed_programs_run_like_original(path, rename):
+    program = assemble_file(path)
+    inputs = PROGRAMS[path]
+    original = decode_program(program.words)
+    cfg = build_cfg(original)
+    expected, _ = interpreter.run_program(program.words, program.data, program.text_base, program.data_base, inputs)
+    results = app2.run_all_passes(original, parallel=False, rename=rename, dual_issue=True)
+    for name in SEQUENTIAL_PASSES:
+        if name not in results:
+            continue
+        words, unresolved = app2.program_words(results[name][0], cfg)
+        assert unresolved == 0, f"{name}: {unresolved} desvio(s) sem realocação"
+        state, _ = interpreter.run_program(list(words), program.data, program.text_base, program.data_base, inputs)
+        assert ''.join(state.output) == ''.join(expected.output), f"{name}: saída diferente da do original"
+        assert state.exit_code == expected.exit_code
+
+LOAD_USE_LOOP = """
+.data
+valor: .word 5
+.text
+    la t0, valor
+    li t4, 15
+laco:
+    lw t1, 0(t0)
+    sub t4, t4, t1
+    bgt t4, zero, laco
+    li a7, 10
+    ecall
+"""
+
+def test_dynamic_nops_of_combined_technique(tmp_path):
+    # Três iterações de um load-use: a técnica 6 executa 1 NOP por iteração e a 9 (já sem delay slots vazios) o mesmo.
+    source = tmp_path / 'laco.asm'
+    source.write_text(LOAD_USE_LOOP)
+    words, data, text_base, data_base = interpreter.load_program(str(source))
+    _, trace = interpreter.run_program(words, data, text_base, data_base)
+    report = interpreter.dynamic_report(words, trace, text_base)
+    assert report['technique_6_nops'] == 3
+    assert report['technique_8_nops'] == 0
+    assert report['technique_9_nops'] == 3
+
+def test_reordering_keeps_moves_the_old_pass_got_wrong():
+    # A reordenação anterior só olhava has_dependency, que não vê as leituras implícitas de ecall nem os desvios. Em
+    # riscv3.asm (fonte de teste3.hex) ela (1) adiantava o ecall de impressão para antes do addi que completa
+    # `la a0, texto` e (2) adiantava o auipc de `la a0, texto2`, em `fim`, para antes do `jal zero, for`, sem corrigir os
+    # deslocamentos dos desvios nem o endereço calculado pelo auipc. As duas trocas passam por has_dependency, mas
+    # mudam o resultado do programa.
+    path = os.path.join(HERE, 'riscv3.asm')
+    program = assemble_file(path)
+    inputs = PROGRAMS[path]
+    decoded = decode_program(program.words)
+    la_low, print_call = 2, 3 # addi a0, a0, %lo(texto) e o ecall que imprime a string.
+    loop_step, loop_jump, end_head, end_address = 19, 20, 21, 22 # addi s0, s0, 1; jal zero, for; início de `fim`; auipc.
+    assert not app2.has_dependency(decoded[la_low], decoded[print_call])
+    assert not any(app2.has_dependency(decoded[k], decoded[end_address]) for k in (loop_jump, end_head))
+
+    def run(words):
+        state, _ = interpreter.run_program(words, program.data, program.text_base, program.data_base, inputs, max_steps=10_000)
+        return ''.join(state.output)
+
+    expected = run(list(program.words))
+    moved_call = list(program.words)
+    moved_call[la_low], moved_call[print_call] = moved_call[print_call], moved_call[la_low]
+    assert run(moved_call) != expected
+    moved_address = list(program.words)
+    moved_address[loop_jump:end_address + 1] = [program.words[k] for k in (end_address, loop_jump, end_head)]
+    assert run(moved_address) != expected
+
+    for forwarding in (False, True): # A reordenação atual mantém as duas ordens.
+        view, _ = app2.reorder_to_avoid_nops(decoded, forwarding)
+        order = list(view.origins())
+        position = {index: pos for pos, index in enumerate(order) if index is not None}
+        assert position[la_low] < position[print_call]
+        assert position[loop_step] < position[loop_jump] < min(position[end_head], position[end_address])
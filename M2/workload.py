@@ -0,0 +1,94 @@
+# Gerador de cargas sintéticas: programas RV32I válidos (em .hex) de tamanho e perfil configuráveis.
+# Usado pelo benchmark.py para medir como as detecções e as técnicas escalam, já que as entradas do M1
+# têm poucas dezenas de instruções. A mesma semente gera sempre o mesmo programa.
+import sys # Código de saída do programa.
+import random # Gerador pseudoaleatório com semente.
+import argparse # Interface de linha de comando.
+
+from assembler import R_OPS, I_ALU_OPS, LOAD_OPS, STORE_OPS, BRANCH_OPS, encode_r, encode_i, encode_s, encode_b, encode_j
+
+OPCODE_OP = 0x33     # Tipo R
+OPCODE_OP_IMM = 0x13 # addi, ...
+OPCODE_LOAD = 0x03
+OPCODE_STORE = 0x23
+OPCODE_BRANCH = 0x63
+OPCODE_JAL = 0x6F
+
+BASE_ONLY_OPS = [name for name, (funct7, _) in R_OPS.items() if funct7 != 0x01] # RV32I, sem a extensão M.
+DESTINATIONS = list(range(5, 32)) # t0..t6, s0..s11, a0..a7 (sp e gp ficam como bases de memória).
+MEMORY_BASES = (2, 3) # sp e gp.
+RECENT_WINDOW = 3 # Destinos recentes de onde saem as dependências (distância em que há conflito no pipeline).
+BRANCH_SPAN = 64 # Distância máxima (em instruções) entre um desvio e seu alvo.
+JUMP_SHARE = 0.1 # Fração das instruções de controle que são jal (incondicionais) em vez de branches.
+
+def generate_program(length, seed=0, dependency_density=0.5, load_ratio=0.2, store_ratio=0.1, branch_frequency=0.1):
+    """Palavras de um programa sintético com `length` instruções"""
+    rng = random.Random(seed)
+    recent = [] # Destinos escritos mais recentemente (mais novo no fim).
+    words = []
+
+    def source(): # Registrador lido: um destino recente (cria dependência RAW) ou um qualquer.
+        if recent and rng.random() < dependency_density:
+            return rng.choice(recent)
+        return rng.choice(DESTINATIONS)
+
+    def destination():
+        rd = rng.choice(DESTINATIONS)
+        recent.append(rd)
+        del recent[:-RECENT_WINDOW]
+        return rd
+
+    for i in range(length):
+        kind = rng.random()
+        if kind < branch_frequency: # Desvio para frente ou para trás, sempre para dentro do programa.
+            target = min(length - 1, max(0, i + rng.randint(-BRANCH_SPAN, BRANCH_SPAN)))
+            offset = 4 * (target - i) if target != i else 4
+            if rng.random() < JUMP_SHARE:
+                words.append(encode_j(offset, 0, OPCODE_JAL))
+            else:
+                funct3 = rng.choice(list(BRANCH_OPS.values()))
+                words.append(encode_b(offset, source(), source(), funct3, OPCODE_BRANCH))
+        elif kind < branch_frequency + load_ratio:
+            name = rng.choice(list(LOAD_OPS))
+            width = 1 << (LOAD_OPS[name] & 3)
+            offset = width * rng.randint(0, 255 // width) # Deslocamento alinhado ao tamanho do acesso.
+            words.append(encode_i(offset, rng.choice(MEMORY_BASES), LOAD_OPS[name], destination(), OPCODE_LOAD))
+        elif kind < branch_frequency + load_ratio + store_ratio:
+            name = rng.choice(list(STORE_OPS))
+            width = 1 << STORE_OPS[name]
+            offset = width * rng.randint(0, 255 // width)
+            words.append(encode_s(offset, source(), rng.choice(MEMORY_BASES), STORE_OPS[name], OPCODE_STORE))
+        elif rng.random() < 0.5: # Operação registrador-registrador.
+            funct7, funct3 = R_OPS[rng.choice(BASE_ONLY_OPS)]
+            rs1, rs2 = source(), source()
+            words.append(encode_r(funct7, rs2, rs1, funct3, destination(), OPCODE_OP))
+        else: # Operação com imediato.
+            funct3 = rng.choice(list(I_ALU_OPS.values()))
+            rs1 = source()
+            words.append(encode_i(rng.randint(-2048, 2047), rs1, funct3, destination(), OPCODE_OP_IMM))
+    return words
+
+def write_hex(path, words): # Grava as palavras no formato .hex do M1 (uma por linha).
+    with open(path, 'w') as f:
+        f.writelines(f"{word:08X}\n" for word in words)
+
+def main(argv=None): # Gera um programa sintético em um arquivo .hex.
+    parser = argparse.ArgumentParser(description="Gera um programa RV32I sintético (.hex) para testes de escala.")
+    parser.add_argument('saida', help="arquivo .hex a gerar")
+    parser.add_argument('--instrucoes', type=int, default=10000, help="quantidade de instruções")
+    parser.add_argument('--semente', type=int, default=0, help="semente do gerador (mesma semente, mesmo programa)")
+    parser.add_argument('--dependencias', type=float, default=0.5, help="probabilidade de ler um destino recente (0 a 1)")
+    parser.add_argument('--loads', type=float, default=0.2, help="fração de loads")
+    parser.add_argument('--stores', type=float, default=0.1, help="fração de stores")
+    parser.add_argument('--desvios', type=float, default=0.1, help="fração de branches/jumps")
+    args = parser.parse_args(argv)
+
+    if args.loads + args.stores + args.desvios > 1:
+        parser.error("a soma das frações de loads, stores e desvios não pode passar de 1")
+    words = generate_program(args.instrucoes, args.semente, args.dependencias, args.loads, args.stores, args.desvios)
+    write_hex(args.saida, words)
+    print(f"{len(words)} instruções gravadas em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())